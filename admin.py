@@ -0,0 +1,156 @@
+# encoding: utf-8
+#
+# Copyright (c) 2020-2021 Hopenly srl.
+#
+# This file is part of Ilyde.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import logging
+import os
+import resource
+import threading
+import time
+
+import grpc
+from google.protobuf.struct_pb2 import Struct
+
+from metrics import REGISTRY
+from patches import connection_pools
+from protos import kubespawner_pb2, kubespawner_pb2_grpc
+from profiling import SamplingProfiler, ProfilerBusy
+from serializers import protobuf_to_dict, ProfileSerializer
+
+logger = logging.getLogger(__name__)
+
+_started = time.monotonic()
+
+
+def process_stats():
+    """resident memory, threads and uptime of the process"""
+    try:
+        with open("/proc/self/statm") as f:
+            rss = int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        rss = None
+    return {
+        "pid": os.getpid(),
+        "rss_bytes": rss,
+        # kilobytes on linux
+        "max_rss_bytes": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+        "threads": threading.active_count(),
+        "uptime_seconds": round(time.monotonic() - _started, 3),
+    }
+
+
+def hit_rate(hits, misses):
+    return round(hits / (hits + misses), 4) if hits + misses else None
+
+
+def metrics_matching(metrics, prefix, suffix):
+    """{middle part: value} of the metrics named prefix + middle part + suffix"""
+    return {
+        name[len(prefix):-len(suffix)]: value
+        for name, value in metrics.items() if name.startswith(prefix) and name.endswith(suffix)
+    }
+
+
+class KubeSpawnerAdminServicer(kubespawner_pb2_grpc.KubeSpawnerAdminServicer):
+    """Operations on this replica: profiling and introspection"""
+
+    def __init__(self, router, servicer, profile_max_seconds=60, profile_interval=0.01):
+        """
+        Args:
+            router: ExecutorRouter of the server
+            servicer: KubeSpawnerServicer
+        """
+        self._router = router
+        self._servicer = servicer
+        self._profile_max_seconds = profile_max_seconds
+        self._profile_interval = profile_interval
+
+    def Profile(self, request, context):
+        """Sample the stacks of the threads serving calls for some seconds,
+        the profile is returned once done
+        """
+        data = ProfileSerializer().load(protobuf_to_dict(request))
+        seconds = min(data['seconds'], self._profile_max_seconds)
+
+        logger.info("profiling for %s seconds", seconds)
+        profiler = SamplingProfiler(self._profile_interval, data['all_threads'])
+        try:
+            profiler.run(seconds)
+        except ProfilerBusy as e:
+            context.abort(grpc.StatusCode.FAILED_PRECONDITION, str(e))
+
+        return kubespawner_pb2.ProfileResult(
+            format=data['format'],
+            data=profiler.render(data['format']),
+            samples=profiler.samples,
+            seconds=profiler.seconds,
+            samples_by_method=profiler.samples_by_method()
+        )
+
+    def Inspect(self, request, context):
+        """Get the state of the replica, read from the snapshots of its
+        components and the metrics registry, nothing is computed on the way
+        """
+        servicer = self._servicer
+        metrics = REGISTRY.snapshot()
+        informers = servicer.informers
+
+        warm_pools = servicer.warm_pools.snapshot()
+        pvc_pools = servicer.pvc_pools.snapshot()
+        payload = {
+            "process": process_stats(),
+            "executors": self._router.snapshot(),
+            "calls": {method: active for method, active in metrics_matching(metrics, "rpc.", ".active").items()
+                      if active},
+            # the typed API clients open a connection pool per call, only the
+            # long lived clients have pools to report
+            "connection_pools": {
+                "patch": servicer.patcher.snapshot(),
+                "scale": connection_pools(servicer.scale_api.api_client),
+                "jobs": connection_pools(servicer.job_api.api_client),
+            },
+            "caches": {
+                "informers": {
+                    "hits": informers.hits.value,
+                    "misses": informers.misses.value,
+                    "hit_rate": hit_rate(informers.hits.value, informers.misses.value),
+                    "watches": informers.snapshot(),
+                },
+                "warm_pools": {name: dict(pool, hit_rate=hit_rate(pool["hits"], pool["misses"]))
+                               for name, pool in warm_pools.items()},
+                "pvc_pools": {name: dict(pool, hit_rate=hit_rate(pool["hits"], pool["misses"]))
+                              for name, pool in pvc_pools.items()},
+                "usage": servicer.usage.snapshot(),
+                "discovery": servicer.discovery.snapshot(),
+                "ingress_aggregates": servicer.ingress_routes.snapshot() if servicer.ingress_routes else {},
+            },
+            "retries": {
+                # every informer lists once when it starts
+                "watch_relists": max(0, sum(metrics_matching(metrics, "informer.", ".relists").values())
+                                     - informers.misses.value),
+                "warm_pool_conflicts": sum(pool["conflicts"] for pool in warm_pools.values()),
+                "pvc_pool_conflicts": sum(pool["conflicts"] for pool in pvc_pools.values()),
+                "discovery_failures": metrics.get("discovery.failures", 0),
+                "usage_poll_failures": metrics.get("usage.failures", 0),
+            },
+            "health": servicer.health.snapshot() if getattr(servicer, "health", None) else {},
+            "metrics": metrics,
+        }
+
+        s = Struct()
+        s.update(payload)
+        return s
@@ -0,0 +1,140 @@
+# encoding: utf-8
+#
+# Copyright (c) 2020-2021 Hopenly srl.
+#
+# This file is part of Ilyde.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Replays the calls recorded by a server started with RECORD_PATH against
+another server, at the recorded pace or faster, and prints the latency
+distribution of each method next to the recorded one.
+
+    python -m benchmarks.standin --kubeconfig /tmp/standin.yaml &
+    KUBECONFIG=/tmp/standin.yaml python server.py &
+    python -m benchmarks.replay calls.rec --speed 10
+
+Requests are sent as recorded, the resources they name must exist on the
+stand-in API server for the calls to succeed.
+"""
+import argparse
+import collections
+import threading
+import time
+from concurrent import futures
+
+import grpc
+
+from metrics import Summary
+from recording import read_records
+
+Result = collections.namedtuple("Result", ["method", "seconds", "code", "recorded"])
+
+
+def _identity(data):
+    return data
+
+
+def replay_call(channel, record, speed, stream_timeout):
+    """Sends a recorded request, returns a Result. Streams are read until
+    they end or for as long as they were recorded."""
+    started = time.monotonic()
+    try:
+        if record.streaming:
+            call = channel.unary_stream(record.method, _identity, _identity)
+            timeout = record.seconds / speed + stream_timeout
+            for _ in call(record.request, timeout=timeout):
+                pass
+        else:
+            call = channel.unary_unary(record.method, _identity, _identity)
+            call(record.request)
+        code = grpc.StatusCode.OK
+    except grpc.RpcError as e:
+        code = e.code()
+    return Result(record.method, time.monotonic() - started, code, record)
+
+
+def replay(records, target, speed=1.0, workers=64, stream_timeout=1.0):
+    """Sends the records to target, keeping their relative start times
+    divided by speed. Returns the Results in the order they ended."""
+    records = sorted(records, key=lambda record: record.started)
+    results = []
+    lock = threading.Lock()
+
+    def done(future):
+        with lock:
+            results.append(future.result())
+
+    channel = grpc.insecure_channel(target)
+    with futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        if records:
+            origin = records[0].started
+            begin = time.monotonic()
+            for record in records:
+                delay = (record.started - origin) / speed - (time.monotonic() - begin)
+                if delay > 0:
+                    time.sleep(delay)
+                executor.submit(replay_call, channel, record, speed, stream_timeout).add_done_callback(done)
+    channel.close()
+    return results
+
+
+def report(results):
+    """Lines of per method latencies in milliseconds, replayed then recorded"""
+    replayed = collections.defaultdict(lambda: Summary(window=1 << 20))
+    recorded = collections.defaultdict(lambda: Summary(window=1 << 20))
+    errors = collections.Counter()
+    changed = collections.Counter()
+    for result in results:
+        replayed[result.method].observe(result.seconds * 1000)
+        recorded[result.method].observe(result.recorded.seconds * 1000)
+        if result.code is not grpc.StatusCode.OK:
+            errors[result.method] += 1
+        if result.code is not result.recorded.code:
+            changed[result.method] += 1
+
+    lines = ["{:<40}{:>7}{:>7}{:>9}{:>9}{:>9}{:>9}{:>10}{:>9}".format(
+        "method", "calls", "errors", "p50", "p90", "p99", "max", "rec. p50", "changed")]
+    for method in sorted(replayed):
+        summary = replayed[method]
+        lines.append("{:<40}{:>7}{:>7}{:>9.1f}{:>9.1f}{:>9.1f}{:>9.1f}{:>10.1f}{:>9}".format(
+            method.rpartition("/")[2], summary.snapshot()["count"], errors[method], summary.quantile(0.5),
+            summary.quantile(0.9), summary.quantile(0.99), summary.snapshot()["max"],
+            recorded[method].quantile(0.5), changed[method]))
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("recording", help="file written by a server started with RECORD_PATH")
+    parser.add_argument("--target", default="localhost:50051")
+    parser.add_argument("--speed", type=float, default=1.0, help="2 replays twice as fast as recorded")
+    parser.add_argument("--workers", type=int, default=64, help="calls in flight at most")
+    parser.add_argument("--method", action="append", help="replays only this method, can be repeated")
+    parser.add_argument("--stream-timeout", type=float, default=1.0,
+                        help="seconds a stream may last beyond its recorded duration")
+    args = parser.parse_args()
+
+    records = [record for record in read_records(args.recording)
+               if not args.method or record.method.rpartition("/")[2] in args.method]
+    started = time.monotonic()
+    results = replay(records, args.target, args.speed, args.workers, args.stream_timeout)
+    elapsed = time.monotonic() - started
+    print("{} calls in {:.1f}s, {:.1f} calls/s (latencies in ms)".format(
+        len(results), elapsed, len(results) / elapsed if elapsed else 0))
+    for line in report(results):
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
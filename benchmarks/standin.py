@@ -0,0 +1,301 @@
+# encoding: utf-8
+#
+# Copyright (c) 2020-2021 Hopenly srl.
+#
+# This file is part of Ilyde.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""In-memory stand-in for the Kubernetes API server, for replays and load
+tests on a workstation. Objects are stored as sent and never reconciled, so
+statuses stay as created. Every response is delayed by --latency seconds.
+
+    python -m benchmarks.standin --port 18080 --kubeconfig /tmp/standin.yaml
+    KUBECONFIG=/tmp/standin.yaml python server.py
+"""
+import argparse
+import json
+import queue
+import re
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import yaml
+
+# served groups, versions and resources for the discovery of the server
+API_GROUPS = {
+    "apps": {"v1": ["deployments", "deployments/scale", "deployments/status"]},
+    "batch": {"v1": ["jobs", "jobs/status", "cronjobs"], "v1beta1": ["cronjobs"]},
+    "traefik.io": {"v1alpha1": ["ingressroutes"]},
+    "metrics.k8s.io": {"v1beta1": ["pods"]},
+}
+SUBRESOURCES = ("status", "scale")
+
+
+def not_found():
+    return 404, {"kind": "Status", "apiVersion": "v1", "status": "Failure", "reason": "NotFound",
+                 "code": 404, "message": "not found"}
+
+
+def merge(target, patch):
+    """json merge patch of target by patch"""
+    for key, value in patch.items():
+        if value is None:
+            target.pop(key, None)
+        elif isinstance(value, dict) and isinstance(target.get(key), dict):
+            merge(target[key], value)
+        else:
+            target[key] = value
+
+
+class Store(object):
+    """Objects by collection path, the path of a list request, and name"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._collections = {}
+        self._watchers = []
+        self._version = 100
+
+    def _changed(self, collection, event_type, obj):
+        for watched, events in self._watchers:
+            if watched == collection:
+                events.put({"type": event_type, "object": obj})
+
+    def get(self, collection, name):
+        with self._lock:
+            return self._collections.get(collection, {}).get(name)
+
+    def list(self, collection):
+        with self._lock:
+            return {"kind": "List", "apiVersion": "v1", "metadata": {"resourceVersion": str(self._version)},
+                    "items": list(self._collections.get(collection, {}).values())}
+
+    def put(self, collection, obj, event_type):
+        with self._lock:
+            self._version += 1
+            metadata = obj.setdefault("metadata", {})
+            metadata["resourceVersion"] = str(self._version)
+            metadata.setdefault("uid", str(uuid.uuid4()))
+            metadata.setdefault("generation", 1)
+            metadata.setdefault("creationTimestamp", datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"))
+            self._collections.setdefault(collection, {})[metadata["name"]] = obj
+            self._changed(collection, event_type, obj)
+        return obj
+
+    def delete(self, collection, name):
+        with self._lock:
+            obj = self._collections.get(collection, {}).pop(name, None)
+            if obj is not None:
+                self._changed(collection, "DELETED", obj)
+        return obj
+
+    def watch(self, collection):
+        events = queue.Queue()
+        with self._lock:
+            self._watchers.append((collection, events))
+        return events
+
+    def unwatch(self, events):
+        with self._lock:
+            self._watchers = [watcher for watcher in self._watchers if watcher[1] is not events]
+
+
+def split(path):
+    """collection, name and subresource of an object path"""
+    collection, _, name = path.rpartition("/")
+    if name in SUBRESOURCES:
+        collection, _, subresource = collection.rpartition("/")
+        return collection, subresource, name
+    return collection, name, None
+
+
+def is_collection(path):
+    return bool(re.search(r"/namespaces/[^/]+/[a-z.]+$", path) or re.search(r"/v[0-9a-z]+/[a-z.]+$", path))
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    store = None
+    latency = 0.0
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, code, body):
+        data = json.dumps(body).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def send_chunk(self, data):
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+    def read_body(self):
+        size = int(self.headers.get("Content-Length", 0))
+        return json.loads(self.rfile.read(size) or b"{}")
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        path = url.path.rstrip("/")
+        if path == "/version":
+            return self.send_json(200, {"major": "1", "minor": "21", "gitVersion": "v1.21.0-standin"})
+        if path == "/apis":
+            return self.send_json(200, {"kind": "APIGroupList", "apiVersion": "v1", "groups": [
+                {"name": group, "versions": [{"groupVersion": "{}/{}".format(group, v), "version": v} for v in versions],
+                 "preferredVersion": {"groupVersion": "{}/{}".format(group, list(versions)[0]),
+                                      "version": list(versions)[0]}}
+                for group, versions in API_GROUPS.items()]})
+        match = re.match(r"^/apis/([^/]+)/([^/]+)$", path)
+        if match and match.group(2) in API_GROUPS.get(match.group(1), {}):
+            return self.send_json(200, {"kind": "APIResourceList", "groupVersion": "/".join(match.groups()),
+                                        "resources": [{"name": name, "namespaced": True, "kind": name, "verbs": []}
+                                                      for name in API_GROUPS[match.group(1)][match.group(2)]]})
+        if path.endswith("/log"):
+            return self.send_json(200, "")
+        if query.get("watch", ["false"])[0].lower() == "true":
+            return self.watch(path, min(float(query.get("timeoutSeconds", ["60"])[0]), 60))
+
+        if is_collection(path):
+            return self.send_json(200, self.store.list(path))
+        collection, name, _ = split(path)
+        obj = self.store.get(collection, name)
+        if obj is None:
+            return self.send_json(*not_found())
+        self.send_json(200, obj)
+
+    def watch(self, path, timeout):
+        events = self.store.watch(path)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        deadline = time.monotonic() + timeout
+        try:
+            while time.monotonic() < deadline:
+                try:
+                    event = events.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+                self.send_chunk((json.dumps(event) + "\n").encode())
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            self.store.unwatch(events)
+
+    def do_POST(self):
+        time.sleep(self.latency)
+        body = self.read_body()
+        collection = urlparse(self.path).path
+        metadata = body.setdefault("metadata", {})
+        if not metadata.get("name") and metadata.get("generateName"):
+            metadata["name"] = metadata["generateName"] + uuid.uuid4().hex[:5]
+        if self.store.get(collection, metadata.get("name")) is not None:
+            return self.send_json(409, {"kind": "Status", "apiVersion": "v1", "status": "Failure",
+                                        "reason": "AlreadyExists", "code": 409, "message": "already exists"})
+        # the API server always returns a status, empty until a controller fills it
+        body.setdefault("status", {})
+        self.send_json(201, self.store.put(collection, body, "ADDED"))
+
+    def do_PUT(self):
+        time.sleep(self.latency)
+        body = self.read_body()
+        collection, name, _ = split(urlparse(self.path).path)
+        if self.store.get(collection, name) is None:
+            return self.send_json(*not_found())
+        self.send_json(200, self.store.put(collection, body, "MODIFIED"))
+
+    def do_PATCH(self):
+        time.sleep(self.latency)
+        body = self.read_body()
+        collection, name, subresource = split(urlparse(self.path).path)
+        obj = self.store.get(collection, name)
+        if obj is None:
+            return self.send_json(*not_found())
+        obj = json.loads(json.dumps(obj))
+        # json patches are accepted and ignored
+        if isinstance(body, dict):
+            if subresource == "scale":
+                body = {"spec": {"replicas": (body.get("spec") or {}).get("replicas")}}
+            version = (body.get("metadata") or {}).get("resourceVersion")
+            if version and version != obj["metadata"]["resourceVersion"]:
+                return self.send_json(409, {"kind": "Status", "apiVersion": "v1", "status": "Failure",
+                                            "reason": "Conflict", "code": 409, "message": "modified"})
+            merge(obj, body)
+            if "spec" in body:
+                obj["metadata"]["generation"] = obj["metadata"].get("generation", 1) + 1
+        obj = self.store.put(collection, obj, "MODIFIED")
+        if subresource == "scale":
+            replicas = obj.get("spec", {}).get("replicas")
+            obj = {"kind": "Scale", "apiVersion": "autoscaling/v1", "metadata": obj["metadata"],
+                   "spec": {"replicas": replicas}, "status": {"replicas": replicas}}
+        self.send_json(200, obj)
+
+    def do_DELETE(self):
+        time.sleep(self.latency)
+        collection, name, _ = split(urlparse(self.path).path)
+        if self.store.delete(collection, name) is None:
+            return self.send_json(*not_found())
+        self.send_json(200, {"kind": "Status", "apiVersion": "v1", "status": "Success"})
+
+
+def kubeconfig(address):
+    return {
+        "apiVersion": "v1",
+        "kind": "Config",
+        "clusters": [{"name": "standin", "cluster": {"server": "http://{}:{}".format(*address)}}],
+        "contexts": [{"name": "standin", "context": {"cluster": "standin", "user": "standin"}}],
+        "current-context": "standin",
+        "users": [{"name": "standin", "user": {"token": "standin"}}],
+    }
+
+
+def create_standin(address=("127.0.0.1", 0), latency=0.0):
+    """ThreadingHTTPServer serving the stand-in API on address, port 0 picks a free one"""
+    handler = type("Handler", (StandInHandler,), {"store": Store(), "latency": latency})
+    server = ThreadingHTTPServer(address, handler)
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=18080)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--kubeconfig", help="writes a kubeconfig pointing to the stand-in there")
+    args = parser.parse_args()
+
+    server = create_standin((args.host, args.port), args.latency)
+    if args.kubeconfig:
+        with open(args.kubeconfig, "w") as f:
+            yaml.safe_dump(kubeconfig(server.server_address), f)
+    print("stand-in API server listening on {}:{}".format(*server.server_address))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
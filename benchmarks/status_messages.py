@@ -0,0 +1,87 @@
+# encoding: utf-8
+#
+# Copyright (c) 2020-2021 Hopenly srl.
+#
+# This file is part of Ilyde.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Compares the Struct payloads of GetResourceStatus with the typed messages
+of GetTypedResourceStatus: serialized size and encode/decode time.
+
+    python -m benchmarks.status_messages [--number N]
+"""
+import argparse
+import timeit
+from datetime import datetime, timezone
+
+from google.protobuf.struct_pb2 import Struct
+from kubernetes import client
+
+import server
+from protos import kubespawner_pb2
+
+
+def builders():
+    """(resource, Struct builder, typed message builder), both built from
+    the kubernetes object as the server does"""
+    started = datetime(2021, 3, 1, 12, 0, tzinfo=timezone.utc)
+    deployment = client.V1Deployment(status=client.V1DeploymentStatus(
+        replicas=3, available_replicas=2, unavailable_replicas=1, updated_replicas=3, observed_generation=7))
+    job = client.V1Job(status=client.V1JobStatus(
+        active=1, succeeded=4, failed=0, start_time=started, completion_time=None))
+    cronjob = {"status": {"active": [{"name": "run-1"}], "lastScheduleTime": "2021-03-01T12:00:00Z"}}
+    return [
+        ("deployment",
+         lambda: struct_of(server.deployment_status(deployment)),
+         lambda: kubespawner_pb2.ResourceStatus(deployment=server.deployment_status_message(deployment))),
+        ("job",
+         lambda: struct_of(server.job_status(job)),
+         lambda: kubespawner_pb2.ResourceStatus(job=server.job_status_message(job))),
+        ("cronjob",
+         lambda: struct_of(server.cronjob_status(cronjob)),
+         lambda: kubespawner_pb2.ResourceStatus(cronjob=server.cronjob_status_message(cronjob))),
+    ]
+
+
+def struct_of(payload):
+    s = Struct()
+    s.update(payload)
+    return s
+
+
+def measure(build, message_class, number):
+    """(serialized bytes, encode µs, decode µs) of the message built by build"""
+    data = build().SerializeToString()
+    encode = timeit.timeit(lambda: build().SerializeToString(), number=number)
+    decode = timeit.timeit(lambda: message_class.FromString(data), number=number)
+    return len(data), encode / number * 1e6, decode / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=20000, help="iterations of each measure")
+    args = parser.parse_args()
+
+    print("{:<12}{:<8}{:>8}{:>14}{:>14}".format("resource", "format", "bytes", "encode (us)", "decode (us)"))
+    for kind, build_struct, build_typed in builders():
+        rows = [
+            ("struct", measure(build_struct, Struct, args.number)),
+            ("typed", measure(build_typed, kubespawner_pb2.ResourceStatus, args.number)),
+        ]
+        for fmt, (size, encode, decode) in rows:
+            print("{:<12}{:<8}{:>8}{:>14.2f}{:>14.2f}".format(kind, fmt, size, encode, decode))
+
+
+if __name__ == "__main__":
+    main()
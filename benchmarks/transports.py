@@ -0,0 +1,130 @@
+# encoding: utf-8
+#
+# Copyright (c) 2020-2021 Hopenly srl.
+#
+# This file is part of Ilyde.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Compares the latency and throughput of the same calls over TCP, a Unix
+domain socket and an InProcessStub calling the servicer directly.
+
+    python -m benchmarks.standin --kubeconfig /tmp/standin.yaml &
+    KUBECONFIG=/tmp/standin.yaml python -m benchmarks.transports [--number N] [--threads T]
+
+GetImagePullCoverage never reaches the API server and shows the cost of the
+transport alone, GetResourceStatus adds a read of a deployment.
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from concurrent import futures
+
+import grpc
+from google.protobuf.empty_pb2 import Empty
+from kubernetes import client
+from kubernetes.client.rest import ApiException
+
+import server
+from inprocess import InProcessStub
+from protos import kubespawner_pb2, kubespawner_pb2_grpc
+
+NAMESPACE = "default"
+NAME = "transports-benchmark"
+
+
+def create_deployment():
+    body = {
+        "apiVersion": "apps/v1", "kind": "Deployment", "metadata": {"name": NAME},
+        "spec": {"replicas": 1, "selector": {"matchLabels": {"app": NAME}},
+                 "template": {"metadata": {"labels": {"app": NAME}},
+                              "spec": {"containers": [{"name": "main", "image": "busybox"}]}}},
+    }
+    try:
+        client.AppsV1Api().create_namespaced_deployment(namespace=NAMESPACE, body=body)
+    except ApiException as e:
+        if e.status != 409:
+            raise
+
+
+def calls():
+    """(method, request) pairs measured on every transport"""
+    return [
+        ("GetImagePullCoverage", Empty()),
+        ("GetResourceStatus", kubespawner_pb2.Resource(namespace=NAMESPACE, name=NAME, type="DEPLOYMENT")),
+    ]
+
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def measure(call, request, number, threads):
+    """(p50 µs, p99 µs, calls per second with threads callers)"""
+    latencies = []
+    for _ in range(number):
+        started = time.perf_counter()
+        call(request, timeout=10)
+        latencies.append((time.perf_counter() - started) * 1e6)
+    latencies.sort()
+
+    def run(_):
+        for _ in range(number // threads):
+            call(request, timeout=10)
+
+    with futures.ThreadPoolExecutor(max_workers=threads) as pool:
+        started = time.perf_counter()
+        list(pool.map(run, range(threads)))
+        throughput = (number // threads) * threads / (time.perf_counter() - started)
+    return percentile(latencies, 0.5), percentile(latencies, 0.99), throughput
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=2000, help="calls of each measure")
+    parser.add_argument("--threads", type=int, default=8, help="concurrent callers of the throughput measure")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    socket = os.path.join(directory, "kubespawner.sock")
+    grpc_server, port = server.create_server("127.0.0.1:0")
+    server.listen(grpc_server, "unix://" + socket)
+    grpc_server.start()
+    create_deployment()
+
+    channels = [grpc.insecure_channel("127.0.0.1:{}".format(port)), grpc.insecure_channel("unix://" + socket)]
+    transports = [
+        ("tcp", kubespawner_pb2_grpc.KubeSpawnerServicesStub(channels[0])),
+        ("uds", kubespawner_pb2_grpc.KubeSpawnerServicesStub(channels[1])),
+        ("inprocess", InProcessStub(server.KubeSpawnerServicer())),
+    ]
+    try:
+        print("{:<24}{:<12}{:>12}{:>12}{:>14}".format("method", "transport", "p50 (us)", "p99 (us)", "calls/s"))
+        for method, request in calls():
+            for name, stub in transports:
+                # first calls open connections and fill caches
+                for _ in range(10):
+                    getattr(stub, method)(request, timeout=10)
+                p50, p99, throughput = measure(getattr(stub, method), request, args.number, args.threads)
+                print("{:<24}{:<12}{:>12.0f}{:>12.0f}{:>14.0f}".format(method, name, p50, p99, throughput))
+    finally:
+        for channel in channels:
+            channel.close()
+        grpc_server.stop(None)
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -19,15 +19,13 @@
 
 import grpc
 from google.protobuf import json_format
-from google.protobuf.struct_pb2 import Struct
 
 from protos import kubespawner_pb2
-from protos import kubespawner_pb2_grpc
+from client import KubeSpawnerClient
 
 
 def run():
-    channel = grpc.insecure_channel('localhost:50051')
-    stub = kubespawner_pb2_grpc.KubeSpawnerServicesStub(channel)
+    stub = KubeSpawnerClient('localhost:50051')
 
     try:
 
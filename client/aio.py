@@ -0,0 +1,113 @@
+# encoding: utf-8
+#
+# Copyright (c) 2020-2021 Hopenly srl.
+#
+# This file is part of Ilyde.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import asyncio
+import functools
+import itertools
+import time
+
+import grpc
+
+from protos import kubespawner_pb2, kubespawner_pb2_grpc
+from client.channels import ChannelPool, default_timeout, _aio_channel
+from client.sync import METHODS, struct_to_dict, error_payload
+
+
+class AsyncKubeSpawnerClient(object):
+    """asyncio client of the KubeSpawner service, same interface as
+    KubeSpawnerClient with coroutines. It must be created in the event loop
+    that uses it:
+
+        async with AsyncKubeSpawnerClient("kubespawner:50051") as client:
+            await client.get_resource_status("default", "ws-1", "DEPLOYMENT")
+    """
+
+    def __init__(self, target="localhost:50051", size=4, credentials=None, timeouts=None, hedge_delay=None):
+        self.pool = ChannelPool(target, size, credentials, factory=_aio_channel)
+        self._stubs = itertools.cycle([kubespawner_pb2_grpc.KubeSpawnerServicesStub(channel)
+                                       for channel in self.pool.channels])
+        self._timeouts = timeouts or default_timeout
+        self.hedge_delay = hedge_delay
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def _timeout(self, method, timeout):
+        return self._timeouts(method) if timeout is None else timeout
+
+    def call(self, method, request, timeout=None, metadata=None):
+        """Returns the call: awaitable for unary methods, async iterator for streams"""
+        return getattr(next(self._stubs), method)(
+            request, timeout=self._timeout(method, timeout), metadata=metadata)
+
+    def __getattr__(self, method):
+        if method not in METHODS:
+            raise AttributeError(method)
+        return functools.partial(self.call, method)
+
+    async def get_resource_status(self, namespace, name, type, timeout=None, metadata=None):
+        """Returns the status payload of a resource as a dict"""
+        request = kubespawner_pb2.Resource(namespace=namespace, name=name, type=type)
+        if self.hedge_delay is None:
+            return struct_to_dict(await self.call("GetResourceStatus", request, timeout, metadata))
+        return struct_to_dict(await self._hedged("GetResourceStatus", request, timeout, metadata))
+
+    async def _hedged(self, method, request, timeout, metadata):
+        """Sends a second call on another channel when the first one has not
+        answered after hedge_delay, returns the first successful answer"""
+        timeout = self._timeout(method, timeout)
+        started = time.monotonic()
+        calls = {asyncio.ensure_future(self.call(method, request, timeout, metadata))}
+        done, pending = await asyncio.wait(calls, timeout=self.hedge_delay)
+        if not done:
+            remaining = None if timeout is None else timeout - (time.monotonic() - started)
+            if remaining is None or remaining > 0:
+                calls.add(asyncio.ensure_future(self.call(method, request, remaining, metadata)))
+        try:
+            pending = calls
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for call in done:
+                    if call.exception() is None:
+                        return call.result()
+            # every call failed
+            return call.result()
+        finally:
+            for call in calls:
+                call.cancel()
+
+    async def batch_status(self, resources, timeout=None, max_in_flight=64):
+        """Looks up the status of many resources concurrently, see KubeSpawnerClient.batch_status"""
+        slots = asyncio.Semaphore(max_in_flight)
+
+        async def lookup(namespace, name, type):
+            async with slots:
+                try:
+                    response = await self.call("GetResourceStatus", kubespawner_pb2.Resource(
+                        namespace=namespace, name=name, type=type), timeout)
+                except grpc.RpcError as e:
+                    return error_payload(e)
+            return struct_to_dict(response)
+
+        return await asyncio.gather(*(lookup(*resource) for resource in resources))
+
+    async def close(self):
+        await asyncio.gather(*self.pool.close())
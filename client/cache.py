@@ -0,0 +1,154 @@
+# encoding: utf-8
+#
+# Copyright (c) 2020-2021 Hopenly srl.
+#
+# This file is part of Ilyde.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import collections
+import logging
+import threading
+import time
+
+import grpc
+
+from protos import kubespawner_pb2
+
+logger = logging.getLogger(__name__)
+
+
+class StatusCache(object):
+    """Caches the payloads of GetResourceStatus by (namespace, name, type)
+    for ttl seconds, the least recently used entries are evicted beyond
+    max_entries. Concurrent misses of the same key make one call.
+
+    With watch set, a WatchStatusChanges stream per namespace drops the
+    entries whose status changed, so the ttl can be long. While the stream
+    is down, the entries of the namespace only expire.
+
+    Returned payloads are shared and must not be modified.
+    """
+
+    def __init__(self, client, ttl=1.0, max_entries=10000, watch=False, clock=time.monotonic):
+        """
+        Args:
+            client: KubeSpawnerClient
+        """
+        self._client = client
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._watch = watch
+        self._clock = clock
+        self._lock = threading.Lock()
+        # key -> (payload, expiry)
+        self._entries = collections.OrderedDict()
+        # key -> threading.Event of the call in flight
+        self._loading = {}
+        # namespace -> number of invalidations, a payload read while its
+        # namespace was invalidated is not stored
+        self._generations = collections.defaultdict(int)
+        self._watches = {}
+        self._closed = threading.Event()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, namespace, name, type):
+        key = (namespace, name, type)
+        if self._watch:
+            self._ensure_watch(namespace)
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and entry[1] > self._clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[0]
+                loading = self._loading.get(key)
+                if loading is None:
+                    loading = self._loading[key] = threading.Event()
+                    generation = self._generations[namespace]
+                    self.misses += 1
+                    break
+            # another thread is reading the same status
+            loading.wait()
+
+        try:
+            payload = self._client.get_resource_status(namespace, name, type)
+            with self._lock:
+                if self._generations[namespace] == generation:
+                    self._entries[key] = (payload, self._clock() + self._ttl)
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self._max_entries:
+                        self._entries.popitem(last=False)
+            return payload
+        finally:
+            with self._lock:
+                del self._loading[key]
+            loading.set()
+
+    def invalidate(self, namespace, name=None, type=None):
+        """Drops the entry of a resource, or all the entries of namespace when name is None"""
+        with self._lock:
+            self._generations[namespace] += 1
+            if name is not None:
+                self._entries.pop((namespace, name, type), None)
+                return
+            for key in [key for key in self._entries if key[0] == namespace]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            for namespace in list(self._generations):
+                self._generations[namespace] += 1
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _ensure_watch(self, namespace):
+        with self._lock:
+            if namespace in self._watches:
+                return
+            self._watches[namespace] = thread = threading.Thread(
+                target=self._follow, args=(namespace,), name="status-watch-{}".format(namespace), daemon=True)
+        thread.start()
+
+    def _follow(self, namespace):
+        backoff = 1
+        while not self._closed.is_set():
+            call = self._client.WatchStatusChanges(kubespawner_pb2.StatusWatch(namespace=namespace))
+            with self._lock:
+                self._watches[namespace] = call
+            try:
+                for change in call:
+                    backoff = 1
+                    self.invalidate(namespace, change.name or None, change.type or None)
+            except grpc.RpcError as e:
+                if self._closed.is_set():
+                    return
+                logger.warning("status watch of namespace %s failed: %s", namespace, e.details())
+            # changes may have been missed
+            self.invalidate(namespace)
+            self._closed.wait(backoff)
+            backoff = min(backoff * 2, 30)
+
+    def close(self):
+        """Stops the watches"""
+        self._closed.set()
+        with self._lock:
+            watches = list(self._watches.values())
+        for watch in watches:
+            cancel = getattr(watch, "cancel", None)
+            if cancel is not None:
+                cancel()
@@ -0,0 +1,158 @@
+# encoding: utf-8
+#
+# Copyright (c) 2020-2021 Hopenly srl.
+#
+# This file is part of Ilyde.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import itertools
+import json
+import threading
+
+import grpc
+
+SERVICE = "kubespawner.KubeSpawnerServices"
+
+# read methods are retried by the channel when the server is unavailable or
+# its executor pool rejected the call, writes are never retried
+RETRIED_METHODS = ("GetResourceStatus", "GetTypedResourceStatus", "GetResourceEvents", "GetImagePullCoverage")
+
+SERVICE_CONFIG = {
+    "methodConfig": [{
+        "name": [{"service": SERVICE, "method": method} for method in RETRIED_METHODS],
+        "retryPolicy": {
+            "maxAttempts": 4,
+            "initialBackoff": "0.1s",
+            "maxBackoff": "1s",
+            "backoffMultiplier": 2,
+            "retryableStatusCodes": ["UNAVAILABLE", "RESOURCE_EXHAUSTED"],
+        },
+    }],
+}
+
+# default deadline in seconds by method name prefix, streams and long polls
+# (None) are only bounded by the deadline of the caller
+DEFAULT_TIMEOUTS = (
+    ("Get", 10),
+    ("Create", 30),
+    ("Delete", 30),
+    ("Spawn", 120),
+    ("Claim", 120),
+    ("Register", 30),
+    ("Stream", None),
+    ("Wait", None),
+    ("Watch", None),
+    ("Update", None),
+)
+
+
+def default_timeout(method, timeouts=DEFAULT_TIMEOUTS, default=30):
+    for prefix, timeout in timeouts:
+        if method.startswith(prefix):
+            return timeout
+    return default
+
+
+def channel_options(service_config=SERVICE_CONFIG, keepalive_ms=30000):
+    """options of the channels: keepalive pings detect dead connections
+    between calls, one connection per channel so that calls spread over the pool"""
+    return [
+        ("grpc.keepalive_time_ms", keepalive_ms),
+        ("grpc.keepalive_timeout_ms", 10000),
+        ("grpc.keepalive_permit_without_calls", 1),
+        ("grpc.http2.max_pings_without_data", 0),
+        ("grpc.use_local_subchannel_pool", 1),
+        ("grpc.enable_retries", 1),
+        ("grpc.service_config", json.dumps(service_config)),
+    ]
+
+
+class ChannelPool(object):
+    """A fixed set of channels to one target, handed out round robin.
+    A channel is one HTTP/2 connection whose concurrent streams are
+    limited, the pool spreads the calls over several connections.
+    """
+
+    def __init__(self, target, size=4, credentials=None, options=None, factory=None):
+        """
+        Args:
+            target: address of the server, host:port or unix:///path/to.sock
+            size: number of channels
+            credentials: grpc.ChannelCredentials, insecure channels when None
+            options: channel options, channel_options() when None
+            factory: function (target, credentials, options) -> channel,
+                used to create asyncio channels
+        """
+        self.target = target
+        options = channel_options() if options is None else options
+        factory = factory or _sync_channel
+        self.channels = [factory(target, credentials, options) for _ in range(size)]
+        self._next = itertools.cycle(self.channels)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.channels)
+
+    def get(self):
+        with self._lock:
+            return next(self._next)
+
+    def close(self):
+        """Closes the channels, returns what their close returned:
+        awaitables for asyncio channels"""
+        return [channel.close() for channel in self.channels]
+
+
+def _sync_channel(target, credentials, options):
+    if credentials is None:
+        return grpc.insecure_channel(target, options=options)
+    return grpc.secure_channel(target, credentials, options=options)
+
+
+def _aio_channel(target, credentials, options):
+    if credentials is None:
+        return grpc.aio.insecure_channel(target, options=options)
+    return grpc.aio.secure_channel(target, credentials, options=options)
+
+
+# (target, credentials, options) -> [pool, number of references]
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def shared_pool(target, size=4, credentials=None, options=None):
+    """Returns the process wide pool of channels to target with these
+    credentials and options, created on first use. Every call takes a
+    reference, given back with release_pool"""
+    key = (target, credentials, None if options is None else tuple(options))
+    with _pools_lock:
+        entry = _pools.get(key)
+        if entry is None:
+            entry = _pools[key] = [ChannelPool(target, size, credentials, options), 0]
+        entry[1] += 1
+        return entry[0]
+
+
+def release_pool(pool):
+    """Gives back a reference to a shared pool, its channels are closed with the last one"""
+    with _pools_lock:
+        key = next((key for key, entry in _pools.items() if entry[0] is pool), None)
+        if key is None:
+            return
+        entry = _pools[key]
+        entry[1] -= 1
+        if entry[1] > 0:
+            return
+        del _pools[key]
+    pool.close()
@@ -0,0 +1,163 @@
+# encoding: utf-8
+#
+# Copyright (c) 2020-2021 Hopenly srl.
+#
+# This file is part of Ilyde.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import functools
+import itertools
+import queue
+import threading
+import time
+
+import grpc
+from google.protobuf import json_format
+
+from protos import kubespawner_pb2, kubespawner_pb2_grpc
+from client.channels import shared_pool, release_pool, default_timeout
+
+
+METHODS = kubespawner_pb2.DESCRIPTOR.services_by_name["KubeSpawnerServices"].methods_by_name
+
+
+def struct_to_dict(message):
+    return json_format.MessageToDict(message)
+
+
+def error_payload(error):
+    """payload of a failed status lookup, in the form the server uses"""
+    return {"Error": "{}: {}".format(error.code().name, error.details())}
+
+
+class KubeSpawnerClient(object):
+    """Client of the KubeSpawner service over a pool of channels.
+
+    Every method of the service is available as an attribute and called with
+    the default deadline of its class unless a timeout is given:
+
+        client = KubeSpawnerClient("kubespawner:50051")
+        client.CreateDeploymentFromFile(kubespawner_pb2.File(...))
+        client.get_resource_status("default", "ws-1", "DEPLOYMENT")
+    """
+
+    def __init__(self, target="localhost:50051", pool=None, timeouts=None, hedge_delay=None, credentials=None):
+        """
+        Args:
+            target: address of the server
+            pool: ChannelPool, the pool shared by the process for target when None.
+                A pool given here is left open by close, it belongs to the caller
+            timeouts: function method name -> default deadline in seconds
+            hedge_delay: seconds after which a second GetResourceStatus call is
+                sent when the first has not answered, no hedging when None
+            credentials: grpc.ChannelCredentials of the shared pool, insecure when None
+        """
+        # the shared pool is only closed once none of its clients uses it
+        self._shared = pool is None
+        self.pool = pool or shared_pool(target, credentials=credentials)
+        self._stubs = itertools.cycle([kubespawner_pb2_grpc.KubeSpawnerServicesStub(channel)
+                                       for channel in self.pool.channels])
+        self._lock = threading.Lock()
+        self._timeouts = timeouts or default_timeout
+        self.hedge_delay = hedge_delay
+
+    def _stub(self):
+        with self._lock:
+            return next(self._stubs)
+
+    def _timeout(self, method, timeout):
+        return self._timeouts(method) if timeout is None else timeout
+
+    def call(self, method, request, timeout=None, metadata=None):
+        return getattr(self._stub(), method)(request, timeout=self._timeout(method, timeout), metadata=metadata)
+
+    def future(self, method, request, timeout=None, metadata=None):
+        return getattr(self._stub(), method).future(
+            request, timeout=self._timeout(method, timeout), metadata=metadata)
+
+    def __getattr__(self, method):
+        if method not in METHODS:
+            raise AttributeError(method)
+        return functools.partial(self.call, method)
+
+    def get_resource_status(self, namespace, name, type, timeout=None, metadata=None):
+        """Returns the status payload of a resource as a dict"""
+        request = kubespawner_pb2.Resource(namespace=namespace, name=name, type=type)
+        if self.hedge_delay is None:
+            return struct_to_dict(self.call("GetResourceStatus", request, timeout, metadata))
+        return struct_to_dict(self._hedged("GetResourceStatus", request, timeout, metadata))
+
+    def _hedged(self, method, request, timeout, metadata):
+        """Sends a second call on another channel when the first one has not
+        answered after hedge_delay, returns the first successful answer"""
+        timeout = self._timeout(method, timeout)
+        started = time.monotonic()
+        done = queue.Queue()
+        calls = [self.future(method, request, timeout, metadata)]
+        calls[0].add_done_callback(done.put)
+        try:
+            finished = done.get(timeout=self.hedge_delay)
+        except queue.Empty:
+            remaining = None if timeout is None else timeout - (time.monotonic() - started)
+            if remaining is None or remaining > 0:
+                calls.append(self.future(method, request, remaining, metadata))
+                calls[1].add_done_callback(done.put)
+            finished = done.get()
+
+        try:
+            # the first call that succeeds wins, else the last error is raised
+            failed = 0
+            while finished.exception() is not None:
+                failed += 1
+                if failed == len(calls):
+                    break
+                finished = done.get()
+            return finished.result()
+        finally:
+            for call in calls:
+                call.cancel()
+
+    def batch_status(self, resources, timeout=None, max_in_flight=64):
+        """Looks up the status of many resources concurrently.
+
+        Args:
+            resources: iterable of (namespace, name, type)
+            max_in_flight: largest number of concurrent calls
+        Returns:
+            the list of payloads in the order of resources, a failed lookup
+            gives {"Error": "<code>: <details>"}
+        """
+        resources = list(resources)
+        results = [None] * len(resources)
+        slots = threading.BoundedSemaphore(max_in_flight)
+        calls = []
+        for index, (namespace, name, type) in enumerate(resources):
+            slots.acquire()
+            call = self.future("GetResourceStatus", kubespawner_pb2.Resource(
+                namespace=namespace, name=name, type=type), timeout)
+            call.add_done_callback(lambda _: slots.release())
+            calls.append((index, call))
+        for index, call in calls:
+            try:
+                results[index] = struct_to_dict(call.result())
+            except grpc.RpcError as e:
+                results[index] = error_payload(e)
+        return results
+
+    def close(self):
+        """Gives back the shared pool, closed by the last of its clients"""
+        with self._lock:
+            shared, self._shared = self._shared, False
+        if shared:
+            release_pool(self.pool)
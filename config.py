@@ -22,3 +22,135 @@ import os
 # internal: for inside a kubernetes cluster
 # external: for outside the cluster
 CLUSTER_ENVIRONMENT = os.environ.get("CLUSTER_ENVIRONMENT") or "external"
+
+# addresses the server listens on, comma separated: host:port for TCP or
+# unix:///path/to.sock for a Unix domain socket, e.g. for a sidecar sharing the pod
+LISTEN_ADDRESSES = os.environ.get("LISTEN_ADDRESSES") or "[::]:50051"
+
+# dedicated executor pools: RPC methods are routed by class so that slow
+# creates and deletes never delay status reads
+# <POOL>_WORKERS: calls running at once, <POOL>_QUEUE: calls allowed to wait for one to end
+EXECUTOR_POOLS = {
+    "read": (int(os.environ.get("EXECUTOR_READ_WORKERS") or 16),
+             int(os.environ.get("EXECUTOR_READ_QUEUE") or 64)),
+    "create": (int(os.environ.get("EXECUTOR_CREATE_WORKERS") or 8),
+               int(os.environ.get("EXECUTOR_CREATE_QUEUE") or 64)),
+    "delete": (int(os.environ.get("EXECUTOR_DELETE_WORKERS") or 4),
+               int(os.environ.get("EXECUTOR_DELETE_QUEUE") or 64)),
+    "default": (int(os.environ.get("EXECUTOR_DEFAULT_WORKERS") or 4),
+                int(os.environ.get("EXECUTOR_DEFAULT_QUEUE") or 16)),
+    # streaming calls run for their whole duration, so workers is the maximum
+    # number of concurrent streams, queued streams send nothing until one ends
+    "stream": (int(os.environ.get("EXECUTOR_STREAM_WORKERS") or 64),
+               int(os.environ.get("EXECUTOR_STREAM_QUEUE") or 0)),
+    # long polls hold a worker while they wait
+    "wait": (int(os.environ.get("EXECUTOR_WAIT_WORKERS") or 64),
+             int(os.environ.get("EXECUTOR_WAIT_QUEUE") or 16)),
+    # operations on the replica, kept apart so they answer when the other pools are saturated
+    "admin": (int(os.environ.get("EXECUTOR_ADMIN_WORKERS") or 2),
+              int(os.environ.get("EXECUTOR_ADMIN_QUEUE") or 2)),
+}
+# server threads beyond the pools, for the health checks and reflection that
+# run outside of them and for the calls the saturated pools reject
+DIRECT_RPC_WORKERS = int(os.environ.get("DIRECT_RPC_WORKERS") or 8)
+
+# size in bytes of the chunks forwarded by StreamPodLogs, a chunk is sent
+# as soon as kubernetes flushes data so chunks may be smaller
+LOG_CHUNK_SIZE = int(os.environ.get("LOG_CHUNK_SIZE") or 16384)
+
+# shared watches: pods and events are served from one watch per namespace
+# timeout of each watch request, the watch is then resumed
+WATCH_TIMEOUT = int(os.environ.get("WATCH_TIMEOUT") or 300)
+# how long a request waits for the initial list of a namespace
+WATCH_SYNC_TIMEOUT = float(os.environ.get("WATCH_SYNC_TIMEOUT") or 10)
+# watches of a namespace nobody asked about for that long are stopped
+WATCH_IDLE_TIMEOUT = int(os.environ.get("WATCH_IDLE_TIMEOUT") or 1800)
+
+# WaitForReady / WaitForCompletion / UpdateDeployment: longest wait when the client sets no deadline
+WAIT_MAX_SECONDS = float(os.environ.get("WAIT_MAX_SECONDS") or 600)
+# answer this long before the client deadline so the client gets the last status
+WAIT_DEADLINE_MARGIN = float(os.environ.get("WAIT_DEADLINE_MARGIN") or 0.5)
+
+# threads creating the resources of workspaces concurrently in SpawnWorkspace
+SPAWN_WORKERS = int(os.environ.get("SPAWN_WORKERS") or 16)
+
+# threads patching the deployments of ScaleDeployments concurrently
+SCALE_WORKERS = int(os.environ.get("SCALE_WORKERS") or 32)
+
+# SubmitJobArray: threads creating the jobs of an array concurrently, largest array
+JOB_ARRAY_WORKERS = int(os.environ.get("JOB_ARRAY_WORKERS") or 16)
+JOB_ARRAY_MAX_ITEMS = int(os.environ.get("JOB_ARRAY_MAX_ITEMS") or 1000)
+
+# warm pools: seconds between two refills, deployments created per refill
+WARM_POOL_INTERVAL = float(os.environ.get("WARM_POOL_INTERVAL") or 10)
+WARM_POOL_MAX_CREATES = int(os.environ.get("WARM_POOL_MAX_CREATES") or 5)
+# seconds without claim before a pool shrinks to its min_size
+WARM_POOL_IDLE_TIMEOUT = int(os.environ.get("WARM_POOL_IDLE_TIMEOUT") or 3600)
+
+# image pre-pull: a DaemonSet pulls the most used images on every node. Needs list
+# on nodes and create and update on daemonsets of PREPULL_NAMESPACE
+PREPULL_ENABLED = (os.environ.get("PREPULL_ENABLED") or "false").lower() == "true"
+PREPULL_NAMESPACE = os.environ.get("PREPULL_NAMESPACE") or "default"
+PREPULL_NAME = os.environ.get("PREPULL_NAME") or "ilyde-image-prepuller"
+PREPULL_TOP_K = int(os.environ.get("PREPULL_TOP_K") or 5)
+PREPULL_INTERVAL = float(os.environ.get("PREPULL_INTERVAL") or 300)
+# image of the statically linked busybox the pre-pull containers run
+PREPULL_HELPER_IMAGE = os.environ.get("PREPULL_HELPER_IMAGE") or "busybox:1.33.1-uclibc"
+
+# check Deployments, Jobs and PVCs against the ResourceQuotas and LimitRanges
+# of their namespace before creating them. Needs list and watch on resourcequotas
+# and limitranges in every namespace workspaces are created in, e.g. a ClusterRole
+# with rules [{apiGroups: [""], resources: [resourcequotas, limitranges], verbs: [list, watch]}]
+QUOTA_PRECHECK = (os.environ.get("QUOTA_PRECHECK") or "false").lower() == "true"
+
+# IngressRoutes: with INGRESS_AGGREGATE, CreateIngressFromFile and DeleteIngress add and
+# remove routes of shared IngressRoutes, INGRESS_SHARDS per namespace and entry points,
+# written at most once per INGRESS_DEBOUNCE seconds
+INGRESS_AGGREGATE = (os.environ.get("INGRESS_AGGREGATE") or "false").lower() == "true"
+INGRESS_SHARDS = int(os.environ.get("INGRESS_SHARDS") or 1)
+INGRESS_DEBOUNCE = float(os.environ.get("INGRESS_DEBOUNCE") or 0.5)
+# members of a shared IngressRoute at most, the next ingresses get IngressRoutes of their own
+INGRESS_MAX_MEMBERS = int(os.environ.get("INGRESS_MAX_MEMBERS") or 500)
+
+# PVC pools: seconds between two refills, PVCs created per refill
+PVC_POOL_INTERVAL = float(os.environ.get("PVC_POOL_INTERVAL") or 10)
+PVC_POOL_MAX_CREATES = int(os.environ.get("PVC_POOL_MAX_CREATES") or 5)
+
+# seconds between two refreshes of the served API versions
+DISCOVERY_INTERVAL = float(os.environ.get("DISCOVERY_INTERVAL") or 600)
+
+# health probes: seconds between two probes, timeout of the API server probe
+HEALTH_INTERVAL = float(os.environ.get("HEALTH_INTERVAL") or 5)
+HEALTH_TIMEOUT = float(os.environ.get("HEALTH_TIMEOUT") or 2)
+# the API server is unhealthy above this median latency in seconds or this
+# error rate over the last HEALTH_WINDOW probes
+HEALTH_MAX_LATENCY = float(os.environ.get("HEALTH_MAX_LATENCY") or 1)
+HEALTH_MAX_ERROR_RATE = float(os.environ.get("HEALTH_MAX_ERROR_RATE") or 0.5)
+HEALTH_WINDOW = int(os.environ.get("HEALTH_WINDOW") or 6)
+# an executor pool is saturated above this fraction of its workers and queue in use
+HEALTH_SATURATION = float(os.environ.get("HEALTH_SATURATION") or 0.9)
+
+# logging: level of the root logger, per logger levels as name=LEVEL,name=LEVEL,
+# format text or json
+LOG_LEVEL = os.environ.get("LOG_LEVEL") or "INFO"
+LOG_LEVELS = os.environ.get("LOG_LEVELS") or "urllib3=WARNING,kubernetes=WARNING"
+LOG_FORMAT = os.environ.get("LOG_FORMAT") or "text"
+# records waiting for the writer thread before new ones are dropped
+LOG_QUEUE_SIZE = int(os.environ.get("LOG_QUEUE_SIZE") or 10000)
+# at most LOG_RATE_BURST identical error logs per LOG_RATE_INTERVAL seconds
+LOG_RATE_BURST = int(os.environ.get("LOG_RATE_BURST") or 10)
+LOG_RATE_INTERVAL = float(os.environ.get("LOG_RATE_INTERVAL") or 60)
+
+# resource usage: seconds between two polls of metrics.k8s.io per namespace,
+# samples kept per resource, namespaces nobody asked about for that long are not polled
+USAGE_INTERVAL = float(os.environ.get("USAGE_INTERVAL") or 30)
+USAGE_HISTORY = int(os.environ.get("USAGE_HISTORY") or 20)
+USAGE_IDLE_TIMEOUT = float(os.environ.get("USAGE_IDLE_TIMEOUT") or 600)
+
+# file the calls are appended to for a later replay (see benchmarks/replay.py),
+# nothing is recorded when empty
+RECORD_PATH = os.environ.get("RECORD_PATH") or ""
+
+# profiles: longest sampling in seconds, seconds between two samples
+PROFILE_MAX_SECONDS = int(os.environ.get("PROFILE_MAX_SECONDS") or 60)
+PROFILE_INTERVAL = float(os.environ.get("PROFILE_INTERVAL") or 0.01)
@@ -0,0 +1,121 @@
+# encoding: utf-8
+#
+# Copyright (c) 2020-2021 Hopenly srl.
+#
+# This file is part of Ilyde.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import logging
+import threading
+
+from kubernetes import client
+
+from metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+# resources whose API version depends on the cluster:
+# plural -> (candidate groups by preference, (group, version) used when discovery fails)
+RESOURCES = {
+    "cronjobs": (("batch",), ("batch", "v1beta1")),
+    "ingressroutes": (("traefik.io", "traefik.containo.us"), ("traefik.containo.us", "v1alpha1")),
+}
+
+
+class Discovery(object):
+    """Caches which group and version serve each resource of RESOURCES, so that
+    handlers call the preferred served version of the cluster instead of a
+    hard-coded one. Loaded at startup and refreshed in the background.
+    """
+
+    def __init__(self, resources=RESOURCES, interval=600):
+        self._resources = resources
+        self._interval = interval
+        self._lock = threading.Lock()
+        self._routes = {plural: default for plural, (_, default) in resources.items()}
+        self._stopped = threading.Event()
+        self.refreshes = REGISTRY.counter("discovery.refreshes")
+        self.failures = REGISTRY.counter("discovery.failures")
+
+    def start(self):
+        self.refresh()
+        threading.Thread(target=self._run, name="api-discovery", daemon=True).start()
+
+    def stop(self):
+        self._stopped.set()
+
+    def _run(self):
+        while not self._stopped.wait(self._interval):
+            self.refresh()
+
+    def refresh(self):
+        try:
+            routes = self._discover()
+        except Exception as e:
+            self.failures.inc()
+            logger.error("API discovery failed, keeping the previous versions: %s", e)
+            return
+        with self._lock:
+            self._routes.update(routes)
+        self.refreshes.inc()
+
+    def _discover(self):
+        api_client = client.ApiClient()
+        groups = {
+            group.name: [group.preferred_version.version] + [
+                version.version for version in group.versions
+                if version.version != group.preferred_version.version
+            ]
+            for group in client.ApisApi(api_client).get_api_versions().groups
+        }
+
+        routes = {}
+        for plural, (candidates, _) in self._resources.items():
+            for group in candidates:
+                version = self._serving_version(api_client, group, groups.get(group, []), plural)
+                if version is not None:
+                    routes[plural] = (group, version)
+                    break
+            else:
+                logger.warning("no served version of %s, using the default one", plural)
+        return routes
+
+    @staticmethod
+    def _serving_version(api_client, group, versions, plural):
+        """first version of group, preferred one first, serving plural"""
+        for version in versions:
+            resources = api_client.call_api(
+                '/apis/{}/{}'.format(group, version), 'GET',
+                response_type='object', auth_settings=['BearerToken'],
+                _return_http_data_only=True)
+            if any(resource["name"] == plural for resource in resources.get("resources", [])):
+                return version
+        return None
+
+    def resolve(self, plural):
+        """Returns the (group, version) serving plural"""
+        with self._lock:
+            return self._routes[plural]
+
+    def route(self, plural, manifest=None):
+        """Returns the (group, version) serving plural and sets the apiVersion
+        of manifest to it, the schemas of the versions being compatible"""
+        group, version = self.resolve(plural)
+        if manifest is not None:
+            manifest["apiVersion"] = "{}/{}".format(group, version)
+        return group, version
+
+    def snapshot(self):
+        with self._lock:
+            return {plural: "{}/{}".format(*route) for plural, route in self._routes.items()}
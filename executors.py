@@ -0,0 +1,203 @@
+# encoding: utf-8
+#
+# Copyright (c) 2020-2021 Hopenly srl.
+#
+# This file is part of Ilyde.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import time
+import threading
+
+from metrics import REGISTRY
+
+
+class PoolSaturated(Exception):
+    """Raised when a pool has no free worker and its queue is full
+    """
+
+
+class MethodPool(object):
+    """Bounds the concurrency of a class of RPC methods. The calls run on
+    the thread of their caller, the gRPC thread, once one of max_workers
+    slots is free; max_queue more calls may wait for one, the next ones are
+    rejected. It records queue depth and latency.
+    """
+
+    def __init__(self, name, max_workers, max_queue):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        # running + waiting calls, bounded by max_workers + max_queue
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._workers = threading.BoundedSemaphore(max_workers)
+        self.queue_depth = REGISTRY.gauge("executor.{}.queue_depth".format(name))
+        self.active = REGISTRY.gauge("executor.{}.active".format(name))
+        self.rejected = REGISTRY.counter("executor.{}.rejected".format(name))
+        self.wait_time = REGISTRY.summary("executor.{}.wait_seconds".format(name))
+        self.run_time = REGISTRY.summary("executor.{}.run_seconds".format(name))
+
+    @property
+    def capacity(self):
+        return self.max_workers + self.max_queue
+
+    def run(self, fn, *args, **kwargs):
+        """Calls fn on this thread once a worker slot is free.
+        Raises PoolSaturated when the queue is full already"""
+        self._admit()
+        try:
+            started = self._start()
+        except BaseException:
+            self._slots.release()
+            raise
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self._finish(started)
+
+    def hold(self, iterator):
+        """Wraps a response iterator so that it keeps a slot of the pool
+        until the stream is exhausted or closed, it waits for a worker slot
+        when it is first iterated
+        """
+        self._admit()
+        return _HeldStream(self, iterator)
+
+    def _admit(self):
+        if not self._slots.acquire(blocking=False):
+            self.rejected.inc()
+            raise PoolSaturated("executor pool '{}' is saturated".format(self.name))
+
+    def _start(self):
+        """waits for a worker slot, returns when the call started"""
+        enqueued = time.monotonic()
+        self.queue_depth.inc()
+        try:
+            self._workers.acquire()
+        finally:
+            self.queue_depth.dec()
+        started = time.monotonic()
+        self.active.inc()
+        self.wait_time.observe(started - enqueued)
+        return started
+
+    def _finish(self, started):
+        self.active.dec()
+        self.run_time.observe(time.monotonic() - started)
+        self._workers.release()
+        self._slots.release()
+
+
+class _HeldStream(object):
+    """Response iterator holding a slot of a MethodPool, the slot is
+    released once, when the stream ends or the iterator is dropped
+    """
+
+    def __init__(self, pool, iterator):
+        self._pool = pool
+        self._iterator = iterator
+        self._started = None
+        self._released = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            if self._started is None:
+                self._started = self._pool._start()
+            return next(self._iterator)
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self):
+        if self._released:
+            return
+        self._released = True
+        close = getattr(self._iterator, "close", None)
+        if close is not None:
+            close()
+        if self._started is not None:
+            self._pool._finish(self._started)
+        else:
+            self._pool._slots.release()
+
+    def __del__(self):
+        self.close()
+
+
+class ExecutorRouter(object):
+    """Routes RPC methods to dedicated pools according to their class,
+    so that slow writes and deletes never delay latency sensitive reads.
+    """
+
+    # ordered list of (method name prefix, pool name)
+    DEFAULT_ROUTES = (
+        ("Get", "read"),
+        ("Create", "create"),
+        ("Spawn", "create"),
+        ("Claim", "create"),
+        ("Submit", "create"),
+        ("Delete", "delete"),
+        ("Stream", "stream"),
+        ("Wait", "wait"),
+        ("Watch", "stream"),
+        ("Update", "stream"),
+        ("Profile", "admin"),
+        ("Inspect", "admin"),
+    )
+
+    def __init__(self, pools, routes=DEFAULT_ROUTES, default="default"):
+        """
+        Args:
+            pools: dict pool name -> (max_workers, max_queue)
+            routes: ordered (method prefix, pool name) pairs
+            default: pool used by methods that match no route
+        """
+        if default not in pools:
+            raise ValueError("default pool '{}' is not configured".format(default))
+
+        self.pools = {
+            name: MethodPool(name, max_workers, max_queue)
+            for name, (max_workers, max_queue) in pools.items()
+        }
+        self.routes = tuple((prefix, pool) for prefix, pool in routes if pool in self.pools)
+        self.default = default
+
+    @property
+    def capacity(self):
+        """total number of calls the pools can hold (running + queued)"""
+        return sum(pool.capacity for pool in self.pools.values())
+
+    def pool_for(self, method_name):
+        """Returns the pool serving method_name, in the form
+        "/package.Service/Method" or just "Method"
+        """
+        method = method_name.rsplit("/", 1)[-1]
+        for prefix, pool in self.routes:
+            if method.startswith(prefix):
+                return self.pools[pool]
+        return self.pools[self.default]
+
+    def snapshot(self):
+        return {
+            name: {
+                "max_workers": pool.max_workers,
+                "max_queue": pool.max_queue,
+                "queue_depth": pool.queue_depth.value,
+                "active": pool.active.value,
+                "rejected": pool.rejected.value,
+            }
+            for name, pool in self.pools.items()
+        }
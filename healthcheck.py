@@ -0,0 +1,161 @@
+# encoding: utf-8
+#
+# Copyright (c) 2020-2021 Hopenly srl.
+#
+# This file is part of Ilyde.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import collections
+import logging
+import threading
+import time
+
+from grpc_health.v1 import health_pb2
+from kubernetes import client
+
+from metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+SERVING = health_pb2.HealthCheckResponse.SERVING
+NOT_SERVING = health_pb2.HealthCheckResponse.NOT_SERVING
+
+# components reported as their own service, next to the overall health
+API_SERVER = "kubernetes-api"
+INFORMERS = "informers"
+EXECUTORS = "executors"
+
+# pools of the calls that last, a few log tails or long polls can fill them
+# without the replica failing to serve anything else
+LONG_CALL_POOLS = ("stream", "wait", "admin")
+
+
+class HealthProber(object):
+    """Probes the dependencies of the server in the background and sets the
+    statuses of the health servicer from the cached results:
+
+    - kubernetes-api: NOT_SERVING when the error rate over the last probes or
+      the median probe latency exceeds its threshold
+    - informers: NOT_SERVING while a started watch cache is not synced
+    - executors: NOT_SERVING when a method pool is close to saturation
+
+    The overall status ("" and the services of the server) follows the API
+    server and the pools of the unary calls only: an informer of one namespace
+    or a pool of long calls does not take the replica out of the load balancer.
+    """
+
+    def __init__(self, health_servicer, services, router, informers=None, interval=5, timeout=2,
+                 max_latency=1.0, max_error_rate=0.5, window=6, saturation=0.9):
+        self._health = health_servicer
+        self._services = [""] + list(services)
+        self._router = router
+        self._informers = informers
+        self._interval = interval
+        self._timeout = timeout
+        self._max_latency = max_latency
+        self._max_error_rate = max_error_rate
+        self._saturation = saturation
+        # (ok, latency) of the last probes of the API server
+        self._probes = collections.deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._results = {}
+        self._stopped = threading.Event()
+        self.latency = REGISTRY.summary("health.api_server.latency_seconds")
+        self.errors = REGISTRY.counter("health.api_server.errors")
+
+    def start(self):
+        threading.Thread(target=self._run, name="health-prober", daemon=True).start()
+
+    def stop(self):
+        self._stopped.set()
+
+    def _run(self):
+        while True:
+            try:
+                self.probe()
+            except Exception as e:
+                logger.error("health probe failed: %s", e)
+            if self._stopped.wait(self._interval):
+                return
+
+    def probe(self):
+        results = {
+            API_SERVER: self._probe_api_server(),
+            INFORMERS: self._probe_informers(),
+            EXECUTORS: self._probe_executors(),
+        }
+        healthy = results[API_SERVER]["healthy"] and not results[EXECUTORS]["blocking"]
+
+        with self._lock:
+            previous, self._results = self._results, results
+        for name, result in sorted(results.items()):
+            if result["healthy"] and not previous.get(name, result)["healthy"]:
+                logger.info("%s is healthy again", name)
+            elif not result["healthy"] and previous.get(name, {"healthy": True})["healthy"]:
+                logger.warning("%s is unhealthy: %s", name, result)
+
+        for name, result in results.items():
+            self._health.set(name, SERVING if result["healthy"] else NOT_SERVING)
+        for service in self._services:
+            self._health.set(service, SERVING if healthy else NOT_SERVING)
+        return healthy
+
+    def _probe_api_server(self):
+        started = time.monotonic()
+        try:
+            # the answer itself is not needed
+            client.VersionApi().get_code(_request_timeout=self._timeout, _preload_content=False).read()
+            ok = True
+        except Exception as e:
+            logger.debug("API server probe failed: %s", e)
+            self.errors.inc()
+            ok = False
+        latency = time.monotonic() - started
+        self.latency.observe(latency)
+
+        with self._lock:
+            self._probes.append((ok, latency))
+            probes = list(self._probes)
+        error_rate = sum(1 for ok, _ in probes if not ok) / len(probes)
+        latencies = sorted(latency for ok, latency in probes if ok)
+        median = latencies[len(latencies) // 2] if latencies else None
+        return {
+            "healthy": error_rate <= self._max_error_rate and median is not None and median <= self._max_latency,
+            "error_rate": error_rate,
+            "latency": median,
+        }
+
+    def _probe_informers(self):
+        if self._informers is None:
+            return {"healthy": True, "not_synced": []}
+        not_synced = sorted(name for name, informer in self._informers.snapshot().items()
+                            if not informer["synced"])
+        return {"healthy": not not_synced, "not_synced": not_synced}
+
+    def _probe_executors(self):
+        saturated = sorted(
+            name for name, pool in self._router.snapshot().items()
+            if pool["active"] + pool["queue_depth"] >= self._saturation * (pool["max_workers"] + pool["max_queue"])
+        )
+        return {
+            "healthy": not saturated,
+            "saturated": saturated,
+            # saturated pools of unary calls, they make the replica unhealthy
+            "blocking": [name for name in saturated if name not in LONG_CALL_POOLS],
+        }
+
+    def snapshot(self):
+        """last results of the probes"""
+        with self._lock:
+            return dict(self._results)
@@ -0,0 +1,275 @@
+# encoding: utf-8
+#
+# Copyright (c) 2020-2021 Hopenly srl.
+#
+# This file is part of Ilyde.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import hashlib
+import json
+import logging
+import threading
+import time
+import zlib
+from concurrent import futures
+
+from kubernetes import client
+from kubernetes.client.rest import ApiException
+
+from metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+AGGREGATE_LABEL = "ilyde.io/ingress-aggregate"
+# spec.routes holds the routes of the members in name order, one annotation per
+# member, keyed by a hash of its name, holds [name, number of routes]
+MEMBER_PREFIX = "routes.ilyde.io/"
+
+HTTP_NOT_FOUND = 404
+HTTP_CONFLICT = 409
+MAX_ATTEMPTS = 5
+
+
+class AggregateFull(Exception):
+    """Raised when the aggregate of an ingress already has its maximum of members"""
+
+
+def member_key(name):
+    """annotation of a member, of a fixed length whatever the length of its name"""
+    return MEMBER_PREFIX + hashlib.sha1(name.encode()).hexdigest()[:16]
+
+
+def members_of(aggregate):
+    """{member name: routes} of an aggregated IngressRoute"""
+    annotations = (aggregate or {}).get("metadata", {}).get("annotations") or {}
+    counts = dict(json.loads(value) for key, value in annotations.items() if key.startswith(MEMBER_PREFIX))
+    routes = list(((aggregate or {}).get("spec") or {}).get("routes") or [])
+    if sum(counts.values()) != len(routes):
+        logger.warning("routes of ingress aggregate %s do not match its members",
+                       (aggregate or {}).get("metadata", {}).get("name"))
+    members = {}
+    for name in sorted(counts):
+        members[name], routes = routes[:counts[name]], routes[counts[name]:]
+    return members
+
+
+def routes_of(members):
+    """spec.routes of an aggregate, members in name order"""
+    return [route for name in sorted(members) for route in members[name]]
+
+
+class IngressRouteAggregator(object):
+    """Keeps the routes of many IngressRoutes in one IngressRoute per namespace,
+    entry points and TLS settings, and shard, so that Traefik reloads once
+    per batch instead of once per ingress.
+
+    Changes are queued and applied by a writer thread debounce seconds after
+    the first one, all the changes of an aggregate in one write. Writes carry
+    the resource version they were computed from and are redone on conflict,
+    so several replicas can share the aggregates. add and remove return once
+    their change is applied.
+    """
+
+    def __init__(self, discovery, shards=1, debounce=0.5, prefix="ilyde-routes", max_members=500):
+        self._discovery = discovery
+        self._shards = shards
+        # bounds the size of an aggregate, the object and its annotations
+        self._max_members = max_members
+        self._debounce = debounce
+        self._prefix = prefix
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        # (namespace, aggregate) -> {member: (routes or None to remove, Future)}
+        self._pending = {}
+        # (namespace, aggregate) -> spec of the aggregate without its routes
+        self._templates = {}
+        # (namespace, member) -> aggregate
+        self._members = {}
+        self._thread = None
+        self.changes = REGISTRY.counter("ingress.route_changes")
+        self.patches = REGISTRY.counter("ingress.patches")
+        self.conflicts = REGISTRY.counter("ingress.conflicts")
+        self.batch_size = REGISTRY.summary("ingress.batch_size")
+
+    def aggregate_name(self, name, spec):
+        """name of the aggregate of the ingress name: its entry points and TLS
+        settings, which are shared by all the routes of an IngressRoute, and its shard"""
+        template = {key: value for key, value in spec.items() if key != "routes"}
+        signature = hashlib.sha1(json.dumps(template, sort_keys=True).encode()).hexdigest()[:8]
+        return "{}-{}-{}".format(self._prefix, signature, zlib.crc32(name.encode()) % self._shards)
+
+    def add(self, namespace, manifest):
+        """Adds, or replaces, the routes of an IngressRoute manifest. Returns the
+        name of its aggregate.
+
+        Raises:
+            AggregateFull: the aggregate has max_members members already
+        """
+        name = manifest["metadata"]["name"]
+        spec = manifest.get("spec") or {}
+        aggregate = self.aggregate_name(name, spec)
+        with self._lock:
+            self._templates[(namespace, aggregate)] = {key: value for key, value in spec.items() if key != "routes"}
+            previous = self._members.get((namespace, name))
+        if previous is not None and previous != aggregate:
+            # entry points or TLS changed, the routes move to another aggregate
+            self._submit(namespace, previous, name, None).result()
+        self._submit(namespace, aggregate, name, spec.get("routes") or []).result()
+        return aggregate
+
+    def remove(self, namespace, name, lookup=True):
+        """Removes the routes of an ingress. Returns False when no aggregate has
+        them. Without lookup, only the members this replica added or removed are
+        known, which spares listing the aggregates."""
+        with self._lock:
+            aggregate = self._members.get((namespace, name))
+        if aggregate is None:
+            if not lookup:
+                return False
+            aggregate = self._find(namespace, name)
+            if aggregate is None:
+                return False
+        self._submit(namespace, aggregate, name, None).result()
+        return True
+
+    def _find(self, namespace, name):
+        group, version = self._discovery.route("ingressroutes")
+        aggregates = client.CustomObjectsApi().list_namespaced_custom_object(
+            group=group, version=version, namespace=namespace, plural="ingressroutes",
+            label_selector="{}=true".format(AGGREGATE_LABEL))
+        for aggregate in aggregates.get("items", []):
+            if name in members_of(aggregate):
+                return aggregate["metadata"]["name"]
+        return None
+
+    def _submit(self, namespace, aggregate, name, routes):
+        future = futures.Future()
+        with self._lock:
+            pending = self._pending.setdefault((namespace, aggregate), {})
+            replaced = pending.get(name)
+            pending[name] = (routes, future)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="ingress-aggregator", daemon=True)
+                self._thread.start()
+        if replaced is not None:
+            # the newer change of the same ingress wins
+            replaced[1].set_result(None)
+        self.changes.inc()
+        self._wakeup.set()
+        return future
+
+    def _run(self):
+        while True:
+            self._wakeup.wait()
+            # let the changes of a burst pile up
+            time.sleep(self._debounce)
+            self._wakeup.clear()
+            with self._lock:
+                batches, self._pending = self._pending, {}
+            for (namespace, aggregate), changes in batches.items():
+                self.batch_size.observe(len(changes))
+                try:
+                    refused = self._apply(namespace, aggregate,
+                                          {name: routes for name, (routes, _) in changes.items()})
+                except Exception as e:
+                    logger.error("update of ingress aggregate %s/%s failed: %s", namespace, aggregate, e)
+                    for _, future in changes.values():
+                        future.set_exception(e)
+                    continue
+                for name in refused:
+                    changes.pop(name)[1].set_exception(AggregateFull(
+                        "ingress aggregate {}/{} has {} members already".format(
+                            namespace, aggregate, self._max_members)))
+                with self._lock:
+                    for name, (routes, _) in changes.items():
+                        if routes is None:
+                            if self._members.get((namespace, name)) == aggregate:
+                                del self._members[(namespace, name)]
+                        else:
+                            self._members[(namespace, name)] = aggregate
+                for _, future in changes.values():
+                    future.set_result(None)
+
+    def _apply(self, namespace, aggregate, changes):
+        """Writes changes, {member: routes or None}, to the aggregate in one call.
+        Returns the new members refused because the aggregate is full"""
+        group, version = self._discovery.route("ingressroutes")
+        api_instance = client.CustomObjectsApi()
+        with self._lock:
+            template = self._templates.get((namespace, aggregate), {})
+
+        for attempt in range(MAX_ATTEMPTS):
+            try:
+                current = api_instance.get_namespaced_custom_object(
+                    group=group, version=version, namespace=namespace, plural="ingressroutes", name=aggregate)
+            except ApiException as e:
+                if e.status != HTTP_NOT_FOUND:
+                    raise
+                current = None
+
+            members = members_of(current)
+            refused = set()
+            for name, routes in sorted(changes.items(), key=lambda change: change[1] is not None):
+                if routes is None:
+                    members.pop(name, None)
+                elif name in members or len(members) < self._max_members:
+                    members[name] = routes
+                else:
+                    refused.add(name)
+            annotations = {member_key(name): json.dumps([name, len(routes)]) if routes is not None else None
+                           for name, routes in changes.items() if name not in refused}
+
+            try:
+                if current is None:
+                    if not members:
+                        return refused
+                    manifest = {
+                        "kind": "IngressRoute",
+                        "metadata": {
+                            "name": aggregate,
+                            "labels": {AGGREGATE_LABEL: "true"},
+                            "annotations": {key: value for key, value in annotations.items() if value is not None},
+                        },
+                        "spec": dict(template, routes=routes_of(members)),
+                    }
+                    self._discovery.route("ingressroutes", manifest)
+                    api_instance.create_namespaced_custom_object(
+                        group=group, version=version, namespace=namespace, plural="ingressroutes", body=manifest)
+                elif not members:
+                    # an IngressRoute needs at least one route
+                    api_instance.delete_namespaced_custom_object(
+                        group=group, version=version, namespace=namespace, plural="ingressroutes", name=aggregate,
+                        body=client.V1DeleteOptions(preconditions=client.V1Preconditions(
+                            resource_version=current["metadata"]["resourceVersion"])))
+                else:
+                    api_instance.patch_namespaced_custom_object(
+                        group=group, version=version, namespace=namespace, plural="ingressroutes", name=aggregate,
+                        body={"metadata": {"resourceVersion": current["metadata"]["resourceVersion"],
+                                           "annotations": annotations},
+                              "spec": {"routes": routes_of(members)}})
+                self.patches.inc()
+                return refused
+            except ApiException as e:
+                # another replica changed the aggregate since it was read
+                if e.status not in (HTTP_CONFLICT, HTTP_NOT_FOUND) or attempt == MAX_ATTEMPTS - 1:
+                    raise
+                self.conflicts.inc()
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "members": len(self._members),
+                "aggregates": len({(namespace, aggregate) for (namespace, _), aggregate in self._members.items()}),
+                "pending": sum(len(changes) for changes in self._pending.values()),
+            }
@@ -0,0 +1,206 @@
+# encoding: utf-8
+#
+# Copyright (c) 2020-2021 Hopenly srl.
+#
+# This file is part of Ilyde.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import logging
+import threading
+import time
+import types
+
+import grpc
+
+from protos import kubespawner_pb2
+from profiling import tagged, tagged_iterator
+
+logger = logging.getLogger(__name__)
+
+
+class InProcessRpcError(grpc.RpcError):
+    """Raised by the methods of InProcessStub where a gRPC stub raises its RpcError"""
+
+    def __init__(self, code, details):
+        super(InProcessRpcError, self).__init__("{}: {}".format(code.name, details))
+        self._code = code
+        self._details = details
+
+    def code(self):
+        return self._code
+
+    def details(self):
+        return self._details
+
+
+class InProcessContext(object):
+    """The parts of grpc.ServicerContext the servicers use, for calls that
+    never leave the process"""
+
+    def __init__(self, timeout=None, metadata=None):
+        self._deadline = None if timeout is None else time.monotonic() + timeout
+        self._metadata = tuple(metadata or ())
+        self._callbacks = []
+        self._lock = threading.Lock()
+        self._done = False
+        self._code = None
+        self._details = None
+        self.trailing_metadata = ()
+
+    def is_active(self):
+        return not self._done and (self._deadline is None or time.monotonic() < self._deadline)
+
+    def time_remaining(self):
+        if self._deadline is None:
+            return None
+        return max(0.0, self._deadline - time.monotonic())
+
+    def invocation_metadata(self):
+        return self._metadata
+
+    def peer(self):
+        return "inprocess"
+
+    def add_callback(self, callback):
+        with self._lock:
+            if self._done:
+                return False
+            self._callbacks.append(callback)
+            return True
+
+    def abort(self, code, details):
+        self._code = code
+        self._details = details
+        raise InProcessRpcError(code, details)
+
+    def abort_with_status(self, status):
+        self.abort(status.code, status.details)
+
+    def set_code(self, code):
+        self._code = code
+
+    def set_details(self, details):
+        self._details = details
+
+    def send_initial_metadata(self, metadata):
+        pass
+
+    def set_trailing_metadata(self, metadata):
+        self.trailing_metadata = tuple(metadata)
+
+    def done(self):
+        """Ends the call and runs the callbacks, as gRPC does when the call
+        terminates or is cancelled"""
+        with self._lock:
+            if self._done:
+                return
+            self._done = True
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:
+                logger.exception("callback of an in-process call failed")
+
+    def error(self, exception, details):
+        """InProcessRpcError for an exception raised by the servicer, with the
+        code it set if any as gRPC does"""
+        code = self._code if self._code not in (None, grpc.StatusCode.OK) else grpc.StatusCode.UNKNOWN
+        return InProcessRpcError(code, "{}: {}".format(details, exception))
+
+    def expired(self):
+        return self._deadline is not None and time.monotonic() >= self._deadline
+
+    def check(self):
+        """Raises the status set by the servicer when it is not OK"""
+        if self.expired():
+            raise InProcessRpcError(grpc.StatusCode.DEADLINE_EXCEEDED, "Deadline Exceeded")
+        if self._code is not None and self._code != grpc.StatusCode.OK:
+            raise InProcessRpcError(self._code, self._details or "")
+
+
+class _Stream(object):
+    """Responses of a server streaming call, cancel() ends it as the cancel
+    of a gRPC response iterator does"""
+
+    def __init__(self, method_name, iterator, context):
+        self._iterator = tagged_iterator(method_name, iterator)
+        self._context = context
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if not self._context.is_active():
+            self._context.done()
+            self._context.check()
+            raise InProcessRpcError(grpc.StatusCode.CANCELLED, "Locally cancelled")
+        try:
+            return next(self._iterator)
+        except StopIteration:
+            self._context.done()
+            self._context.check()
+            raise
+        except InProcessRpcError:
+            self._context.done()
+            raise
+        except Exception as e:
+            self._context.done()
+            raise self._context.error(e, "Exception iterating responses")
+
+    def cancel(self):
+        self._context.done()
+        return True
+
+    def is_active(self):
+        return self._context.is_active()
+
+
+class _Method(object):
+
+    def __init__(self, servicer, method):
+        self._handler = getattr(servicer, method.name)
+        self._method_name = "/{}/{}".format(method.containing_service.full_name, method.name)
+
+    def __call__(self, request, timeout=None, metadata=None):
+        context = InProcessContext(timeout, metadata)
+        try:
+            with tagged(self._method_name):
+                response = self._handler(request, context)
+        except InProcessRpcError:
+            context.done()
+            raise
+        except Exception as e:
+            context.done()
+            raise context.error(e, "Exception calling application")
+
+        if isinstance(response, types.GeneratorType):
+            return _Stream(self._method_name, response, context)
+        context.done()
+        context.check()
+        return response
+
+
+class InProcessStub(object):
+    """Calls the methods of a servicer the way a stub of its service does,
+    for embedders running it in their own process: requests and responses
+    are the protobuf objects themselves, nothing is serialized or sent.
+
+    Calls run on the calling thread, they go through neither the executor
+    pools nor the interceptors of the server.
+    """
+
+    def __init__(self, servicer, service=kubespawner_pb2.DESCRIPTOR.services_by_name["KubeSpawnerServices"]):
+        for method in service.methods:
+            setattr(self, method.name, _Method(servicer, method))
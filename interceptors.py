@@ -17,6 +17,7 @@
 # limitations under the License.
 #
 import logging
+import types
 from typing import Callable, Any
 from google.protobuf import any_pb2
 from grpc_interceptor import ServerInterceptor
@@ -26,10 +27,10 @@ import marshmallow
 from kubernetes.client.rest import ApiException, ApiValueError
 
 from protos import kubespawner_pb2
+from executors import PoolSaturated
+from metrics import REGISTRY
+from profiling import tagged, tagged_iterator
 
-# setup logger
-FORMAT = '%(asctime)s %(levelname)s %(message)s'
-logging.basicConfig(level=logging.INFO, format=FORMAT)
 logger = logging.getLogger(__name__)
 
 
@@ -100,3 +101,91 @@ class ExceptionToStatusInterceptor(ServerInterceptor):
             context.set_details(str(e))
             logger.error(str(e))
             return any_pb2.Any()
+
+
+class _ActiveStream(object):
+    """Response iterator counted in the active calls of its method until
+    the stream ends or the iterator is dropped
+    """
+
+    def __init__(self, gauge, iterator):
+        self._gauge = gauge
+        self._iterator = iterator
+        self._done = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            return next(self._iterator)
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self):
+        if self._done:
+            return
+        self._done = True
+        close = getattr(self._iterator, "close", None)
+        if close is not None:
+            close()
+        self._gauge.dec()
+
+    def __del__(self):
+        self.close()
+
+
+class ExecutorRoutingInterceptor(ServerInterceptor):
+    """Runs each RPC on its gRPC thread once the pool of its method class
+    (see executors.ExecutorRouter) has a free slot, so that one class of
+    calls cannot take all the threads of the server. Streams keep their
+    slot while gRPC iterates them.
+
+    Methods of other packages, the health checks and reflection, run directly
+    so that saturated pools never fail a liveness probe.
+    """
+
+    def __init__(self, router, package="/kubespawner."):
+        self._router = router
+        self._package = package
+
+    def intercept(
+        self,
+        method: Callable,
+        request: Any,
+        context: grpc.ServicerContext,
+        method_name: str,
+    ) -> Any:
+        if not method_name.startswith(self._package):
+            return method(request, context)
+
+        pool = self._router.pool_for(method_name)
+        active = REGISTRY.gauge("rpc.{}.active".format(method_name.rpartition("/")[2]))
+        active.inc()
+        streaming = False
+
+        def run():
+            # the client may have gone away while the call was queued
+            if not context.is_active():
+                return None
+            with tagged(method_name):
+                return method(request, context)
+
+        try:
+            result = pool.run(run)
+            if isinstance(result, types.GeneratorType):
+                # streaming responses are produced while gRPC iterates,
+                # keep the slot of the pool for the life of the stream,
+                # taken before the stream is counted as active
+                held = pool.hold(tagged_iterator(method_name, result))
+                result = _ActiveStream(active, held)
+                streaming = True
+        except PoolSaturated as e:
+            logger.error(str(e))
+            context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, str(e))
+        finally:
+            if not streaming:
+                active.dec()
+
+        return result
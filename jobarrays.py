@@ -0,0 +1,150 @@
+# encoding: utf-8
+#
+# Copyright (c) 2020-2021 Hopenly srl.
+#
+# This file is part of Ilyde.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import hashlib
+import json
+import re
+import string
+
+import yaml
+
+ARRAY_LABEL = "ilyde.io/job-array"
+INDEX_LABEL = "ilyde.io/job-array-index"
+PARAMETERS_ENV = "JOB_ARRAY_PARAMETERS"
+# length of a label value at most
+MAX_LABEL_LENGTH = 63
+
+_PLACEHOLDER = re.compile(r"^\$\{(\w+)\}$")
+
+
+class Placeholder(str):
+    """unquoted YAML scalar made of a single ${name}, replaced by the value of
+    the parameter as is, e.g. a number"""
+
+
+class TemplateLoader(yaml.SafeLoader):
+    pass
+
+
+def _construct_str(loader, node):
+    value = loader.construct_scalar(node)
+    if node.style is None and _PLACEHOLDER.match(value):
+        return Placeholder(value)
+    return value
+
+
+TemplateLoader.add_constructor("tag:yaml.org,2002:str", _construct_str)
+
+
+def load_template(text):
+    return yaml.load(text, Loader=TemplateLoader)
+
+
+def normalize(value):
+    """parameter value of a Struct: whole numbers are ints"""
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def as_text(value):
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return str(value)
+
+
+def render(value, parameters, texts=None):
+    """Copy of a manifest loaded by load_template with the ${name} placeholders
+    of its strings replaced; unknown placeholders are left alone.
+    """
+    if texts is None:
+        texts = {name: as_text(parameter) for name, parameter in parameters.items()}
+    if isinstance(value, dict):
+        return {render(key, parameters, texts): render(item, parameters, texts) for key, item in value.items()}
+    if isinstance(value, list):
+        return [render(item, parameters, texts) for item in value]
+    if isinstance(value, Placeholder):
+        name = _PLACEHOLDER.match(value).group(1)
+        return parameters[name] if name in parameters else str(value)
+    if isinstance(value, str) and "$" in value:
+        return string.Template(value).safe_substitute(texts)
+    return value
+
+
+def _label(manifest, labels):
+    manifest.setdefault("metadata", {}).setdefault("labels", {}).update(labels)
+    template = manifest.setdefault("spec", {}).setdefault("template", {})
+    template.setdefault("metadata", {}).setdefault("labels", {}).update(labels)
+
+
+def array_name(template):
+    """label value naming the array, the template name without its placeholders.
+    Names too long for a label are cut and end with a hash of the whole name"""
+    metadata = template.get("metadata") or {}
+    name = metadata.get("name") or metadata.get("generateName", "")
+    name = re.sub(r"-*\$\{\w+\}", "", name).strip("-") or "job-array"
+    if len(name) > MAX_LABEL_LENGTH:
+        digest = hashlib.sha1(name.encode()).hexdigest()[:8]
+        name = "{}-{}".format(name[:MAX_LABEL_LENGTH - len(digest) - 1].rstrip("-._"), digest)
+    return name
+
+
+def array_jobs(template, parameter_sets):
+    """One Job manifest per parameter set. ${index} is the position of the
+    set; jobs are named after the template plus their index unless the
+    template name has placeholders."""
+    name = array_name(template)
+    metadata = template.get("metadata") or {}
+    templated_name = "$" in metadata.get("name", "")
+    jobs = []
+    for index, parameters in enumerate(parameter_sets):
+        parameters = dict({key: normalize(value) for key, value in parameters.items()}, index=index)
+        job = render(template, parameters)
+        if metadata.get("name") and not templated_name:
+            job["metadata"]["name"] = "{}-{}".format(metadata["name"], index)
+        _label(job, {ARRAY_LABEL: name, INDEX_LABEL: str(index)})
+        jobs.append(job)
+    return jobs
+
+
+def indexed_job(template, parameter_sets, parallelism=None):
+    """One Indexed Job running a pod per parameter set. The pods find their
+    set in the JSON list of JOB_ARRAY_PARAMETERS at JOB_COMPLETION_INDEX;
+    placeholders of parameters that differ between sets are left alone."""
+    parameter_sets = [{key: normalize(item) for key, item in parameters.items()} for parameters in parameter_sets]
+    # the Job itself is shared by the pods: only the values common to all the sets are substituted
+    common = {key: value for key, value in parameter_sets[0].items()
+              if all(key in parameters and parameters[key] == value for parameters in parameter_sets)}
+    job = render(template, common)
+    name = (job.get("metadata") or {}).get("name", "")
+    if "$" in name:
+        raise ValueError("the name {} of an indexed job must be the same for all the parameter sets".format(name))
+    spec = job.setdefault("spec", {})
+    spec["completionMode"] = "Indexed"
+    spec["completions"] = len(parameter_sets)
+    spec["parallelism"] = parallelism or spec.get("parallelism") or len(parameter_sets)
+    _label(job, {ARRAY_LABEL: array_name(template)})
+
+    value = json.dumps(parameter_sets)
+    pod_spec = spec["template"].setdefault("spec", {})
+    for container in (pod_spec.get("initContainers") or []) + (pod_spec.get("containers") or []):
+        env = [variable for variable in container.get("env") or [] if variable.get("name") != PARAMETERS_ENV]
+        container["env"] = env + [{"name": PARAMETERS_ENV, "value": value}]
+    return job
@@ -0,0 +1,176 @@
+# encoding: utf-8
+#
+# Copyright (c) 2020-2021 Hopenly srl.
+#
+# This file is part of Ilyde.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import threading
+import time
+
+from metrics import REGISTRY
+
+TEXT_FORMAT = '%(asctime)s %(levelname)s %(name)s %(message)s'
+
+_listener = None
+
+
+def parse_levels(levels):
+    """"urllib3=WARNING,kubernetes=INFO" -> {"urllib3": "WARNING", "kubernetes": "INFO"}"""
+    result = {}
+    for item in (levels or "").split(","):
+        if "=" in item:
+            name, level = item.split("=", 1)
+            result[name.strip()] = level.strip().upper()
+    return result
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line"""
+
+    def format(self, record):
+        payload = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "thread": record.threadName,
+        }
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            payload["suppressed"] = suppressed
+        if record.exc_text:
+            payload["exception"] = record.exc_text
+        return json.dumps(payload, default=str)
+
+
+class TextFormatter(logging.Formatter):
+
+    def format(self, record):
+        message = super(TextFormatter, self).format(record)
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            message += " ({} similar messages suppressed)".format(suppressed)
+        return message
+
+
+class RateLimitFilter(logging.Filter):
+    """Lets through at most burst records of the same logger and message
+    template per interval seconds, from level up. The next record let
+    through carries the number of suppressed ones.
+    """
+
+    def __init__(self, burst=10, interval=60, level=logging.ERROR):
+        super(RateLimitFilter, self).__init__()
+        self._burst = burst
+        self._interval = interval
+        self._level = level
+        self._lock = threading.Lock()
+        # (logger, template) -> [window start, records in window, suppressed]
+        self._windows = {}
+        self.suppressed = REGISTRY.counter("logging.suppressed")
+
+    def filter(self, record):
+        if record.levelno < self._level:
+            return True
+        key = (record.name, str(record.msg))
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self._interval:
+                suppressed = window[2] if window is not None else 0
+                self._windows[key] = [now, 1, 0]
+                if len(self._windows) > 10000:
+                    self._expire(now)
+            elif window[1] < self._burst:
+                window[1] += 1
+                suppressed, window[2] = window[2], 0
+            else:
+                window[2] += 1
+                self.suppressed.inc()
+                return False
+        record.suppressed = suppressed
+        return True
+
+    def _expire(self, now):
+        for key, window in list(self._windows.items()):
+            if now - window[0] >= self._interval:
+                del self._windows[key]
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """Hands the records to the writer thread. Only the message is rendered
+    on the calling thread; when the queue is full the record is dropped
+    instead of blocking the request.
+    """
+
+    def __init__(self, log_queue):
+        super(NonBlockingQueueHandler, self).__init__(log_queue)
+        self.dropped = REGISTRY.counter("logging.dropped")
+
+    def prepare(self, record):
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            # tracebacks hold the frames of the request
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped.inc()
+
+
+def setup_logging(level="INFO", levels="", fmt="text", queue_size=10000, rate_burst=10, rate_interval=60):
+    """Configures the root logger once: records go through a bounded queue to a
+    writer thread printing them on stderr.
+
+    Args:
+        level: level of the root logger
+        levels: per logger levels, "name=LEVEL,name=LEVEL"
+        fmt: "text" or "json"
+        queue_size: records waiting for the writer before new ones are dropped
+        rate_burst, rate_interval: at most rate_burst identical error records
+            per rate_interval seconds
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    stream = logging.StreamHandler()
+    stream.setFormatter(JsonFormatter() if fmt == "json" else TextFormatter(TEXT_FORMAT))
+
+    log_queue = queue.Queue(maxsize=queue_size)
+    handler = NonBlockingQueueHandler(log_queue)
+    handler.addFilter(RateLimitFilter(rate_burst, rate_interval))
+
+    root = logging.getLogger()
+    for previous in list(root.handlers):
+        root.removeHandler(previous)
+    root.addHandler(handler)
+    root.setLevel(level.upper())
+    for name, logger_level in parse_levels(levels).items():
+        logging.getLogger(name).setLevel(logger_level)
+
+    _listener = logging.handlers.QueueListener(log_queue, stream, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
@@ -0,0 +1,106 @@
+# encoding: utf-8
+#
+# Copyright (c) 2020-2021 Hopenly srl.
+#
+# This file is part of Ilyde.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+from kubernetes import client
+
+from serializers import ResourceType
+
+PATCH_CONTENT_TYPES = {
+    "strategic": "application/strategic-merge-patch+json",
+    "merge": "application/merge-patch+json",
+    "json": "application/json-patch+json",
+}
+
+
+def connection_pools(api_client):
+    """usage of the urllib3 connection pools of an ApiClient, by host"""
+    pools = api_client.rest_client.pool_manager.pools
+    usage = {}
+    for key in pools.keys():
+        pool = pools.get(key)
+        if pool is None:
+            continue
+        # the queue holds the idle connections and None for the ones never opened
+        idle = sum(1 for connection in list(pool.pool.queue) if connection is not None) if pool.pool else 0
+        usage["{}:{}".format(pool.host, pool.port)] = {
+            "max_size": pool.pool.maxsize if pool.pool else 0,
+            "opened": pool.num_connections,
+            "idle": idle,
+            "requests": pool.num_requests,
+        }
+    return usage
+
+
+class PatchApiClient(client.ApiClient):
+    """ApiClient sending its patches with one content type. The generated
+    clients pick the content type themselves: json patch for lists and
+    strategic merge otherwise, merge patch only for custom objects.
+    """
+
+    def __init__(self, content_type):
+        super(PatchApiClient, self).__init__()
+        self.content_type = content_type
+
+    def select_header_content_type(self, content_types):
+        return self.content_type
+
+
+class Patcher(object):
+    """Patches Deployments, Services, Jobs, CronJobs and IngressRoutes in place.
+    One ApiClient, and so one connection pool, is kept per patch type.
+    """
+
+    def __init__(self, discovery):
+        self._discovery = discovery
+        self._api_clients = {
+            patch_type: PatchApiClient(content_type) for patch_type, content_type in PATCH_CONTENT_TYPES.items()
+        }
+
+    def patch(self, resource_type, namespace, name, patch_type, body):
+        """
+        Args:
+            resource_type: ResourceType
+            patch_type: strategic, merge or json
+            body: the patch document, a list of operations for a json patch
+        Returns:
+            the patched resource
+        Raises:
+            ValueError: the patch does not apply to resource_type
+        """
+        if (patch_type == "json") != isinstance(body, list):
+            raise ValueError("A json patch is a list of operations, other patches are objects")
+
+        api_client = self._api_clients[patch_type]
+        if resource_type is ResourceType.DEPLOYMENT:
+            return client.AppsV1Api(api_client).patch_namespaced_deployment(name=name, namespace=namespace, body=body)
+        elif resource_type is ResourceType.SERVICE:
+            return client.CoreV1Api(api_client).patch_namespaced_service(name=name, namespace=namespace, body=body)
+        elif resource_type is ResourceType.JOB:
+            return client.BatchV1Api(api_client).patch_namespaced_job(name=name, namespace=namespace, body=body)
+        elif resource_type in (ResourceType.CRONJOB, ResourceType.INGRESS):
+            plural = "cronjobs" if resource_type is ResourceType.CRONJOB else "ingressroutes"
+            if plural == "ingressroutes" and patch_type == "strategic":
+                raise ValueError("Custom resources do not support strategic merge patches")
+            group, version = self._discovery.route(plural)
+            return client.CustomObjectsApi(api_client).patch_namespaced_custom_object(
+                group=group, version=version, namespace=namespace, plural=plural, name=name, body=body)
+        else:
+            raise ValueError("{} resources cannot be patched".format(resource_type.name.lower()))
+
+    def snapshot(self):
+        return {patch_type: connection_pools(api_client) for patch_type, api_client in self._api_clients.items()}
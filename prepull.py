@@ -0,0 +1,229 @@
+# encoding: utf-8
+#
+# Copyright (c) 2020-2021 Hopenly srl.
+#
+# This file is part of Ilyde.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import logging
+import threading
+
+from kubernetes import client
+from kubernetes.client.rest import ApiException
+
+from metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+HTTP_NOT_FOUND = 404
+IMAGES_ANNOTATION = "ilyde.io/prepull-images"
+
+
+def normalize_image(image):
+    """Returns the fully qualified form of an image reference, the one nodes
+    report in their status: nginx -> docker.io/library/nginx:latest"""
+    name, digest = image, ""
+    if "@" in image:
+        name, digest = image.split("@", 1)
+        digest = "@" + digest
+
+    first, _, rest = name.partition("/")
+    if not rest or ("." not in first and ":" not in first and first != "localhost"):
+        # no registry
+        name = "docker.io/" + (name if rest else "library/" + name)
+
+    if not digest and ":" not in name.rsplit("/", 1)[-1]:
+        name += ":latest"
+    return name + digest
+
+
+def pod_spec_of(manifest):
+    """pod spec of a Pod, Deployment, Job or CronJob manifest"""
+    spec = (manifest or {}).get("spec") or {}
+    kind = (manifest or {}).get("kind")
+    if kind == "Pod":
+        return spec
+    if kind == "CronJob":
+        spec = ((spec.get("jobTemplate") or {}).get("spec")) or {}
+    return ((spec.get("template") or {}).get("spec")) or {}
+
+
+def images_of(manifest):
+    pod_spec = pod_spec_of(manifest)
+    containers = (pod_spec.get("initContainers") or []) + (pod_spec.get("containers") or [])
+    return {normalize_image(container["image"]) for container in containers if container.get("image")}
+
+
+class ImageTracker(object):
+    """Counts the images used by the spawned resources. Scores decay
+    so that the images used recently rank first, an image is forgotten,
+    with its spawn count, once its score decayed away."""
+
+    def __init__(self, decay=0.9):
+        self._decay = decay
+        self._lock = threading.Lock()
+        self._scores = {}
+        self._spawns = {}
+
+    def record(self, manifest):
+        images = images_of(manifest)
+        with self._lock:
+            for image in images:
+                self._scores[image] = self._scores.get(image, 0.0) + 1
+                self._spawns[image] = self._spawns.get(image, 0) + 1
+
+    def decay(self):
+        with self._lock:
+            self._scores = {image: score * self._decay for image, score in self._scores.items()
+                            if score * self._decay >= 0.01}
+            self._spawns = {image: spawns for image, spawns in self._spawns.items() if image in self._scores}
+
+    def top(self, k):
+        with self._lock:
+            ranked = sorted(self._scores.items(), key=lambda item: (-item[1], item[0]))
+        return [image for image, _ in ranked[:k]]
+
+    def spawns(self):
+        with self._lock:
+            return dict(self._spawns)
+
+
+class PrePuller(object):
+    """Maintains a DaemonSet with a container per top-K image, so that every
+    node has them cached before a workspace lands there. The containers run
+    a static busybox copied from helper_image, the images need no shell and
+    one that fails to pull does not hold back the others.
+    Coverage is computed from the images the nodes report in their status.
+    """
+
+    def __init__(self, tracker, namespace, name, top_k, helper_image, interval, enabled=True):
+        self._tracker = tracker
+        self._namespace = namespace
+        self._name = name
+        self._top_k = top_k
+        self._helper_image = helper_image
+        self._interval = interval
+        self._enabled = enabled
+        self._lock = threading.Lock()
+        self._images = []
+        self._coverage = {}
+        self._nodes = 0
+        self._stopped = threading.Event()
+        self.updates = REGISTRY.counter("prepull.updates")
+
+    def start(self):
+        # disabled, the nodes are never listed and no access to them is needed
+        if not self._enabled:
+            return
+        threading.Thread(target=self._run, name="image-prepuller", daemon=True).start()
+
+    def stop(self):
+        self._stopped.set()
+
+    def _run(self):
+        while True:
+            try:
+                self.reconcile()
+            except Exception as e:
+                logger.error("image pre-pull failed: %s", e)
+            if self._stopped.wait(self._interval):
+                return
+            self._tracker.decay()
+
+    def reconcile(self):
+        images = sorted(self._tracker.top(self._top_k))
+        if images and images != self._images:
+            self._apply(images)
+            self._images = images
+        self._refresh_coverage()
+
+    def daemon_set(self, images):
+        mount = {"name": "prepull", "mountPath": "/prepull"}
+        containers = [
+            {
+                "name": "image-{}".format(index),
+                "image": image,
+                # the container only needs to exist for the image to be pulled,
+                # busybox runs the applet named after the copy
+                "command": ["/prepull/sleep", "2147483647"],
+                "volumeMounts": [dict(mount, readOnly=True)],
+                "resources": {"requests": {"cpu": "1m", "memory": "8Mi"}},
+            }
+            for index, image in enumerate(images)
+        ]
+        labels = {"app": self._name}
+        return {
+            "apiVersion": "apps/v1",
+            "kind": "DaemonSet",
+            "metadata": {
+                "name": self._name,
+                "labels": labels,
+                "annotations": {IMAGES_ANNOTATION: ",".join(images)},
+            },
+            "spec": {
+                "selector": {"matchLabels": labels},
+                "updateStrategy": {"type": "RollingUpdate",
+                                   "rollingUpdate": {"maxUnavailable": "100%"}},
+                "template": {
+                    "metadata": {"labels": labels},
+                    "spec": {
+                        "initContainers": [{
+                            "name": "helper",
+                            "image": self._helper_image,
+                            "command": ["cp", "/bin/busybox", "/prepull/sleep"],
+                            "volumeMounts": [mount],
+                            "resources": {"requests": {"cpu": "1m", "memory": "8Mi"}},
+                        }],
+                        "containers": containers,
+                        "volumes": [{"name": "prepull", "emptyDir": {}}],
+                        "tolerations": [{"operator": "Exists"}],
+                        "terminationGracePeriodSeconds": 0,
+                    },
+                },
+            },
+        }
+
+    def _apply(self, images):
+        api_instance = client.AppsV1Api()
+        body = self.daemon_set(images)
+        try:
+            api_instance.replace_namespaced_daemon_set(name=self._name, namespace=self._namespace, body=body)
+        except ApiException as e:
+            if e.status != HTTP_NOT_FOUND:
+                raise
+            api_instance.create_namespaced_daemon_set(namespace=self._namespace, body=body)
+        self.updates.inc()
+        logger.info("image pre-pull set to %s", ", ".join(images))
+
+    def _refresh_coverage(self):
+        nodes = client.CoreV1Api().list_node().items
+        coverage = {}
+        for node in nodes:
+            cached = set()
+            for image in (node.status.images or []) if node.status else []:
+                cached.update(normalize_image(name) for name in image.names or [])
+            for image in cached:
+                coverage[image] = coverage.get(image, 0) + 1
+        with self._lock:
+            self._coverage = coverage
+            self._nodes = len(nodes)
+
+    def coverage(self):
+        """Returns [(image, spawns, prepulled, nodes, cached_nodes)] of the tracked images"""
+        with self._lock:
+            coverage, nodes, prepulled = self._coverage, self._nodes, set(self._images)
+        return [
+            (image, spawns, image in prepulled, nodes, coverage.get(image, 0))
+            for image, spawns in sorted(self._tracker.spawns().items(), key=lambda item: -item[1])
+        ]
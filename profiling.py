@@ -0,0 +1,177 @@
+# encoding: utf-8
+#
+# Copyright (c) 2020-2021 Hopenly srl.
+#
+# This file is part of Ilyde.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import collections
+import contextlib
+import marshal
+import os
+import re
+import sys
+import threading
+import time
+
+from metrics import REGISTRY
+
+FORMATS = ("collapsed", "pstats")
+
+# thread ident -> method of the call it is serving
+_methods = {}
+_running = threading.Lock()
+
+
+class ProfilerBusy(Exception):
+    """Raised when a profile is already being taken"""
+
+
+@contextlib.contextmanager
+def tagged(method_name):
+    """Tags the samples of the current thread with the method it serves"""
+    ident = threading.get_ident()
+    previous = _methods.get(ident)
+    _methods[ident] = method_name.rpartition("/")[2]
+    try:
+        yield
+    finally:
+        if previous is None:
+            _methods.pop(ident, None)
+        else:
+            _methods[ident] = previous
+
+
+def tagged_iterator(method_name, iterator):
+    """Tags the thread producing each response of a stream"""
+    try:
+        while True:
+            with tagged(method_name):
+                try:
+                    response = next(iterator)
+                except StopIteration:
+                    return
+            yield response
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            close()
+
+
+_prefixes = sorted({os.path.abspath(path) + os.sep for path in sys.path if path}, key=len, reverse=True)
+
+
+def frame_label(code):
+    """module path relative to sys.path and function name of a code object"""
+    filename = code.co_filename
+    for prefix in _prefixes:
+        if filename.startswith(prefix):
+            filename = filename[len(prefix):]
+            break
+    return "{}:{}".format(filename, code.co_name)
+
+
+class SamplingProfiler(object):
+    """Samples the stacks of the threads serving calls every interval
+    seconds. Stacks are counted by (method, code objects from the root),
+    so a sample costs a walk of the frames and a dict update.
+    """
+
+    def __init__(self, interval=0.01, all_threads=False):
+        self._interval = interval
+        self._all_threads = all_threads
+        # (tag, (code, ...)) -> samples
+        self.stacks = collections.Counter()
+        self.samples = 0
+        self.seconds = 0.0
+
+    def run(self, seconds):
+        """Samples for seconds on the calling thread
+
+        Raises:
+            ProfilerBusy: another profile is being taken
+        """
+        if not _running.acquire(blocking=False):
+            raise ProfilerBusy("a profile is already being taken")
+        REGISTRY.counter("profiler.runs").inc()
+        try:
+            own = threading.get_ident()
+            started = time.monotonic()
+            deadline = started + seconds
+            while time.monotonic() < deadline:
+                self._sample(own)
+                time.sleep(self._interval)
+            self.seconds = time.monotonic() - started
+        finally:
+            _running.release()
+        return self
+
+    def _sample(self, own):
+        names = {thread.ident: thread.name for thread in threading.enumerate()} if self._all_threads else None
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            tag = _methods.get(ident)
+            if tag is None:
+                if not self._all_threads:
+                    continue
+                # pool threads differ by their number only
+                tag = "({})".format(re.sub(r"[_-]?\d+$", "", names.get(ident, "thread")))
+            stack = []
+            while frame is not None:
+                stack.append(frame.f_code)
+                frame = frame.f_back
+            stack.reverse()
+            self.stacks[(tag, tuple(stack))] += 1
+            self.samples += 1
+
+    def samples_by_method(self):
+        counts = collections.Counter()
+        for (tag, _), count in self.stacks.items():
+            counts[tag] += count
+        return dict(counts)
+
+    def collapsed(self):
+        """one "method;frame;...;frame samples" line per stack, for flame graph tools"""
+        lines = collections.Counter()
+        for (tag, stack), count in self.stacks.items():
+            lines[";".join([tag] + [frame_label(code) for code in stack])] += count
+        return "".join("{} {}\n".format(line, count) for line, count in sorted(lines.items())).encode()
+
+    def pstats(self):
+        """marshaled stats loadable with pstats.Stats, in sampled seconds.
+        Each method is a function "<rpc>:method" calling the root frames.
+        """
+        # function -> [samples on the stack, samples on top]
+        totals = collections.defaultdict(lambda: [0, 0])
+        callers = collections.defaultdict(collections.Counter)
+        for (tag, stack), count in self.stacks.items():
+            functions = [("<rpc>", 0, tag)] + [(code.co_filename, code.co_firstlineno, code.co_name)
+                                               for code in stack]
+            for function in set(functions):
+                totals[function][0] += count
+            totals[functions[-1]][1] += count
+            for caller, callee in set(zip(functions, functions[1:])):
+                callers[callee][caller] += count
+
+        stats = {}
+        for function, (inclusive, own) in totals.items():
+            stats[function] = (inclusive, inclusive, own * self._interval, inclusive * self._interval,
+                               dict(callers[function]))
+        return marshal.dumps(stats)
+
+    def render(self, fmt):
+        if fmt == "pstats":
+            return self.pstats()
+        return self.collapsed()
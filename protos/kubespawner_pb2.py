@@ -30,7 +30,9 @@ from google.protobuf import symbol_database as _symbol_database
 _sym_db = _symbol_database.Default()
 
 
+from google.protobuf import empty_pb2 as google_dot_protobuf_dot_empty__pb2
 from google.protobuf import struct_pb2 as google_dot_protobuf_dot_struct__pb2
+from google.protobuf import timestamp_pb2 as google_dot_protobuf_dot_timestamp__pb2
 
 
 DESCRIPTOR = _descriptor.FileDescriptor(
@@ -39,9 +41,9 @@ DESCRIPTOR = _descriptor.FileDescriptor(
   syntax='proto3',
   serialized_options=b'\n\026org.hopenly.ilyde.grpcB\020KubeSpawnerProtoP\001\242\002\003KSS',
   create_key=_descriptor._internal_create_key,
-  serialized_pb=b'\n\x11kubespawner.proto\x12\x0bkubespawner\x1a\x1cgoogle/protobuf/struct.proto\"*\n\x04\x46ile\x12\x11\n\tnamespace\x18\x01 \x01(\t\x12\x0f\n\x07\x63ontent\x18\x02 \x01(\t\"Z\n\x07Service\x12\x11\n\tnamespace\x18\x01 \x01(\t\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\x10\n\x08selector\x18\x03 \x01(\t\x12\x0c\n\x04port\x18\x04 \x01(\t\x12\x0e\n\x06target\x18\x05 \x01(\t\"9\n\x08Resource\x12\x11\n\tnamespace\x18\x01 \x01(\t\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\x0c\n\x04type\x18\x03 \x01(\t\")\n\x06Status\x12\x0e\n\x06status\x18\x01 \x01(\r\x12\x0f\n\x07message\x18\x02 \x01(\t*`\n\x0cResourceType\x12\x0e\n\nDEPLOYMENT\x10\x00\x12\x0b\n\x07INGRESS\x10\x01\x12\x0b\n\x07SERVICE\x10\x02\x12\x07\n\x03POD\x10\x03\x12\x07\n\x03JOB\x10\x04\x12\x0b\n\x07\x43RONJOB\x10\x05\x12\x07\n\x03PVC\x10\x06\x32\x9c\x07\n\x13KubeSpawnerServices\x12\x44\n\x18\x43reateDeploymentFromFile\x12\x11.kubespawner.File\x1a\x13.kubespawner.Status\"\x00\x12\x41\n\x15\x43reateIngressFromFile\x12\x11.kubespawner.File\x1a\x13.kubespawner.Status\"\x00\x12\x41\n\x15\x43reateServiceFromFile\x12\x11.kubespawner.File\x1a\x13.kubespawner.Status\"\x00\x12\x41\n\x15\x43reateCronJobFromFile\x12\x11.kubespawner.File\x1a\x13.kubespawner.Status\"\x00\x12=\n\x11\x43reateJobFromFile\x12\x11.kubespawner.File\x1a\x13.kubespawner.Status\"\x00\x12<\n\rCreateService\x12\x14.kubespawner.Service\x1a\x13.kubespawner.Status\"\x00\x12@\n\x10\x44\x65leteDeployment\x12\x15.kubespawner.Resource\x1a\x13.kubespawner.Status\"\x00\x12=\n\rDeleteService\x12\x15.kubespawner.Resource\x1a\x13.kubespawner.Status\"\x00\x12=\n\rDeleteIngress\x12\x15.kubespawner.Resource\x1a\x13.kubespawner.Status\"\x00\x12=\n\x11\x43reatePVCFromFile\x12\x11.kubespawner.File\x1a\x13.kubespawner.Status\"\x00\x12\x45\n\x11GetResourceStatus\x12\x15.kubespawner.Resource\x1a\x17.google.protobuf.Struct\"\x00\x12\x39\n\tDeleteJob\x12\x15.kubespawner.Resource\x1a\x13.kubespawner.Status\"\x00\x12=\n\rDeleteCronJob\x12\x15.kubespawner.Resource\x1a\x13.kubespawner.Status\"\x00\x12\x39\n\tDeletePVC\x12\x15.kubespawner.Resource\x1a\x13.kubespawner.Status\"\x00\x42\x32\n\x16org.hopenly.ilyde.grpcB\x10KubeSpawnerProtoP\x01\xa2\x02\x03KSSb\x06proto3'
+  serialized_pb=b'\n\x11kubespawner.proto\x12\x0bkubespawner\x1a\x1bgoogle/protobuf/empty.proto\x1a\x1cgoogle/protobuf/struct.proto\x1a\x1fgoogle/protobuf/timestamp.proto\"*\n\x04\x46ile\x12\x11\n\tnamespace\x18\x01 \x01(\t\x12\x0f\n\x07\x63ontent\x18\x02 \x01(\t\"Z\n\x07Service\x12\x11\n\tnamespace\x18\x01 \x01(\t\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\x10\n\x08selector\x18\x03 \x01(\t\x12\x0c\n\x04port\x18\x04 \x01(\t\x12\x0e\n\x06target\x18\x05 \x01(\t\"9\n\x08Resource\x12\x11\n\tnamespace\x18\x01 \x01(\t\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\x0c\n\x04type\x18\x03 \x01(\t\")\n\x06Status\x12\x0e\n\x06status\x18\x01 \x01(\r\x12\x0f\n\x07message\x18\x02 \x01(\t\"\x96\x01\n\rPodLogRequest\x12\x11\n\tnamespace\x18\x01 \x01(\t\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\x11\n\tcontainer\x18\x03 \x01(\t\x12\x12\n\ntail_lines\x18\x04 \x01(\x03\x12\x15\n\rsince_seconds\x18\x05 \x01(\x03\x12\x12\n\nsince_time\x18\x06 \x01(\t\x12\x12\n\ntimestamps\x18\x07 \x01(\x08\"\x18\n\x08LogChunk\x12\x0c\n\x04\x64\x61ta\x18\x01 \x01(\x0c\"\x88\x01\n\x05\x45vent\x12\x0c\n\x04type\x18\x01 \x01(\t\x12\x0e\n\x06reason\x18\x02 \x01(\t\x12\x0f\n\x07message\x18\x03 \x01(\t\x12\x0c\n\x04kind\x18\x04 \x01(\t\x12\x0c\n\x04name\x18\x05 \x01(\t\x12\r\n\x05\x63ount\x18\x06 \x01(\r\x12\x12\n\nfirst_time\x18\x07 \x01(\t\x12\x11\n\tlast_time\x18\x08 \x01(\t\"/\n\tEventList\x12\"\n\x06\x65vents\x18\x01 \x03(\x0b\x32\x12.kubespawner.Event\"a\n\tWorkspace\x12\x11\n\tnamespace\x18\x01 \x01(\t\x12\x12\n\ndeployment\x18\x02 \x01(\t\x12\x0f\n\x07service\x18\x03 \x01(\t\x12\x0f\n\x07ingress\x18\x04 \x01(\t\x12\x0b\n\x03pvc\x18\x05 \x01(\t\":\n\nStepTiming\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x0f\n\x07seconds\x18\x02 \x01(\x01\x12\r\n\x05\x65rror\x18\x03 \x01(\t\"g\n\x0bSpawnResult\x12\x0e\n\x06status\x18\x01 \x01(\r\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x0f\n\x07seconds\x18\x03 \x01(\x01\x12&\n\x05steps\x18\x04 \x03(\x0b\x32\x17.kubespawner.StepTiming\"x\n\x08WarmPool\x12\x11\n\tnamespace\x18\x01 \x01(\t\x12\x0f\n\x07profile\x18\x02 \x01(\t\x12\x12\n\ndeployment\x18\x03 \x01(\t\x12\x0c\n\x04size\x18\x04 \x01(\r\x12\x10\n\x08min_size\x18\x05 \x01(\r\x12\x14\n\x0cidle_timeout\x18\x06 \x01(\r\"d\n\tWarmClaim\x12\x11\n\tnamespace\x18\x01 \x01(\t\x12\x0f\n\x07profile\x18\x02 \x01(\t\x12\x11\n\tworkspace\x18\x03 \x01(\t\x12\x0f\n\x07service\x18\x04 \x01(\t\x12\x0f\n\x07ingress\x18\x05 \x01(\t\"\x8c\x01\n\x0fWarmClaimResult\x12\x0e\n\x06status\x18\x01 \x01(\r\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x12\n\ndeployment\x18\x03 \x01(\t\x12\x0b\n\x03hit\x18\x04 \x01(\x08\x12\x0f\n\x07seconds\x18\x05 \x01(\x01\x12&\n\x05steps\x18\x06 \x03(\x0b\x32\x17.kubespawner.StepTiming\"f\n\rImageCoverage\x12\r\n\x05image\x18\x01 \x01(\t\x12\x0e\n\x06spawns\x18\x02 \x01(\r\x12\x11\n\tprepulled\x18\x03 \x01(\x08\x12\r\n\x05nodes\x18\x04 \x01(\r\x12\x14\n\x0c\x63\x61\x63hed_nodes\x18\x05 \x01(\r\"?\n\x11ImageCoverageList\x12*\n\x06images\x18\x01 \x03(\x0b\x32\x1a.kubespawner.ImageCoverage\"e\n\x07PVCPool\x12\x11\n\tnamespace\x18\x01 \x01(\t\x12\x15\n\rstorage_class\x18\x02 \x01(\t\x12\x0c\n\x04size\x18\x03 \x01(\t\x12\r\n\x05\x63ount\x18\x04 \x01(\r\x12\x13\n\x0b\x61\x63\x63\x65ss_mode\x18\x05 \x01(\t\"U\n\x08PVCClaim\x12\x11\n\tnamespace\x18\x01 \x01(\t\x12\x15\n\rstorage_class\x18\x02 \x01(\t\x12\x0c\n\x04size\x18\x03 \x01(\t\x12\x11\n\tworkspace\x18\x04 \x01(\t\"]\n\x0ePVCClaimResult\x12\x0e\n\x06status\x18\x01 \x01(\r\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x0c\n\x04name\x18\x03 \x01(\t\x12\x0b\n\x03hit\x18\x04 \x01(\x08\x12\x0f\n\x07seconds\x18\x05 \x01(\x01\" \n\x0bStatusWatch\x12\x11\n\tnamespace\x18\x01 \x01(\t\"W\n\x0bUsageSample\x12\x11\n\ttimestamp\x18\x01 \x01(\t\x12\x11\n\tcpu_cores\x18\x02 \x01(\x01\x12\x14\n\x0cmemory_bytes\x18\x03 \x01(\x03\x12\x0c\n\x04pods\x18\x04 \x01(\r\"i\n\rResourceUsage\x12\x11\n\tnamespace\x18\x01 \x01(\t\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\x0c\n\x04type\x18\x03 \x01(\t\x12)\n\x07samples\x18\x04 \x03(\x0b\x32\x18.kubespawner.UsageSample\">\n\tScaleItem\x12\x11\n\tnamespace\x18\x01 \x01(\t\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\x10\n\x08replicas\x18\x03 \x01(\r\"5\n\x0cScaleRequest\x12%\n\x05items\x18\x01 \x03(\x0b\x32\x16.kubespawner.ScaleItem\"a\n\x0bScaleResult\x12\x11\n\tnamespace\x18\x01 \x01(\t\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\x0e\n\x06status\x18\x03 \x01(\r\x12\x0f\n\x07message\x18\x04 \x01(\t\x12\x10\n\x08replicas\x18\x05 \x01(\r\"[\n\rScaleResponse\x12)\n\x07results\x18\x01 \x03(\x0b\x32\x18.kubespawner.ScaleResult\x12\x0e\n\x06\x66\x61iled\x18\x02 \x01(\r\x12\x0f\n\x07seconds\x18\x03 \x01(\x01\"[\n\x05Patch\x12\x11\n\tnamespace\x18\x01 \x01(\t\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\x0c\n\x04type\x18\x03 \x01(\t\x12\x12\n\npatch_type\x18\x04 \x01(\t\x12\x0f\n\x07\x63ontent\x18\x05 \x01(\t\"X\n\x10\x44\x65ploymentUpdate\x12\x11\n\tnamespace\x18\x01 \x01(\t\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\x12\n\npatch_type\x18\x03 \x01(\t\x12\x0f\n\x07\x63ontent\x18\x04 \x01(\t\"\xc8\x01\n\x0fRolloutProgress\x12\r\n\x05state\x18\x01 \x01(\t\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x12\n\ngeneration\x18\x03 \x01(\x03\x12\x1b\n\x13observed_generation\x18\x04 \x01(\x03\x12\x10\n\x08replicas\x18\x05 \x01(\r\x12\x18\n\x10updated_replicas\x18\x06 \x01(\r\x12\x1a\n\x12\x61vailable_replicas\x18\x07 \x01(\r\x12\x1c\n\x14unavailable_replicas\x18\x08 \x01(\r\"\xae\x01\n\x10\x44\x65ploymentStatus\x12\x10\n\x08replicas\x18\x01 \x01(\x05\x12\x1a\n\x12\x61vailable_replicas\x18\x02 \x01(\x05\x12\x1c\n\x14unavailable_replicas\x18\x03 \x01(\x05\x12\x18\n\x10updated_replicas\x18\x04 \x01(\x05\x12\x17\n\x0f\x63ollision_count\x18\x05 \x01(\x05\x12\x1b\n\x13observed_generation\x18\x06 \x01(\x03\"\xa3\x01\n\tJobStatus\x12\x0e\n\x06\x61\x63tive\x18\x01 \x01(\x05\x12\x11\n\tsucceeded\x18\x02 \x01(\x05\x12\x0e\n\x06\x66\x61iled\x18\x03 \x01(\x05\x12.\n\nstart_time\x18\x04 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\x33\n\x0f\x63ompletion_time\x18\x05 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\"W\n\rCronJobStatus\x12\x0e\n\x06\x61\x63tive\x18\x01 \x01(\x05\x12\x36\n\x12last_schedule_time\x18\x02 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\"\xb6\x01\n\x0eResourceStatus\x12\x33\n\ndeployment\x18\x01 \x01(\x0b\x32\x1d.kubespawner.DeploymentStatusH\x00\x12%\n\x03job\x18\x02 \x01(\x0b\x32\x16.kubespawner.JobStatusH\x00\x12-\n\x07\x63ronjob\x18\x03 \x01(\x0b\x32\x1a.kubespawner.CronJobStatusH\x00\x12\x0f\n\x05\x65rror\x18\x04 \x01(\tH\x00\x42\x08\n\x06status\"F\n\x0eProfileRequest\x12\x0f\n\x07seconds\x18\x01 \x01(\x05\x12\x0e\n\x06\x66ormat\x18\x02 \x01(\t\x12\x13\n\x0b\x61ll_threads\x18\x03 \x01(\x08\"\xd3\x01\n\rProfileResult\x12\x0e\n\x06\x66ormat\x18\x01 \x01(\t\x12\x0c\n\x04\x64\x61ta\x18\x02 \x01(\x0c\x12\x0f\n\x07samples\x18\x03 \x01(\x05\x12\x0f\n\x07seconds\x18\x04 \x01(\x01\x12J\n\x11samples_by_method\x18\x05 \x03(\x0b\x32/.kubespawner.ProfileResult.SamplesByMethodEntry\x1a\x36\n\x14SamplesByMethodEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x05:\x02\x38\x01\"\x7f\n\x08JobArray\x12\x11\n\tnamespace\x18\x01 \x01(\t\x12\x10\n\x08template\x18\x02 \x01(\t\x12+\n\nparameters\x18\x03 \x03(\x0b\x32\x17.google.protobuf.Struct\x12\x0c\n\x04mode\x18\x04 \x01(\t\x12\x13\n\x0bparallelism\x18\x05 \x01(\r\"L\n\x0cJobArrayItem\x12\r\n\x05index\x18\x01 \x01(\r\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\x0e\n\x06status\x18\x03 \x01(\r\x12\x0f\n\x07message\x18\x04 \x01(\t\"[\n\x0eJobArrayResult\x12(\n\x05items\x18\x01 \x03(\x0b\x32\x19.kubespawner.JobArrayItem\x12\x0e\n\x06\x66\x61iled\x18\x02 \x01(\r\x12\x0f\n\x07seconds\x18\x03 \x01(\x01*`\n\x0cResourceType\x12\x0e\n\nDEPLOYMENT\x10\x00\x12\x0b\n\x07INGRESS\x10\x01\x12\x0b\n\x07SERVICE\x10\x02\x12\x07\n\x03POD\x10\x03\x12\x07\n\x03JOB\x10\x04\x12\x0b\n\x07\x43RONJOB\x10\x05\x12\x07\n\x03PVC\x10\x06\x32\xe7\x10\n\x13KubeSpawnerServices\x12\x44\n\x18\x43reateDeploymentFromFile\x12\x11.kubespawner.File\x1a\x13.kubespawner.Status\"\x00\x12\x41\n\x15\x43reateIngressFromFile\x12\x11.kubespawner.File\x1a\x13.kubespawner.Status\"\x00\x12\x41\n\x15\x43reateServiceFromFile\x12\x11.kubespawner.File\x1a\x13.kubespawner.Status\"\x00\x12\x41\n\x15\x43reateCronJobFromFile\x12\x11.kubespawner.File\x1a\x13.kubespawner.Status\"\x00\x12=\n\x11\x43reateJobFromFile\x12\x11.kubespawner.File\x1a\x13.kubespawner.Status\"\x00\x12<\n\rCreateService\x12\x14.kubespawner.Service\x1a\x13.kubespawner.Status\"\x00\x12@\n\x10\x44\x65leteDeployment\x12\x15.kubespawner.Resource\x1a\x13.kubespawner.Status\"\x00\x12=\n\rDeleteService\x12\x15.kubespawner.Resource\x1a\x13.kubespawner.Status\"\x00\x12=\n\rDeleteIngress\x12\x15.kubespawner.Resource\x1a\x13.kubespawner.Status\"\x00\x12=\n\x11\x43reatePVCFromFile\x12\x11.kubespawner.File\x1a\x13.kubespawner.Status\"\x00\x12\x45\n\x11GetResourceStatus\x12\x15.kubespawner.Resource\x1a\x17.google.protobuf.Struct\"\x00\x12\x39\n\tDeleteJob\x12\x15.kubespawner.Resource\x1a\x13.kubespawner.Status\"\x00\x12=\n\rDeleteCronJob\x12\x15.kubespawner.Resource\x1a\x13.kubespawner.Status\"\x00\x12\x39\n\tDeletePVC\x12\x15.kubespawner.Resource\x1a\x13.kubespawner.Status\"\x00\x12\x46\n\rStreamPodLogs\x12\x1a.kubespawner.PodLogRequest\x1a\x15.kubespawner.LogChunk\"\x00\x30\x01\x12\x44\n\x11GetResourceEvents\x12\x15.kubespawner.Resource\x1a\x16.kubespawner.EventList\"\x00\x12@\n\x0cWaitForReady\x12\x15.kubespawner.Resource\x1a\x17.google.protobuf.Struct\"\x00\x12\x45\n\x11WaitForCompletion\x12\x15.kubespawner.Resource\x1a\x17.google.protobuf.Struct\"\x00\x12\x44\n\x0eSpawnWorkspace\x12\x16.kubespawner.Workspace\x1a\x18.kubespawner.SpawnResult\"\x00\x12@\n\x10RegisterWarmPool\x12\x15.kubespawner.WarmPool\x1a\x13.kubespawner.Status\"\x00\x12L\n\x12\x43laimWarmWorkspace\x12\x16.kubespawner.WarmClaim\x1a\x1c.kubespawner.WarmClaimResult\"\x00\x12P\n\x14GetImagePullCoverage\x12\x16.google.protobuf.Empty\x1a\x1e.kubespawner.ImageCoverageList\"\x00\x12>\n\x0fRegisterPVCPool\x12\x14.kubespawner.PVCPool\x1a\x13.kubespawner.Status\"\x00\x12@\n\x08\x43laimPVC\x12\x15.kubespawner.PVCClaim\x1a\x1b.kubespawner.PVCClaimResult\"\x00\x12I\n\x12WatchStatusChanges\x12\x18.kubespawner.StatusWatch\x1a\x15.kubespawner.Resource\"\x00\x30\x01\x12G\n\x10GetResourceUsage\x12\x15.kubespawner.Resource\x1a\x1a.kubespawner.ResourceUsage\"\x00\x12K\n\x10ScaleDeployments\x12\x19.kubespawner.ScaleRequest\x1a\x1a.kubespawner.ScaleResponse\"\x00\x12:\n\rPatchResource\x12\x12.kubespawner.Patch\x1a\x13.kubespawner.Status\"\x00\x12S\n\x10UpdateDeployment\x12\x1d.kubespawner.DeploymentUpdate\x1a\x1c.kubespawner.RolloutProgress\"\x00\x30\x01\x12N\n\x16GetTypedResourceStatus\x12\x15.kubespawner.Resource\x1a\x1b.kubespawner.ResourceStatus\"\x00\x12\x46\n\x0eSubmitJobArray\x12\x15.kubespawner.JobArray\x1a\x1b.kubespawner.JobArrayResult\"\x00\x32\x96\x01\n\x10KubeSpawnerAdmin\x12\x44\n\x07Profile\x12\x1b.kubespawner.ProfileRequest\x1a\x1a.kubespawner.ProfileResult\"\x00\x12<\n\x07Inspect\x12\x16.google.protobuf.Empty\x1a\x17.google.protobuf.Struct\"\x00\x42\x32\n\x16org.hopenly.ilyde.grpcB\x10KubeSpawnerProtoP\x01\xa2\x02\x03KSSb\x06proto3'
   ,
-  dependencies=[google_dot_protobuf_dot_struct__pb2.DESCRIPTOR,])
+  dependencies=[google_dot_protobuf_dot_empty__pb2.DESCRIPTOR,google_dot_protobuf_dot_struct__pb2.DESCRIPTOR,google_dot_protobuf_dot_timestamp__pb2.DESCRIPTOR,])
 
 _RESOURCETYPE = _descriptor.EnumDescriptor(
   name='ResourceType',
@@ -88,8 +90,8 @@ _RESOURCETYPE = _descriptor.EnumDescriptor(
   ],
   containing_type=None,
   serialized_options=None,
-  serialized_start=302,
-  serialized_end=398,
+  serialized_start=3946,
+  serialized_end=4042,
 )
 _sym_db.RegisterEnumDescriptor(_RESOURCETYPE)
 
@@ -138,8 +140,8 @@ _FILE = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=64,
-  serialized_end=106,
+  serialized_start=126,
+  serialized_end=168,
 )
 
 
@@ -198,8 +200,8 @@ _SERVICE = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=108,
-  serialized_end=198,
+  serialized_start=170,
+  serialized_end=260,
 )
 
 
@@ -244,8 +246,8 @@ _RESOURCE = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=200,
-  serialized_end=257,
+  serialized_start=262,
+  serialized_end=319,
 )
 
 
@@ -283,14 +285,1957 @@ _STATUS = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=259,
-  serialized_end=300,
+  serialized_start=321,
+  serialized_end=362,
 )
 
+
+_PODLOGREQUEST = _descriptor.Descriptor(
+  name='PodLogRequest',
+  full_name='kubespawner.PodLogRequest',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='namespace', full_name='kubespawner.PodLogRequest.namespace', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='name', full_name='kubespawner.PodLogRequest.name', index=1,
+      number=2, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='container', full_name='kubespawner.PodLogRequest.container', index=2,
+      number=3, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='tail_lines', full_name='kubespawner.PodLogRequest.tail_lines', index=3,
+      number=4, type=3, cpp_type=2, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='since_seconds', full_name='kubespawner.PodLogRequest.since_seconds', index=4,
+      number=5, type=3, cpp_type=2, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='since_time', full_name='kubespawner.PodLogRequest.since_time', index=5,
+      number=6, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='timestamps', full_name='kubespawner.PodLogRequest.timestamps', index=6,
+      number=7, type=8, cpp_type=7, label=1,
+      has_default_value=False, default_value=False,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=365,
+  serialized_end=515,
+)
+
+
+_LOGCHUNK = _descriptor.Descriptor(
+  name='LogChunk',
+  full_name='kubespawner.LogChunk',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='data', full_name='kubespawner.LogChunk.data', index=0,
+      number=1, type=12, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"",
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=517,
+  serialized_end=541,
+)
+
+
+_EVENT = _descriptor.Descriptor(
+  name='Event',
+  full_name='kubespawner.Event',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='type', full_name='kubespawner.Event.type', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='reason', full_name='kubespawner.Event.reason', index=1,
+      number=2, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='message', full_name='kubespawner.Event.message', index=2,
+      number=3, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='kind', full_name='kubespawner.Event.kind', index=3,
+      number=4, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='name', full_name='kubespawner.Event.name', index=4,
+      number=5, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='count', full_name='kubespawner.Event.count', index=5,
+      number=6, type=13, cpp_type=3, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='first_time', full_name='kubespawner.Event.first_time', index=6,
+      number=7, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='last_time', full_name='kubespawner.Event.last_time', index=7,
+      number=8, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=544,
+  serialized_end=680,
+)
+
+
+_EVENTLIST = _descriptor.Descriptor(
+  name='EventList',
+  full_name='kubespawner.EventList',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='events', full_name='kubespawner.EventList.events', index=0,
+      number=1, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=682,
+  serialized_end=729,
+)
+
+
+_WORKSPACE = _descriptor.Descriptor(
+  name='Workspace',
+  full_name='kubespawner.Workspace',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='namespace', full_name='kubespawner.Workspace.namespace', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='deployment', full_name='kubespawner.Workspace.deployment', index=1,
+      number=2, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='service', full_name='kubespawner.Workspace.service', index=2,
+      number=3, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='ingress', full_name='kubespawner.Workspace.ingress', index=3,
+      number=4, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='pvc', full_name='kubespawner.Workspace.pvc', index=4,
+      number=5, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=731,
+  serialized_end=828,
+)
+
+
+_STEPTIMING = _descriptor.Descriptor(
+  name='StepTiming',
+  full_name='kubespawner.StepTiming',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='name', full_name='kubespawner.StepTiming.name', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='seconds', full_name='kubespawner.StepTiming.seconds', index=1,
+      number=2, type=1, cpp_type=5, label=1,
+      has_default_value=False, default_value=float(0),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='error', full_name='kubespawner.StepTiming.error', index=2,
+      number=3, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=830,
+  serialized_end=888,
+)
+
+
+_SPAWNRESULT = _descriptor.Descriptor(
+  name='SpawnResult',
+  full_name='kubespawner.SpawnResult',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='status', full_name='kubespawner.SpawnResult.status', index=0,
+      number=1, type=13, cpp_type=3, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='message', full_name='kubespawner.SpawnResult.message', index=1,
+      number=2, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='seconds', full_name='kubespawner.SpawnResult.seconds', index=2,
+      number=3, type=1, cpp_type=5, label=1,
+      has_default_value=False, default_value=float(0),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='steps', full_name='kubespawner.SpawnResult.steps', index=3,
+      number=4, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=890,
+  serialized_end=993,
+)
+
+
+_WARMPOOL = _descriptor.Descriptor(
+  name='WarmPool',
+  full_name='kubespawner.WarmPool',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='namespace', full_name='kubespawner.WarmPool.namespace', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='profile', full_name='kubespawner.WarmPool.profile', index=1,
+      number=2, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='deployment', full_name='kubespawner.WarmPool.deployment', index=2,
+      number=3, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='size', full_name='kubespawner.WarmPool.size', index=3,
+      number=4, type=13, cpp_type=3, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='min_size', full_name='kubespawner.WarmPool.min_size', index=4,
+      number=5, type=13, cpp_type=3, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='idle_timeout', full_name='kubespawner.WarmPool.idle_timeout', index=5,
+      number=6, type=13, cpp_type=3, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=995,
+  serialized_end=1115,
+)
+
+
+_WARMCLAIM = _descriptor.Descriptor(
+  name='WarmClaim',
+  full_name='kubespawner.WarmClaim',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='namespace', full_name='kubespawner.WarmClaim.namespace', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='profile', full_name='kubespawner.WarmClaim.profile', index=1,
+      number=2, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='workspace', full_name='kubespawner.WarmClaim.workspace', index=2,
+      number=3, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='service', full_name='kubespawner.WarmClaim.service', index=3,
+      number=4, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='ingress', full_name='kubespawner.WarmClaim.ingress', index=4,
+      number=5, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=1117,
+  serialized_end=1217,
+)
+
+
+_WARMCLAIMRESULT = _descriptor.Descriptor(
+  name='WarmClaimResult',
+  full_name='kubespawner.WarmClaimResult',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='status', full_name='kubespawner.WarmClaimResult.status', index=0,
+      number=1, type=13, cpp_type=3, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='message', full_name='kubespawner.WarmClaimResult.message', index=1,
+      number=2, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='deployment', full_name='kubespawner.WarmClaimResult.deployment', index=2,
+      number=3, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='hit', full_name='kubespawner.WarmClaimResult.hit', index=3,
+      number=4, type=8, cpp_type=7, label=1,
+      has_default_value=False, default_value=False,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='seconds', full_name='kubespawner.WarmClaimResult.seconds', index=4,
+      number=5, type=1, cpp_type=5, label=1,
+      has_default_value=False, default_value=float(0),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='steps', full_name='kubespawner.WarmClaimResult.steps', index=5,
+      number=6, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=1220,
+  serialized_end=1360,
+)
+
+
+_IMAGECOVERAGE = _descriptor.Descriptor(
+  name='ImageCoverage',
+  full_name='kubespawner.ImageCoverage',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='image', full_name='kubespawner.ImageCoverage.image', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='spawns', full_name='kubespawner.ImageCoverage.spawns', index=1,
+      number=2, type=13, cpp_type=3, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='prepulled', full_name='kubespawner.ImageCoverage.prepulled', index=2,
+      number=3, type=8, cpp_type=7, label=1,
+      has_default_value=False, default_value=False,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='nodes', full_name='kubespawner.ImageCoverage.nodes', index=3,
+      number=4, type=13, cpp_type=3, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='cached_nodes', full_name='kubespawner.ImageCoverage.cached_nodes', index=4,
+      number=5, type=13, cpp_type=3, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=1362,
+  serialized_end=1464,
+)
+
+
+_IMAGECOVERAGELIST = _descriptor.Descriptor(
+  name='ImageCoverageList',
+  full_name='kubespawner.ImageCoverageList',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='images', full_name='kubespawner.ImageCoverageList.images', index=0,
+      number=1, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=1466,
+  serialized_end=1529,
+)
+
+
+_PVCPOOL = _descriptor.Descriptor(
+  name='PVCPool',
+  full_name='kubespawner.PVCPool',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='namespace', full_name='kubespawner.PVCPool.namespace', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='storage_class', full_name='kubespawner.PVCPool.storage_class', index=1,
+      number=2, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='size', full_name='kubespawner.PVCPool.size', index=2,
+      number=3, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='count', full_name='kubespawner.PVCPool.count', index=3,
+      number=4, type=13, cpp_type=3, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='access_mode', full_name='kubespawner.PVCPool.access_mode', index=4,
+      number=5, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=1531,
+  serialized_end=1632,
+)
+
+
+_PVCCLAIM = _descriptor.Descriptor(
+  name='PVCClaim',
+  full_name='kubespawner.PVCClaim',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='namespace', full_name='kubespawner.PVCClaim.namespace', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='storage_class', full_name='kubespawner.PVCClaim.storage_class', index=1,
+      number=2, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='size', full_name='kubespawner.PVCClaim.size', index=2,
+      number=3, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='workspace', full_name='kubespawner.PVCClaim.workspace', index=3,
+      number=4, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=1634,
+  serialized_end=1719,
+)
+
+
+_PVCCLAIMRESULT = _descriptor.Descriptor(
+  name='PVCClaimResult',
+  full_name='kubespawner.PVCClaimResult',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='status', full_name='kubespawner.PVCClaimResult.status', index=0,
+      number=1, type=13, cpp_type=3, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='message', full_name='kubespawner.PVCClaimResult.message', index=1,
+      number=2, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='name', full_name='kubespawner.PVCClaimResult.name', index=2,
+      number=3, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='hit', full_name='kubespawner.PVCClaimResult.hit', index=3,
+      number=4, type=8, cpp_type=7, label=1,
+      has_default_value=False, default_value=False,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='seconds', full_name='kubespawner.PVCClaimResult.seconds', index=4,
+      number=5, type=1, cpp_type=5, label=1,
+      has_default_value=False, default_value=float(0),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=1721,
+  serialized_end=1814,
+)
+
+
+_STATUSWATCH = _descriptor.Descriptor(
+  name='StatusWatch',
+  full_name='kubespawner.StatusWatch',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='namespace', full_name='kubespawner.StatusWatch.namespace', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=1816,
+  serialized_end=1848,
+)
+
+
+_USAGESAMPLE = _descriptor.Descriptor(
+  name='UsageSample',
+  full_name='kubespawner.UsageSample',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='timestamp', full_name='kubespawner.UsageSample.timestamp', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='cpu_cores', full_name='kubespawner.UsageSample.cpu_cores', index=1,
+      number=2, type=1, cpp_type=5, label=1,
+      has_default_value=False, default_value=float(0),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='memory_bytes', full_name='kubespawner.UsageSample.memory_bytes', index=2,
+      number=3, type=3, cpp_type=2, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='pods', full_name='kubespawner.UsageSample.pods', index=3,
+      number=4, type=13, cpp_type=3, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=1850,
+  serialized_end=1937,
+)
+
+
+_RESOURCEUSAGE = _descriptor.Descriptor(
+  name='ResourceUsage',
+  full_name='kubespawner.ResourceUsage',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='namespace', full_name='kubespawner.ResourceUsage.namespace', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='name', full_name='kubespawner.ResourceUsage.name', index=1,
+      number=2, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='type', full_name='kubespawner.ResourceUsage.type', index=2,
+      number=3, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='samples', full_name='kubespawner.ResourceUsage.samples', index=3,
+      number=4, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=1939,
+  serialized_end=2044,
+)
+
+
+_SCALEITEM = _descriptor.Descriptor(
+  name='ScaleItem',
+  full_name='kubespawner.ScaleItem',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='namespace', full_name='kubespawner.ScaleItem.namespace', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='name', full_name='kubespawner.ScaleItem.name', index=1,
+      number=2, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='replicas', full_name='kubespawner.ScaleItem.replicas', index=2,
+      number=3, type=13, cpp_type=3, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=2046,
+  serialized_end=2108,
+)
+
+
+_SCALEREQUEST = _descriptor.Descriptor(
+  name='ScaleRequest',
+  full_name='kubespawner.ScaleRequest',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='items', full_name='kubespawner.ScaleRequest.items', index=0,
+      number=1, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=2110,
+  serialized_end=2163,
+)
+
+
+_SCALERESULT = _descriptor.Descriptor(
+  name='ScaleResult',
+  full_name='kubespawner.ScaleResult',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='namespace', full_name='kubespawner.ScaleResult.namespace', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='name', full_name='kubespawner.ScaleResult.name', index=1,
+      number=2, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='status', full_name='kubespawner.ScaleResult.status', index=2,
+      number=3, type=13, cpp_type=3, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='message', full_name='kubespawner.ScaleResult.message', index=3,
+      number=4, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='replicas', full_name='kubespawner.ScaleResult.replicas', index=4,
+      number=5, type=13, cpp_type=3, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=2165,
+  serialized_end=2262,
+)
+
+
+_SCALERESPONSE = _descriptor.Descriptor(
+  name='ScaleResponse',
+  full_name='kubespawner.ScaleResponse',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='results', full_name='kubespawner.ScaleResponse.results', index=0,
+      number=1, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='failed', full_name='kubespawner.ScaleResponse.failed', index=1,
+      number=2, type=13, cpp_type=3, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='seconds', full_name='kubespawner.ScaleResponse.seconds', index=2,
+      number=3, type=1, cpp_type=5, label=1,
+      has_default_value=False, default_value=float(0),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=2264,
+  serialized_end=2355,
+)
+
+
+_PATCH = _descriptor.Descriptor(
+  name='Patch',
+  full_name='kubespawner.Patch',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='namespace', full_name='kubespawner.Patch.namespace', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='name', full_name='kubespawner.Patch.name', index=1,
+      number=2, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='type', full_name='kubespawner.Patch.type', index=2,
+      number=3, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='patch_type', full_name='kubespawner.Patch.patch_type', index=3,
+      number=4, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='content', full_name='kubespawner.Patch.content', index=4,
+      number=5, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=2357,
+  serialized_end=2448,
+)
+
+
+_DEPLOYMENTUPDATE = _descriptor.Descriptor(
+  name='DeploymentUpdate',
+  full_name='kubespawner.DeploymentUpdate',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='namespace', full_name='kubespawner.DeploymentUpdate.namespace', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='name', full_name='kubespawner.DeploymentUpdate.name', index=1,
+      number=2, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='patch_type', full_name='kubespawner.DeploymentUpdate.patch_type', index=2,
+      number=3, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='content', full_name='kubespawner.DeploymentUpdate.content', index=3,
+      number=4, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=2450,
+  serialized_end=2538,
+)
+
+
+_ROLLOUTPROGRESS = _descriptor.Descriptor(
+  name='RolloutProgress',
+  full_name='kubespawner.RolloutProgress',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='state', full_name='kubespawner.RolloutProgress.state', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='message', full_name='kubespawner.RolloutProgress.message', index=1,
+      number=2, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='generation', full_name='kubespawner.RolloutProgress.generation', index=2,
+      number=3, type=3, cpp_type=2, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='observed_generation', full_name='kubespawner.RolloutProgress.observed_generation', index=3,
+      number=4, type=3, cpp_type=2, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='replicas', full_name='kubespawner.RolloutProgress.replicas', index=4,
+      number=5, type=13, cpp_type=3, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='updated_replicas', full_name='kubespawner.RolloutProgress.updated_replicas', index=5,
+      number=6, type=13, cpp_type=3, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='available_replicas', full_name='kubespawner.RolloutProgress.available_replicas', index=6,
+      number=7, type=13, cpp_type=3, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='unavailable_replicas', full_name='kubespawner.RolloutProgress.unavailable_replicas', index=7,
+      number=8, type=13, cpp_type=3, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=2541,
+  serialized_end=2741,
+)
+
+
+_DEPLOYMENTSTATUS = _descriptor.Descriptor(
+  name='DeploymentStatus',
+  full_name='kubespawner.DeploymentStatus',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='replicas', full_name='kubespawner.DeploymentStatus.replicas', index=0,
+      number=1, type=5, cpp_type=1, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='available_replicas', full_name='kubespawner.DeploymentStatus.available_replicas', index=1,
+      number=2, type=5, cpp_type=1, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='unavailable_replicas', full_name='kubespawner.DeploymentStatus.unavailable_replicas', index=2,
+      number=3, type=5, cpp_type=1, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='updated_replicas', full_name='kubespawner.DeploymentStatus.updated_replicas', index=3,
+      number=4, type=5, cpp_type=1, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='collision_count', full_name='kubespawner.DeploymentStatus.collision_count', index=4,
+      number=5, type=5, cpp_type=1, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='observed_generation', full_name='kubespawner.DeploymentStatus.observed_generation', index=5,
+      number=6, type=3, cpp_type=2, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=2744,
+  serialized_end=2918,
+)
+
+
+_JOBSTATUS = _descriptor.Descriptor(
+  name='JobStatus',
+  full_name='kubespawner.JobStatus',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='active', full_name='kubespawner.JobStatus.active', index=0,
+      number=1, type=5, cpp_type=1, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='succeeded', full_name='kubespawner.JobStatus.succeeded', index=1,
+      number=2, type=5, cpp_type=1, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='failed', full_name='kubespawner.JobStatus.failed', index=2,
+      number=3, type=5, cpp_type=1, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='start_time', full_name='kubespawner.JobStatus.start_time', index=3,
+      number=4, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='completion_time', full_name='kubespawner.JobStatus.completion_time', index=4,
+      number=5, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=2921,
+  serialized_end=3084,
+)
+
+
+_CRONJOBSTATUS = _descriptor.Descriptor(
+  name='CronJobStatus',
+  full_name='kubespawner.CronJobStatus',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='active', full_name='kubespawner.CronJobStatus.active', index=0,
+      number=1, type=5, cpp_type=1, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='last_schedule_time', full_name='kubespawner.CronJobStatus.last_schedule_time', index=1,
+      number=2, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=3086,
+  serialized_end=3173,
+)
+
+
+_RESOURCESTATUS = _descriptor.Descriptor(
+  name='ResourceStatus',
+  full_name='kubespawner.ResourceStatus',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='deployment', full_name='kubespawner.ResourceStatus.deployment', index=0,
+      number=1, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='job', full_name='kubespawner.ResourceStatus.job', index=1,
+      number=2, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='cronjob', full_name='kubespawner.ResourceStatus.cronjob', index=2,
+      number=3, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='error', full_name='kubespawner.ResourceStatus.error', index=3,
+      number=4, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+    _descriptor.OneofDescriptor(
+      name='status', full_name='kubespawner.ResourceStatus.status',
+      index=0, containing_type=None,
+      create_key=_descriptor._internal_create_key,
+    fields=[]),
+  ],
+  serialized_start=3176,
+  serialized_end=3358,
+)
+
+
+_PROFILEREQUEST = _descriptor.Descriptor(
+  name='ProfileRequest',
+  full_name='kubespawner.ProfileRequest',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='seconds', full_name='kubespawner.ProfileRequest.seconds', index=0,
+      number=1, type=5, cpp_type=1, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='format', full_name='kubespawner.ProfileRequest.format', index=1,
+      number=2, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='all_threads', full_name='kubespawner.ProfileRequest.all_threads', index=2,
+      number=3, type=8, cpp_type=7, label=1,
+      has_default_value=False, default_value=False,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=3360,
+  serialized_end=3430,
+)
+
+
+_PROFILERESULT_SAMPLESBYMETHODENTRY = _descriptor.Descriptor(
+  name='SamplesByMethodEntry',
+  full_name='kubespawner.ProfileResult.SamplesByMethodEntry',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='key', full_name='kubespawner.ProfileResult.SamplesByMethodEntry.key', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='value', full_name='kubespawner.ProfileResult.SamplesByMethodEntry.value', index=1,
+      number=2, type=5, cpp_type=1, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=b'8\001',
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=3590,
+  serialized_end=3644,
+)
+
+_PROFILERESULT = _descriptor.Descriptor(
+  name='ProfileResult',
+  full_name='kubespawner.ProfileResult',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='format', full_name='kubespawner.ProfileResult.format', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='data', full_name='kubespawner.ProfileResult.data', index=1,
+      number=2, type=12, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"",
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='samples', full_name='kubespawner.ProfileResult.samples', index=2,
+      number=3, type=5, cpp_type=1, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='seconds', full_name='kubespawner.ProfileResult.seconds', index=3,
+      number=4, type=1, cpp_type=5, label=1,
+      has_default_value=False, default_value=float(0),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='samples_by_method', full_name='kubespawner.ProfileResult.samples_by_method', index=4,
+      number=5, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[_PROFILERESULT_SAMPLESBYMETHODENTRY, ],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=3433,
+  serialized_end=3644,
+)
+
+
+_JOBARRAY = _descriptor.Descriptor(
+  name='JobArray',
+  full_name='kubespawner.JobArray',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='namespace', full_name='kubespawner.JobArray.namespace', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='template', full_name='kubespawner.JobArray.template', index=1,
+      number=2, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='parameters', full_name='kubespawner.JobArray.parameters', index=2,
+      number=3, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='mode', full_name='kubespawner.JobArray.mode', index=3,
+      number=4, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='parallelism', full_name='kubespawner.JobArray.parallelism', index=4,
+      number=5, type=13, cpp_type=3, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=3646,
+  serialized_end=3773,
+)
+
+
+_JOBARRAYITEM = _descriptor.Descriptor(
+  name='JobArrayItem',
+  full_name='kubespawner.JobArrayItem',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='index', full_name='kubespawner.JobArrayItem.index', index=0,
+      number=1, type=13, cpp_type=3, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='name', full_name='kubespawner.JobArrayItem.name', index=1,
+      number=2, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='status', full_name='kubespawner.JobArrayItem.status', index=2,
+      number=3, type=13, cpp_type=3, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='message', full_name='kubespawner.JobArrayItem.message', index=3,
+      number=4, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=3775,
+  serialized_end=3851,
+)
+
+
+_JOBARRAYRESULT = _descriptor.Descriptor(
+  name='JobArrayResult',
+  full_name='kubespawner.JobArrayResult',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='items', full_name='kubespawner.JobArrayResult.items', index=0,
+      number=1, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='failed', full_name='kubespawner.JobArrayResult.failed', index=1,
+      number=2, type=13, cpp_type=3, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='seconds', full_name='kubespawner.JobArrayResult.seconds', index=2,
+      number=3, type=1, cpp_type=5, label=1,
+      has_default_value=False, default_value=float(0),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=3853,
+  serialized_end=3944,
+)
+
+_EVENTLIST.fields_by_name['events'].message_type = _EVENT
+_SPAWNRESULT.fields_by_name['steps'].message_type = _STEPTIMING
+_WARMCLAIMRESULT.fields_by_name['steps'].message_type = _STEPTIMING
+_IMAGECOVERAGELIST.fields_by_name['images'].message_type = _IMAGECOVERAGE
+_RESOURCEUSAGE.fields_by_name['samples'].message_type = _USAGESAMPLE
+_SCALEREQUEST.fields_by_name['items'].message_type = _SCALEITEM
+_SCALERESPONSE.fields_by_name['results'].message_type = _SCALERESULT
+_JOBSTATUS.fields_by_name['start_time'].message_type = google_dot_protobuf_dot_timestamp__pb2._TIMESTAMP
+_JOBSTATUS.fields_by_name['completion_time'].message_type = google_dot_protobuf_dot_timestamp__pb2._TIMESTAMP
+_CRONJOBSTATUS.fields_by_name['last_schedule_time'].message_type = google_dot_protobuf_dot_timestamp__pb2._TIMESTAMP
+_RESOURCESTATUS.fields_by_name['deployment'].message_type = _DEPLOYMENTSTATUS
+_RESOURCESTATUS.fields_by_name['job'].message_type = _JOBSTATUS
+_RESOURCESTATUS.fields_by_name['cronjob'].message_type = _CRONJOBSTATUS
+_RESOURCESTATUS.oneofs_by_name['status'].fields.append(
+  _RESOURCESTATUS.fields_by_name['deployment'])
+_RESOURCESTATUS.fields_by_name['deployment'].containing_oneof = _RESOURCESTATUS.oneofs_by_name['status']
+_RESOURCESTATUS.oneofs_by_name['status'].fields.append(
+  _RESOURCESTATUS.fields_by_name['job'])
+_RESOURCESTATUS.fields_by_name['job'].containing_oneof = _RESOURCESTATUS.oneofs_by_name['status']
+_RESOURCESTATUS.oneofs_by_name['status'].fields.append(
+  _RESOURCESTATUS.fields_by_name['cronjob'])
+_RESOURCESTATUS.fields_by_name['cronjob'].containing_oneof = _RESOURCESTATUS.oneofs_by_name['status']
+_RESOURCESTATUS.oneofs_by_name['status'].fields.append(
+  _RESOURCESTATUS.fields_by_name['error'])
+_RESOURCESTATUS.fields_by_name['error'].containing_oneof = _RESOURCESTATUS.oneofs_by_name['status']
+_PROFILERESULT_SAMPLESBYMETHODENTRY.containing_type = _PROFILERESULT
+_PROFILERESULT.fields_by_name['samples_by_method'].message_type = _PROFILERESULT_SAMPLESBYMETHODENTRY
+_JOBARRAY.fields_by_name['parameters'].message_type = google_dot_protobuf_dot_struct__pb2._STRUCT
+_JOBARRAYRESULT.fields_by_name['items'].message_type = _JOBARRAYITEM
 DESCRIPTOR.message_types_by_name['File'] = _FILE
 DESCRIPTOR.message_types_by_name['Service'] = _SERVICE
 DESCRIPTOR.message_types_by_name['Resource'] = _RESOURCE
 DESCRIPTOR.message_types_by_name['Status'] = _STATUS
+DESCRIPTOR.message_types_by_name['PodLogRequest'] = _PODLOGREQUEST
+DESCRIPTOR.message_types_by_name['LogChunk'] = _LOGCHUNK
+DESCRIPTOR.message_types_by_name['Event'] = _EVENT
+DESCRIPTOR.message_types_by_name['EventList'] = _EVENTLIST
+DESCRIPTOR.message_types_by_name['Workspace'] = _WORKSPACE
+DESCRIPTOR.message_types_by_name['StepTiming'] = _STEPTIMING
+DESCRIPTOR.message_types_by_name['SpawnResult'] = _SPAWNRESULT
+DESCRIPTOR.message_types_by_name['WarmPool'] = _WARMPOOL
+DESCRIPTOR.message_types_by_name['WarmClaim'] = _WARMCLAIM
+DESCRIPTOR.message_types_by_name['WarmClaimResult'] = _WARMCLAIMRESULT
+DESCRIPTOR.message_types_by_name['ImageCoverage'] = _IMAGECOVERAGE
+DESCRIPTOR.message_types_by_name['ImageCoverageList'] = _IMAGECOVERAGELIST
+DESCRIPTOR.message_types_by_name['PVCPool'] = _PVCPOOL
+DESCRIPTOR.message_types_by_name['PVCClaim'] = _PVCCLAIM
+DESCRIPTOR.message_types_by_name['PVCClaimResult'] = _PVCCLAIMRESULT
+DESCRIPTOR.message_types_by_name['StatusWatch'] = _STATUSWATCH
+DESCRIPTOR.message_types_by_name['UsageSample'] = _USAGESAMPLE
+DESCRIPTOR.message_types_by_name['ResourceUsage'] = _RESOURCEUSAGE
+DESCRIPTOR.message_types_by_name['ScaleItem'] = _SCALEITEM
+DESCRIPTOR.message_types_by_name['ScaleRequest'] = _SCALEREQUEST
+DESCRIPTOR.message_types_by_name['ScaleResult'] = _SCALERESULT
+DESCRIPTOR.message_types_by_name['ScaleResponse'] = _SCALERESPONSE
+DESCRIPTOR.message_types_by_name['Patch'] = _PATCH
+DESCRIPTOR.message_types_by_name['DeploymentUpdate'] = _DEPLOYMENTUPDATE
+DESCRIPTOR.message_types_by_name['RolloutProgress'] = _ROLLOUTPROGRESS
+DESCRIPTOR.message_types_by_name['DeploymentStatus'] = _DEPLOYMENTSTATUS
+DESCRIPTOR.message_types_by_name['JobStatus'] = _JOBSTATUS
+DESCRIPTOR.message_types_by_name['CronJobStatus'] = _CRONJOBSTATUS
+DESCRIPTOR.message_types_by_name['ResourceStatus'] = _RESOURCESTATUS
+DESCRIPTOR.message_types_by_name['ProfileRequest'] = _PROFILEREQUEST
+DESCRIPTOR.message_types_by_name['ProfileResult'] = _PROFILERESULT
+DESCRIPTOR.message_types_by_name['JobArray'] = _JOBARRAY
+DESCRIPTOR.message_types_by_name['JobArrayItem'] = _JOBARRAYITEM
+DESCRIPTOR.message_types_by_name['JobArrayResult'] = _JOBARRAYRESULT
 DESCRIPTOR.enum_types_by_name['ResourceType'] = _RESOURCETYPE
 _sym_db.RegisterFileDescriptor(DESCRIPTOR)
 
@@ -322,8 +2267,255 @@ Status = _reflection.GeneratedProtocolMessageType('Status', (_message.Message,),
   })
 _sym_db.RegisterMessage(Status)
 
+PodLogRequest = _reflection.GeneratedProtocolMessageType('PodLogRequest', (_message.Message,), {
+  'DESCRIPTOR' : _PODLOGREQUEST,
+  '__module__' : 'kubespawner_pb2'
+  # @@protoc_insertion_point(class_scope:kubespawner.PodLogRequest)
+  })
+_sym_db.RegisterMessage(PodLogRequest)
+
+LogChunk = _reflection.GeneratedProtocolMessageType('LogChunk', (_message.Message,), {
+  'DESCRIPTOR' : _LOGCHUNK,
+  '__module__' : 'kubespawner_pb2'
+  # @@protoc_insertion_point(class_scope:kubespawner.LogChunk)
+  })
+_sym_db.RegisterMessage(LogChunk)
+
+Event = _reflection.GeneratedProtocolMessageType('Event', (_message.Message,), {
+  'DESCRIPTOR' : _EVENT,
+  '__module__' : 'kubespawner_pb2'
+  # @@protoc_insertion_point(class_scope:kubespawner.Event)
+  })
+_sym_db.RegisterMessage(Event)
+
+EventList = _reflection.GeneratedProtocolMessageType('EventList', (_message.Message,), {
+  'DESCRIPTOR' : _EVENTLIST,
+  '__module__' : 'kubespawner_pb2'
+  # @@protoc_insertion_point(class_scope:kubespawner.EventList)
+  })
+_sym_db.RegisterMessage(EventList)
+
+Workspace = _reflection.GeneratedProtocolMessageType('Workspace', (_message.Message,), {
+  'DESCRIPTOR' : _WORKSPACE,
+  '__module__' : 'kubespawner_pb2'
+  # @@protoc_insertion_point(class_scope:kubespawner.Workspace)
+  })
+_sym_db.RegisterMessage(Workspace)
+
+StepTiming = _reflection.GeneratedProtocolMessageType('StepTiming', (_message.Message,), {
+  'DESCRIPTOR' : _STEPTIMING,
+  '__module__' : 'kubespawner_pb2'
+  # @@protoc_insertion_point(class_scope:kubespawner.StepTiming)
+  })
+_sym_db.RegisterMessage(StepTiming)
+
+SpawnResult = _reflection.GeneratedProtocolMessageType('SpawnResult', (_message.Message,), {
+  'DESCRIPTOR' : _SPAWNRESULT,
+  '__module__' : 'kubespawner_pb2'
+  # @@protoc_insertion_point(class_scope:kubespawner.SpawnResult)
+  })
+_sym_db.RegisterMessage(SpawnResult)
+
+WarmPool = _reflection.GeneratedProtocolMessageType('WarmPool', (_message.Message,), {
+  'DESCRIPTOR' : _WARMPOOL,
+  '__module__' : 'kubespawner_pb2'
+  # @@protoc_insertion_point(class_scope:kubespawner.WarmPool)
+  })
+_sym_db.RegisterMessage(WarmPool)
+
+WarmClaim = _reflection.GeneratedProtocolMessageType('WarmClaim', (_message.Message,), {
+  'DESCRIPTOR' : _WARMCLAIM,
+  '__module__' : 'kubespawner_pb2'
+  # @@protoc_insertion_point(class_scope:kubespawner.WarmClaim)
+  })
+_sym_db.RegisterMessage(WarmClaim)
+
+WarmClaimResult = _reflection.GeneratedProtocolMessageType('WarmClaimResult', (_message.Message,), {
+  'DESCRIPTOR' : _WARMCLAIMRESULT,
+  '__module__' : 'kubespawner_pb2'
+  # @@protoc_insertion_point(class_scope:kubespawner.WarmClaimResult)
+  })
+_sym_db.RegisterMessage(WarmClaimResult)
+
+ImageCoverage = _reflection.GeneratedProtocolMessageType('ImageCoverage', (_message.Message,), {
+  'DESCRIPTOR' : _IMAGECOVERAGE,
+  '__module__' : 'kubespawner_pb2'
+  # @@protoc_insertion_point(class_scope:kubespawner.ImageCoverage)
+  })
+_sym_db.RegisterMessage(ImageCoverage)
+
+ImageCoverageList = _reflection.GeneratedProtocolMessageType('ImageCoverageList', (_message.Message,), {
+  'DESCRIPTOR' : _IMAGECOVERAGELIST,
+  '__module__' : 'kubespawner_pb2'
+  # @@protoc_insertion_point(class_scope:kubespawner.ImageCoverageList)
+  })
+_sym_db.RegisterMessage(ImageCoverageList)
+
+PVCPool = _reflection.GeneratedProtocolMessageType('PVCPool', (_message.Message,), {
+  'DESCRIPTOR' : _PVCPOOL,
+  '__module__' : 'kubespawner_pb2'
+  # @@protoc_insertion_point(class_scope:kubespawner.PVCPool)
+  })
+_sym_db.RegisterMessage(PVCPool)
+
+PVCClaim = _reflection.GeneratedProtocolMessageType('PVCClaim', (_message.Message,), {
+  'DESCRIPTOR' : _PVCCLAIM,
+  '__module__' : 'kubespawner_pb2'
+  # @@protoc_insertion_point(class_scope:kubespawner.PVCClaim)
+  })
+_sym_db.RegisterMessage(PVCClaim)
+
+PVCClaimResult = _reflection.GeneratedProtocolMessageType('PVCClaimResult', (_message.Message,), {
+  'DESCRIPTOR' : _PVCCLAIMRESULT,
+  '__module__' : 'kubespawner_pb2'
+  # @@protoc_insertion_point(class_scope:kubespawner.PVCClaimResult)
+  })
+_sym_db.RegisterMessage(PVCClaimResult)
+
+StatusWatch = _reflection.GeneratedProtocolMessageType('StatusWatch', (_message.Message,), {
+  'DESCRIPTOR' : _STATUSWATCH,
+  '__module__' : 'kubespawner_pb2'
+  # @@protoc_insertion_point(class_scope:kubespawner.StatusWatch)
+  })
+_sym_db.RegisterMessage(StatusWatch)
+
+UsageSample = _reflection.GeneratedProtocolMessageType('UsageSample', (_message.Message,), {
+  'DESCRIPTOR' : _USAGESAMPLE,
+  '__module__' : 'kubespawner_pb2'
+  # @@protoc_insertion_point(class_scope:kubespawner.UsageSample)
+  })
+_sym_db.RegisterMessage(UsageSample)
+
+ResourceUsage = _reflection.GeneratedProtocolMessageType('ResourceUsage', (_message.Message,), {
+  'DESCRIPTOR' : _RESOURCEUSAGE,
+  '__module__' : 'kubespawner_pb2'
+  # @@protoc_insertion_point(class_scope:kubespawner.ResourceUsage)
+  })
+_sym_db.RegisterMessage(ResourceUsage)
+
+ScaleItem = _reflection.GeneratedProtocolMessageType('ScaleItem', (_message.Message,), {
+  'DESCRIPTOR' : _SCALEITEM,
+  '__module__' : 'kubespawner_pb2'
+  # @@protoc_insertion_point(class_scope:kubespawner.ScaleItem)
+  })
+_sym_db.RegisterMessage(ScaleItem)
+
+ScaleRequest = _reflection.GeneratedProtocolMessageType('ScaleRequest', (_message.Message,), {
+  'DESCRIPTOR' : _SCALEREQUEST,
+  '__module__' : 'kubespawner_pb2'
+  # @@protoc_insertion_point(class_scope:kubespawner.ScaleRequest)
+  })
+_sym_db.RegisterMessage(ScaleRequest)
+
+ScaleResult = _reflection.GeneratedProtocolMessageType('ScaleResult', (_message.Message,), {
+  'DESCRIPTOR' : _SCALERESULT,
+  '__module__' : 'kubespawner_pb2'
+  # @@protoc_insertion_point(class_scope:kubespawner.ScaleResult)
+  })
+_sym_db.RegisterMessage(ScaleResult)
+
+ScaleResponse = _reflection.GeneratedProtocolMessageType('ScaleResponse', (_message.Message,), {
+  'DESCRIPTOR' : _SCALERESPONSE,
+  '__module__' : 'kubespawner_pb2'
+  # @@protoc_insertion_point(class_scope:kubespawner.ScaleResponse)
+  })
+_sym_db.RegisterMessage(ScaleResponse)
+
+Patch = _reflection.GeneratedProtocolMessageType('Patch', (_message.Message,), {
+  'DESCRIPTOR' : _PATCH,
+  '__module__' : 'kubespawner_pb2'
+  # @@protoc_insertion_point(class_scope:kubespawner.Patch)
+  })
+_sym_db.RegisterMessage(Patch)
+
+DeploymentUpdate = _reflection.GeneratedProtocolMessageType('DeploymentUpdate', (_message.Message,), {
+  'DESCRIPTOR' : _DEPLOYMENTUPDATE,
+  '__module__' : 'kubespawner_pb2'
+  # @@protoc_insertion_point(class_scope:kubespawner.DeploymentUpdate)
+  })
+_sym_db.RegisterMessage(DeploymentUpdate)
+
+RolloutProgress = _reflection.GeneratedProtocolMessageType('RolloutProgress', (_message.Message,), {
+  'DESCRIPTOR' : _ROLLOUTPROGRESS,
+  '__module__' : 'kubespawner_pb2'
+  # @@protoc_insertion_point(class_scope:kubespawner.RolloutProgress)
+  })
+_sym_db.RegisterMessage(RolloutProgress)
+
+DeploymentStatus = _reflection.GeneratedProtocolMessageType('DeploymentStatus', (_message.Message,), {
+  'DESCRIPTOR' : _DEPLOYMENTSTATUS,
+  '__module__' : 'kubespawner_pb2'
+  # @@protoc_insertion_point(class_scope:kubespawner.DeploymentStatus)
+  })
+_sym_db.RegisterMessage(DeploymentStatus)
+
+JobStatus = _reflection.GeneratedProtocolMessageType('JobStatus', (_message.Message,), {
+  'DESCRIPTOR' : _JOBSTATUS,
+  '__module__' : 'kubespawner_pb2'
+  # @@protoc_insertion_point(class_scope:kubespawner.JobStatus)
+  })
+_sym_db.RegisterMessage(JobStatus)
+
+CronJobStatus = _reflection.GeneratedProtocolMessageType('CronJobStatus', (_message.Message,), {
+  'DESCRIPTOR' : _CRONJOBSTATUS,
+  '__module__' : 'kubespawner_pb2'
+  # @@protoc_insertion_point(class_scope:kubespawner.CronJobStatus)
+  })
+_sym_db.RegisterMessage(CronJobStatus)
+
+ResourceStatus = _reflection.GeneratedProtocolMessageType('ResourceStatus', (_message.Message,), {
+  'DESCRIPTOR' : _RESOURCESTATUS,
+  '__module__' : 'kubespawner_pb2'
+  # @@protoc_insertion_point(class_scope:kubespawner.ResourceStatus)
+  })
+_sym_db.RegisterMessage(ResourceStatus)
+
+ProfileRequest = _reflection.GeneratedProtocolMessageType('ProfileRequest', (_message.Message,), {
+  'DESCRIPTOR' : _PROFILEREQUEST,
+  '__module__' : 'kubespawner_pb2'
+  # @@protoc_insertion_point(class_scope:kubespawner.ProfileRequest)
+  })
+_sym_db.RegisterMessage(ProfileRequest)
+
+ProfileResult = _reflection.GeneratedProtocolMessageType('ProfileResult', (_message.Message,), {
+
+  'SamplesByMethodEntry' : _reflection.GeneratedProtocolMessageType('SamplesByMethodEntry', (_message.Message,), {
+    'DESCRIPTOR' : _PROFILERESULT_SAMPLESBYMETHODENTRY,
+    '__module__' : 'kubespawner_pb2'
+    # @@protoc_insertion_point(class_scope:kubespawner.ProfileResult.SamplesByMethodEntry)
+    })
+  ,
+  'DESCRIPTOR' : _PROFILERESULT,
+  '__module__' : 'kubespawner_pb2'
+  # @@protoc_insertion_point(class_scope:kubespawner.ProfileResult)
+  })
+_sym_db.RegisterMessage(ProfileResult)
+_sym_db.RegisterMessage(ProfileResult.SamplesByMethodEntry)
+
+JobArray = _reflection.GeneratedProtocolMessageType('JobArray', (_message.Message,), {
+  'DESCRIPTOR' : _JOBARRAY,
+  '__module__' : 'kubespawner_pb2'
+  # @@protoc_insertion_point(class_scope:kubespawner.JobArray)
+  })
+_sym_db.RegisterMessage(JobArray)
+
+JobArrayItem = _reflection.GeneratedProtocolMessageType('JobArrayItem', (_message.Message,), {
+  'DESCRIPTOR' : _JOBARRAYITEM,
+  '__module__' : 'kubespawner_pb2'
+  # @@protoc_insertion_point(class_scope:kubespawner.JobArrayItem)
+  })
+_sym_db.RegisterMessage(JobArrayItem)
+
+JobArrayResult = _reflection.GeneratedProtocolMessageType('JobArrayResult', (_message.Message,), {
+  'DESCRIPTOR' : _JOBARRAYRESULT,
+  '__module__' : 'kubespawner_pb2'
+  # @@protoc_insertion_point(class_scope:kubespawner.JobArrayResult)
+  })
+_sym_db.RegisterMessage(JobArrayResult)
+
 
 DESCRIPTOR._options = None
+_PROFILERESULT_SAMPLESBYMETHODENTRY._options = None
 
 _KUBESPAWNERSERVICES = _descriptor.ServiceDescriptor(
   name='KubeSpawnerServices',
@@ -332,8 +2524,8 @@ _KUBESPAWNERSERVICES = _descriptor.ServiceDescriptor(
   index=0,
   serialized_options=None,
   create_key=_descriptor._internal_create_key,
-  serialized_start=401,
-  serialized_end=1325,
+  serialized_start=4045,
+  serialized_end=6196,
   methods=[
   _descriptor.MethodDescriptor(
     name='CreateDeploymentFromFile',
@@ -475,9 +2667,215 @@ _KUBESPAWNERSERVICES = _descriptor.ServiceDescriptor(
     serialized_options=None,
     create_key=_descriptor._internal_create_key,
   ),
+  _descriptor.MethodDescriptor(
+    name='StreamPodLogs',
+    full_name='kubespawner.KubeSpawnerServices.StreamPodLogs',
+    index=14,
+    containing_service=None,
+    input_type=_PODLOGREQUEST,
+    output_type=_LOGCHUNK,
+    serialized_options=None,
+    create_key=_descriptor._internal_create_key,
+  ),
+  _descriptor.MethodDescriptor(
+    name='GetResourceEvents',
+    full_name='kubespawner.KubeSpawnerServices.GetResourceEvents',
+    index=15,
+    containing_service=None,
+    input_type=_RESOURCE,
+    output_type=_EVENTLIST,
+    serialized_options=None,
+    create_key=_descriptor._internal_create_key,
+  ),
+  _descriptor.MethodDescriptor(
+    name='WaitForReady',
+    full_name='kubespawner.KubeSpawnerServices.WaitForReady',
+    index=16,
+    containing_service=None,
+    input_type=_RESOURCE,
+    output_type=google_dot_protobuf_dot_struct__pb2._STRUCT,
+    serialized_options=None,
+    create_key=_descriptor._internal_create_key,
+  ),
+  _descriptor.MethodDescriptor(
+    name='WaitForCompletion',
+    full_name='kubespawner.KubeSpawnerServices.WaitForCompletion',
+    index=17,
+    containing_service=None,
+    input_type=_RESOURCE,
+    output_type=google_dot_protobuf_dot_struct__pb2._STRUCT,
+    serialized_options=None,
+    create_key=_descriptor._internal_create_key,
+  ),
+  _descriptor.MethodDescriptor(
+    name='SpawnWorkspace',
+    full_name='kubespawner.KubeSpawnerServices.SpawnWorkspace',
+    index=18,
+    containing_service=None,
+    input_type=_WORKSPACE,
+    output_type=_SPAWNRESULT,
+    serialized_options=None,
+    create_key=_descriptor._internal_create_key,
+  ),
+  _descriptor.MethodDescriptor(
+    name='RegisterWarmPool',
+    full_name='kubespawner.KubeSpawnerServices.RegisterWarmPool',
+    index=19,
+    containing_service=None,
+    input_type=_WARMPOOL,
+    output_type=_STATUS,
+    serialized_options=None,
+    create_key=_descriptor._internal_create_key,
+  ),
+  _descriptor.MethodDescriptor(
+    name='ClaimWarmWorkspace',
+    full_name='kubespawner.KubeSpawnerServices.ClaimWarmWorkspace',
+    index=20,
+    containing_service=None,
+    input_type=_WARMCLAIM,
+    output_type=_WARMCLAIMRESULT,
+    serialized_options=None,
+    create_key=_descriptor._internal_create_key,
+  ),
+  _descriptor.MethodDescriptor(
+    name='GetImagePullCoverage',
+    full_name='kubespawner.KubeSpawnerServices.GetImagePullCoverage',
+    index=21,
+    containing_service=None,
+    input_type=google_dot_protobuf_dot_empty__pb2._EMPTY,
+    output_type=_IMAGECOVERAGELIST,
+    serialized_options=None,
+    create_key=_descriptor._internal_create_key,
+  ),
+  _descriptor.MethodDescriptor(
+    name='RegisterPVCPool',
+    full_name='kubespawner.KubeSpawnerServices.RegisterPVCPool',
+    index=22,
+    containing_service=None,
+    input_type=_PVCPOOL,
+    output_type=_STATUS,
+    serialized_options=None,
+    create_key=_descriptor._internal_create_key,
+  ),
+  _descriptor.MethodDescriptor(
+    name='ClaimPVC',
+    full_name='kubespawner.KubeSpawnerServices.ClaimPVC',
+    index=23,
+    containing_service=None,
+    input_type=_PVCCLAIM,
+    output_type=_PVCCLAIMRESULT,
+    serialized_options=None,
+    create_key=_descriptor._internal_create_key,
+  ),
+  _descriptor.MethodDescriptor(
+    name='WatchStatusChanges',
+    full_name='kubespawner.KubeSpawnerServices.WatchStatusChanges',
+    index=24,
+    containing_service=None,
+    input_type=_STATUSWATCH,
+    output_type=_RESOURCE,
+    serialized_options=None,
+    create_key=_descriptor._internal_create_key,
+  ),
+  _descriptor.MethodDescriptor(
+    name='GetResourceUsage',
+    full_name='kubespawner.KubeSpawnerServices.GetResourceUsage',
+    index=25,
+    containing_service=None,
+    input_type=_RESOURCE,
+    output_type=_RESOURCEUSAGE,
+    serialized_options=None,
+    create_key=_descriptor._internal_create_key,
+  ),
+  _descriptor.MethodDescriptor(
+    name='ScaleDeployments',
+    full_name='kubespawner.KubeSpawnerServices.ScaleDeployments',
+    index=26,
+    containing_service=None,
+    input_type=_SCALEREQUEST,
+    output_type=_SCALERESPONSE,
+    serialized_options=None,
+    create_key=_descriptor._internal_create_key,
+  ),
+  _descriptor.MethodDescriptor(
+    name='PatchResource',
+    full_name='kubespawner.KubeSpawnerServices.PatchResource',
+    index=27,
+    containing_service=None,
+    input_type=_PATCH,
+    output_type=_STATUS,
+    serialized_options=None,
+    create_key=_descriptor._internal_create_key,
+  ),
+  _descriptor.MethodDescriptor(
+    name='UpdateDeployment',
+    full_name='kubespawner.KubeSpawnerServices.UpdateDeployment',
+    index=28,
+    containing_service=None,
+    input_type=_DEPLOYMENTUPDATE,
+    output_type=_ROLLOUTPROGRESS,
+    serialized_options=None,
+    create_key=_descriptor._internal_create_key,
+  ),
+  _descriptor.MethodDescriptor(
+    name='GetTypedResourceStatus',
+    full_name='kubespawner.KubeSpawnerServices.GetTypedResourceStatus',
+    index=29,
+    containing_service=None,
+    input_type=_RESOURCE,
+    output_type=_RESOURCESTATUS,
+    serialized_options=None,
+    create_key=_descriptor._internal_create_key,
+  ),
+  _descriptor.MethodDescriptor(
+    name='SubmitJobArray',
+    full_name='kubespawner.KubeSpawnerServices.SubmitJobArray',
+    index=30,
+    containing_service=None,
+    input_type=_JOBARRAY,
+    output_type=_JOBARRAYRESULT,
+    serialized_options=None,
+    create_key=_descriptor._internal_create_key,
+  ),
 ])
 _sym_db.RegisterServiceDescriptor(_KUBESPAWNERSERVICES)
 
 DESCRIPTOR.services_by_name['KubeSpawnerServices'] = _KUBESPAWNERSERVICES
 
+
+_KUBESPAWNERADMIN = _descriptor.ServiceDescriptor(
+  name='KubeSpawnerAdmin',
+  full_name='kubespawner.KubeSpawnerAdmin',
+  file=DESCRIPTOR,
+  index=1,
+  serialized_options=None,
+  create_key=_descriptor._internal_create_key,
+  serialized_start=6199,
+  serialized_end=6349,
+  methods=[
+  _descriptor.MethodDescriptor(
+    name='Profile',
+    full_name='kubespawner.KubeSpawnerAdmin.Profile',
+    index=0,
+    containing_service=None,
+    input_type=_PROFILEREQUEST,
+    output_type=_PROFILERESULT,
+    serialized_options=None,
+    create_key=_descriptor._internal_create_key,
+  ),
+  _descriptor.MethodDescriptor(
+    name='Inspect',
+    full_name='kubespawner.KubeSpawnerAdmin.Inspect',
+    index=1,
+    containing_service=None,
+    input_type=google_dot_protobuf_dot_empty__pb2._EMPTY,
+    output_type=google_dot_protobuf_dot_struct__pb2._STRUCT,
+    serialized_options=None,
+    create_key=_descriptor._internal_create_key,
+  ),
+])
+_sym_db.RegisterServiceDescriptor(_KUBESPAWNERADMIN)
+
+DESCRIPTOR.services_by_name['KubeSpawnerAdmin'] = _KUBESPAWNERADMIN
+
 # @@protoc_insertion_point(module_scope)
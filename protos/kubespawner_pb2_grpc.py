@@ -20,6 +20,7 @@
 """Client and server classes corresponding to protobuf-defined services."""
 import grpc
 
+from google.protobuf import empty_pb2 as google_dot_protobuf_dot_empty__pb2
 from google.protobuf import struct_pb2 as google_dot_protobuf_dot_struct__pb2
 from protos import kubespawner_pb2 as kubespawner__pb2
 
@@ -105,6 +106,91 @@ class KubeSpawnerServicesStub(object):
                 request_serializer=kubespawner__pb2.Resource.SerializeToString,
                 response_deserializer=kubespawner__pb2.Status.FromString,
                 )
+        self.StreamPodLogs = channel.unary_stream(
+                '/kubespawner.KubeSpawnerServices/StreamPodLogs',
+                request_serializer=kubespawner__pb2.PodLogRequest.SerializeToString,
+                response_deserializer=kubespawner__pb2.LogChunk.FromString,
+                )
+        self.GetResourceEvents = channel.unary_unary(
+                '/kubespawner.KubeSpawnerServices/GetResourceEvents',
+                request_serializer=kubespawner__pb2.Resource.SerializeToString,
+                response_deserializer=kubespawner__pb2.EventList.FromString,
+                )
+        self.WaitForReady = channel.unary_unary(
+                '/kubespawner.KubeSpawnerServices/WaitForReady',
+                request_serializer=kubespawner__pb2.Resource.SerializeToString,
+                response_deserializer=google_dot_protobuf_dot_struct__pb2.Struct.FromString,
+                )
+        self.WaitForCompletion = channel.unary_unary(
+                '/kubespawner.KubeSpawnerServices/WaitForCompletion',
+                request_serializer=kubespawner__pb2.Resource.SerializeToString,
+                response_deserializer=google_dot_protobuf_dot_struct__pb2.Struct.FromString,
+                )
+        self.SpawnWorkspace = channel.unary_unary(
+                '/kubespawner.KubeSpawnerServices/SpawnWorkspace',
+                request_serializer=kubespawner__pb2.Workspace.SerializeToString,
+                response_deserializer=kubespawner__pb2.SpawnResult.FromString,
+                )
+        self.RegisterWarmPool = channel.unary_unary(
+                '/kubespawner.KubeSpawnerServices/RegisterWarmPool',
+                request_serializer=kubespawner__pb2.WarmPool.SerializeToString,
+                response_deserializer=kubespawner__pb2.Status.FromString,
+                )
+        self.ClaimWarmWorkspace = channel.unary_unary(
+                '/kubespawner.KubeSpawnerServices/ClaimWarmWorkspace',
+                request_serializer=kubespawner__pb2.WarmClaim.SerializeToString,
+                response_deserializer=kubespawner__pb2.WarmClaimResult.FromString,
+                )
+        self.GetImagePullCoverage = channel.unary_unary(
+                '/kubespawner.KubeSpawnerServices/GetImagePullCoverage',
+                request_serializer=google_dot_protobuf_dot_empty__pb2.Empty.SerializeToString,
+                response_deserializer=kubespawner__pb2.ImageCoverageList.FromString,
+                )
+        self.RegisterPVCPool = channel.unary_unary(
+                '/kubespawner.KubeSpawnerServices/RegisterPVCPool',
+                request_serializer=kubespawner__pb2.PVCPool.SerializeToString,
+                response_deserializer=kubespawner__pb2.Status.FromString,
+                )
+        self.ClaimPVC = channel.unary_unary(
+                '/kubespawner.KubeSpawnerServices/ClaimPVC',
+                request_serializer=kubespawner__pb2.PVCClaim.SerializeToString,
+                response_deserializer=kubespawner__pb2.PVCClaimResult.FromString,
+                )
+        self.WatchStatusChanges = channel.unary_stream(
+                '/kubespawner.KubeSpawnerServices/WatchStatusChanges',
+                request_serializer=kubespawner__pb2.StatusWatch.SerializeToString,
+                response_deserializer=kubespawner__pb2.Resource.FromString,
+                )
+        self.GetResourceUsage = channel.unary_unary(
+                '/kubespawner.KubeSpawnerServices/GetResourceUsage',
+                request_serializer=kubespawner__pb2.Resource.SerializeToString,
+                response_deserializer=kubespawner__pb2.ResourceUsage.FromString,
+                )
+        self.ScaleDeployments = channel.unary_unary(
+                '/kubespawner.KubeSpawnerServices/ScaleDeployments',
+                request_serializer=kubespawner__pb2.ScaleRequest.SerializeToString,
+                response_deserializer=kubespawner__pb2.ScaleResponse.FromString,
+                )
+        self.PatchResource = channel.unary_unary(
+                '/kubespawner.KubeSpawnerServices/PatchResource',
+                request_serializer=kubespawner__pb2.Patch.SerializeToString,
+                response_deserializer=kubespawner__pb2.Status.FromString,
+                )
+        self.UpdateDeployment = channel.unary_stream(
+                '/kubespawner.KubeSpawnerServices/UpdateDeployment',
+                request_serializer=kubespawner__pb2.DeploymentUpdate.SerializeToString,
+                response_deserializer=kubespawner__pb2.RolloutProgress.FromString,
+                )
+        self.GetTypedResourceStatus = channel.unary_unary(
+                '/kubespawner.KubeSpawnerServices/GetTypedResourceStatus',
+                request_serializer=kubespawner__pb2.Resource.SerializeToString,
+                response_deserializer=kubespawner__pb2.ResourceStatus.FromString,
+                )
+        self.SubmitJobArray = channel.unary_unary(
+                '/kubespawner.KubeSpawnerServices/SubmitJobArray',
+                request_serializer=kubespawner__pb2.JobArray.SerializeToString,
+                response_deserializer=kubespawner__pb2.JobArrayResult.FromString,
+                )
 
 
 class KubeSpawnerServicesServicer(object):
@@ -210,6 +296,125 @@ class KubeSpawnerServicesServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def StreamPodLogs(self, request, context):
+        """Follow pod logs, streamed as raw byte chunks
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetResourceEvents(self, request, context):
+        """Get the events of a resource and of the pods it owns
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def WaitForReady(self, request, context):
+        """Wait until all the replicas of a deployment are available, returns its status
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def WaitForCompletion(self, request, context):
+        """Wait until a job completes or fails, returns its status
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def SpawnWorkspace(self, request, context):
+        """Create the PVC, deployment, service and ingress of a workspace at once
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def RegisterWarmPool(self, request, context):
+        """Register (or resize) a pool of idle, already started workspace deployments
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ClaimWarmWorkspace(self, request, context):
+        """Claim a deployment of a warm pool and attach its service and ingress
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetImagePullCoverage(self, request, context):
+        """Get how many nodes have the images used by the spawned resources
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def RegisterPVCPool(self, request, context):
+        """Register (or resize) a pool of provisioned PVCs of a storage class and size
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ClaimPVC(self, request, context):
+        """Claim a provisioned PVC of a pool
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def WatchStatusChanges(self, request, context):
+        """Stream the deployments, jobs and pods of a namespace whose status changed
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetResourceUsage(self, request, context):
+        """Get the recent CPU and memory usage of a deployment or job
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ScaleDeployments(self, request, context):
+        """Set the replicas of many deployments at once, e.g. to pause or resume workspaces
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def PatchResource(self, request, context):
+        """Patch a deployment, service, job, cronjob or ingress in place
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def UpdateDeployment(self, request, context):
+        """Patch a deployment and follow its rollout until it completes or fails
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetTypedResourceStatus(self, request, context):
+        """Get the status of a deployment, job or cronjob as a typed message
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def SubmitJobArray(self, request, context):
+        """Create many jobs from one template and a list of parameter sets
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_KubeSpawnerServicesServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -283,6 +488,91 @@ def add_KubeSpawnerServicesServicer_to_server(servicer, server):
                     request_deserializer=kubespawner__pb2.Resource.FromString,
                     response_serializer=kubespawner__pb2.Status.SerializeToString,
             ),
+            'StreamPodLogs': grpc.unary_stream_rpc_method_handler(
+                    servicer.StreamPodLogs,
+                    request_deserializer=kubespawner__pb2.PodLogRequest.FromString,
+                    response_serializer=kubespawner__pb2.LogChunk.SerializeToString,
+            ),
+            'GetResourceEvents': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetResourceEvents,
+                    request_deserializer=kubespawner__pb2.Resource.FromString,
+                    response_serializer=kubespawner__pb2.EventList.SerializeToString,
+            ),
+            'WaitForReady': grpc.unary_unary_rpc_method_handler(
+                    servicer.WaitForReady,
+                    request_deserializer=kubespawner__pb2.Resource.FromString,
+                    response_serializer=google_dot_protobuf_dot_struct__pb2.Struct.SerializeToString,
+            ),
+            'WaitForCompletion': grpc.unary_unary_rpc_method_handler(
+                    servicer.WaitForCompletion,
+                    request_deserializer=kubespawner__pb2.Resource.FromString,
+                    response_serializer=google_dot_protobuf_dot_struct__pb2.Struct.SerializeToString,
+            ),
+            'SpawnWorkspace': grpc.unary_unary_rpc_method_handler(
+                    servicer.SpawnWorkspace,
+                    request_deserializer=kubespawner__pb2.Workspace.FromString,
+                    response_serializer=kubespawner__pb2.SpawnResult.SerializeToString,
+            ),
+            'RegisterWarmPool': grpc.unary_unary_rpc_method_handler(
+                    servicer.RegisterWarmPool,
+                    request_deserializer=kubespawner__pb2.WarmPool.FromString,
+                    response_serializer=kubespawner__pb2.Status.SerializeToString,
+            ),
+            'ClaimWarmWorkspace': grpc.unary_unary_rpc_method_handler(
+                    servicer.ClaimWarmWorkspace,
+                    request_deserializer=kubespawner__pb2.WarmClaim.FromString,
+                    response_serializer=kubespawner__pb2.WarmClaimResult.SerializeToString,
+            ),
+            'GetImagePullCoverage': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetImagePullCoverage,
+                    request_deserializer=google_dot_protobuf_dot_empty__pb2.Empty.FromString,
+                    response_serializer=kubespawner__pb2.ImageCoverageList.SerializeToString,
+            ),
+            'RegisterPVCPool': grpc.unary_unary_rpc_method_handler(
+                    servicer.RegisterPVCPool,
+                    request_deserializer=kubespawner__pb2.PVCPool.FromString,
+                    response_serializer=kubespawner__pb2.Status.SerializeToString,
+            ),
+            'ClaimPVC': grpc.unary_unary_rpc_method_handler(
+                    servicer.ClaimPVC,
+                    request_deserializer=kubespawner__pb2.PVCClaim.FromString,
+                    response_serializer=kubespawner__pb2.PVCClaimResult.SerializeToString,
+            ),
+            'WatchStatusChanges': grpc.unary_stream_rpc_method_handler(
+                    servicer.WatchStatusChanges,
+                    request_deserializer=kubespawner__pb2.StatusWatch.FromString,
+                    response_serializer=kubespawner__pb2.Resource.SerializeToString,
+            ),
+            'GetResourceUsage': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetResourceUsage,
+                    request_deserializer=kubespawner__pb2.Resource.FromString,
+                    response_serializer=kubespawner__pb2.ResourceUsage.SerializeToString,
+            ),
+            'ScaleDeployments': grpc.unary_unary_rpc_method_handler(
+                    servicer.ScaleDeployments,
+                    request_deserializer=kubespawner__pb2.ScaleRequest.FromString,
+                    response_serializer=kubespawner__pb2.ScaleResponse.SerializeToString,
+            ),
+            'PatchResource': grpc.unary_unary_rpc_method_handler(
+                    servicer.PatchResource,
+                    request_deserializer=kubespawner__pb2.Patch.FromString,
+                    response_serializer=kubespawner__pb2.Status.SerializeToString,
+            ),
+            'UpdateDeployment': grpc.unary_stream_rpc_method_handler(
+                    servicer.UpdateDeployment,
+                    request_deserializer=kubespawner__pb2.DeploymentUpdate.FromString,
+                    response_serializer=kubespawner__pb2.RolloutProgress.SerializeToString,
+            ),
+            'GetTypedResourceStatus': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetTypedResourceStatus,
+                    request_deserializer=kubespawner__pb2.Resource.FromString,
+                    response_serializer=kubespawner__pb2.ResourceStatus.SerializeToString,
+            ),
+            'SubmitJobArray': grpc.unary_unary_rpc_method_handler(
+                    servicer.SubmitJobArray,
+                    request_deserializer=kubespawner__pb2.JobArray.FromString,
+                    response_serializer=kubespawner__pb2.JobArrayResult.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'kubespawner.KubeSpawnerServices', rpc_method_handlers)
@@ -532,3 +822,392 @@ class KubeSpawnerServices(object):
             kubespawner__pb2.Status.FromString,
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def StreamPodLogs(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(request, target, '/kubespawner.KubeSpawnerServices/StreamPodLogs',
+            kubespawner__pb2.PodLogRequest.SerializeToString,
+            kubespawner__pb2.LogChunk.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def GetResourceEvents(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/kubespawner.KubeSpawnerServices/GetResourceEvents',
+            kubespawner__pb2.Resource.SerializeToString,
+            kubespawner__pb2.EventList.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def WaitForReady(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/kubespawner.KubeSpawnerServices/WaitForReady',
+            kubespawner__pb2.Resource.SerializeToString,
+            google_dot_protobuf_dot_struct__pb2.Struct.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def WaitForCompletion(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/kubespawner.KubeSpawnerServices/WaitForCompletion',
+            kubespawner__pb2.Resource.SerializeToString,
+            google_dot_protobuf_dot_struct__pb2.Struct.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def SpawnWorkspace(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/kubespawner.KubeSpawnerServices/SpawnWorkspace',
+            kubespawner__pb2.Workspace.SerializeToString,
+            kubespawner__pb2.SpawnResult.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def RegisterWarmPool(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/kubespawner.KubeSpawnerServices/RegisterWarmPool',
+            kubespawner__pb2.WarmPool.SerializeToString,
+            kubespawner__pb2.Status.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def ClaimWarmWorkspace(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/kubespawner.KubeSpawnerServices/ClaimWarmWorkspace',
+            kubespawner__pb2.WarmClaim.SerializeToString,
+            kubespawner__pb2.WarmClaimResult.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def GetImagePullCoverage(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/kubespawner.KubeSpawnerServices/GetImagePullCoverage',
+            google_dot_protobuf_dot_empty__pb2.Empty.SerializeToString,
+            kubespawner__pb2.ImageCoverageList.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def RegisterPVCPool(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/kubespawner.KubeSpawnerServices/RegisterPVCPool',
+            kubespawner__pb2.PVCPool.SerializeToString,
+            kubespawner__pb2.Status.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def ClaimPVC(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/kubespawner.KubeSpawnerServices/ClaimPVC',
+            kubespawner__pb2.PVCClaim.SerializeToString,
+            kubespawner__pb2.PVCClaimResult.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def WatchStatusChanges(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(request, target, '/kubespawner.KubeSpawnerServices/WatchStatusChanges',
+            kubespawner__pb2.StatusWatch.SerializeToString,
+            kubespawner__pb2.Resource.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def GetResourceUsage(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/kubespawner.KubeSpawnerServices/GetResourceUsage',
+            kubespawner__pb2.Resource.SerializeToString,
+            kubespawner__pb2.ResourceUsage.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def ScaleDeployments(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/kubespawner.KubeSpawnerServices/ScaleDeployments',
+            kubespawner__pb2.ScaleRequest.SerializeToString,
+            kubespawner__pb2.ScaleResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def PatchResource(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/kubespawner.KubeSpawnerServices/PatchResource',
+            kubespawner__pb2.Patch.SerializeToString,
+            kubespawner__pb2.Status.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def UpdateDeployment(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(request, target, '/kubespawner.KubeSpawnerServices/UpdateDeployment',
+            kubespawner__pb2.DeploymentUpdate.SerializeToString,
+            kubespawner__pb2.RolloutProgress.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def GetTypedResourceStatus(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/kubespawner.KubeSpawnerServices/GetTypedResourceStatus',
+            kubespawner__pb2.Resource.SerializeToString,
+            kubespawner__pb2.ResourceStatus.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def SubmitJobArray(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/kubespawner.KubeSpawnerServices/SubmitJobArray',
+            kubespawner__pb2.JobArray.SerializeToString,
+            kubespawner__pb2.JobArrayResult.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+
+class KubeSpawnerAdminStub(object):
+    """Operations on a running replica, not meant for the clients of KubeSpawnerServices
+    """
+
+    def __init__(self, channel):
+        """Constructor.
+
+        Args:
+            channel: A grpc.Channel.
+        """
+        self.Profile = channel.unary_unary(
+                '/kubespawner.KubeSpawnerAdmin/Profile',
+                request_serializer=kubespawner__pb2.ProfileRequest.SerializeToString,
+                response_deserializer=kubespawner__pb2.ProfileResult.FromString,
+                )
+        self.Inspect = channel.unary_unary(
+                '/kubespawner.KubeSpawnerAdmin/Inspect',
+                request_serializer=google_dot_protobuf_dot_empty__pb2.Empty.SerializeToString,
+                response_deserializer=google_dot_protobuf_dot_struct__pb2.Struct.FromString,
+                )
+
+
+class KubeSpawnerAdminServicer(object):
+    """Operations on a running replica, not meant for the clients of KubeSpawnerServices
+    """
+
+    def Profile(self, request, context):
+        """Sample the stacks of the threads serving calls for some seconds
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def Inspect(self, request, context):
+        """Get the state of the replica: executors, calls in progress, connection pools,
+        caches, retries and memory
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+
+def add_KubeSpawnerAdminServicer_to_server(servicer, server):
+    rpc_method_handlers = {
+            'Profile': grpc.unary_unary_rpc_method_handler(
+                    servicer.Profile,
+                    request_deserializer=kubespawner__pb2.ProfileRequest.FromString,
+                    response_serializer=kubespawner__pb2.ProfileResult.SerializeToString,
+            ),
+            'Inspect': grpc.unary_unary_rpc_method_handler(
+                    servicer.Inspect,
+                    request_deserializer=google_dot_protobuf_dot_empty__pb2.Empty.FromString,
+                    response_serializer=google_dot_protobuf_dot_struct__pb2.Struct.SerializeToString,
+            ),
+    }
+    generic_handler = grpc.method_handlers_generic_handler(
+            'kubespawner.KubeSpawnerAdmin', rpc_method_handlers)
+    server.add_generic_rpc_handlers((generic_handler,))
+
+
+ # This class is part of an EXPERIMENTAL API.
+class KubeSpawnerAdmin(object):
+    """Operations on a running replica, not meant for the clients of KubeSpawnerServices
+    """
+
+    @staticmethod
+    def Profile(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/kubespawner.KubeSpawnerAdmin/Profile',
+            kubespawner__pb2.ProfileRequest.SerializeToString,
+            kubespawner__pb2.ProfileResult.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def Inspect(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/kubespawner.KubeSpawnerAdmin/Inspect',
+            google_dot_protobuf_dot_empty__pb2.Empty.SerializeToString,
+            google_dot_protobuf_dot_struct__pb2.Struct.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
@@ -0,0 +1,142 @@
+# encoding: utf-8
+#
+# Copyright (c) 2020-2021 Hopenly srl.
+#
+# This file is part of Ilyde.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import time
+import uuid
+
+from kubernetes import client
+
+from metrics import REGISTRY
+from resourcepool import Pool, PoolManager, STATE_LABEL, IDLE
+
+POOL_LABEL = "ilyde.io/pvc-pool"
+
+
+def pool_key(storage_class, size):
+    """label value identifying the pool of a storage class and size"""
+    return "{}-{}".format(storage_class, size).lower()
+
+
+def pvc_pool_of(pvc):
+    """index of the unclaimed pooled PVCs by pool"""
+    labels = pvc.metadata.labels or {}
+    if labels.get(STATE_LABEL) == IDLE and POOL_LABEL in labels:
+        return [labels[POOL_LABEL]]
+    return []
+
+
+def is_bound(pvc):
+    return pvc.status is not None and pvc.status.phase == "Bound"
+
+
+class PVCPool(Pool):
+    """Definition and counters of the pool of a storage class and size"""
+
+    metric_prefix = "pvcpool"
+
+    def __init__(self, namespace, storage_class, size, count, access_mode):
+        super(PVCPool, self).__init__(namespace, pool_key(storage_class, size))
+        self.storage_class = storage_class
+        self.size = size
+        self.count = count
+        self.access_mode = access_mode
+        self.key = self.name
+        self.depth = REGISTRY.gauge(self.metric("depth"))
+        self.provisioning = REGISTRY.gauge(self.metric("provisioning"))
+
+    def manifest(self, labels):
+        return {
+            "apiVersion": "v1",
+            "kind": "PersistentVolumeClaim",
+            "metadata": {
+                "name": "pool-{}-{}".format(self.key, uuid.uuid4().hex[:10]),
+                "labels": dict(labels, **{POOL_LABEL: self.key}),
+            },
+            "spec": {
+                "storageClassName": self.storage_class,
+                "accessModes": [self.access_mode],
+                "resources": {"requests": {"storage": self.size}},
+            },
+        }
+
+
+class PVCPoolManager(PoolManager):
+    """Keeps Bound, unclaimed PVCs per storage class and size, so that a workspace
+    does not wait for dynamic provisioning. A claim relabels one of them and
+    returns its name. Pools are replenished by a background thread.
+
+    Storage classes with volumeBindingMode WaitForFirstConsumer only bind once a
+    pod uses the claim: their pooled PVCs stay Pending and are handed out as is.
+    """
+
+    kind = "pvcs"
+    index = "pvc_pool"
+    indexer = staticmethod(pvc_pool_of)
+
+    def register(self, namespace, storage_class, size, count, access_mode="ReadWriteOnce"):
+        self._add(PVCPool(namespace, storage_class, size, count, access_mode))
+
+    def claim(self, namespace, storage_class, size, workspace):
+        """Hands out an unclaimed PVC of the pool, Bound ones first, or creates
+        one when the pool is empty.
+
+        Returns:
+            (name, hit)
+        Raises:
+            KeyError: no pool for storage_class and size
+        """
+        pool = self._get(namespace, pool_key(storage_class, size))
+        if pool is None:
+            raise KeyError("no PVC pool for {} {} in namespace {}".format(storage_class, size, namespace))
+
+        started = time.monotonic()
+        pvc, hit = self._claim(pool, workspace)
+        pool.claim_time.observe(time.monotonic() - started)
+        return pvc.metadata.name, hit
+
+    def _candidates(self, idle):
+        return sorted(idle, key=lambda pvc: not is_bound(pvc))
+
+    def _patch(self, namespace, name, body):
+        return client.CoreV1Api().patch_namespaced_persistent_volume_claim(name=name, namespace=namespace, body=body)
+
+    def _create(self, pool, labels):
+        return client.CoreV1Api().create_namespaced_persistent_volume_claim(
+            namespace=pool.namespace, body=pool.manifest(labels))
+
+    def refill(self, pool):
+        unclaimed = self._idle(pool)
+        bound = sum(1 for pvc in unclaimed if is_bound(pvc))
+        pool.depth.set(bound)
+        pool.provisioning.set(len(unclaimed) - bound + len(pool.pending))
+
+        for _ in range(min(pool.count - len(unclaimed) - len(pool.pending), self._max_creates)):
+            pool.add_pending(self._create(pool, {STATE_LABEL: IDLE}).metadata.name)
+
+    def snapshot(self):
+        return {
+            "{}/{}".format(pool.namespace, pool.key): {
+                "count": pool.count,
+                "depth": pool.depth.value,
+                "provisioning": pool.provisioning.value,
+                "hits": pool.hits.value,
+                "misses": pool.misses.value,
+                "conflicts": pool.conflicts.value,
+            }
+            for pool in self._all()
+        }
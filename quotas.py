@@ -0,0 +1,240 @@
+# encoding: utf-8
+#
+# Copyright (c) 2020-2021 Hopenly srl.
+#
+# This file is part of Ilyde.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import logging
+
+from kubernetes.utils import parse_quantity
+
+from metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+# object count resources of a quota by manifest kind
+COUNT_RESOURCES = {
+    "Deployment": ("count/deployments.apps",),
+    "Job": ("count/jobs.batch",),
+    "PersistentVolumeClaim": ("persistentvolumeclaims", "count/persistentvolumeclaims"),
+}
+# quota resources charged by a pod, name in the quota -> (requests or limits, resource)
+POD_RESOURCES = {
+    "cpu": ("requests", "cpu"),
+    "memory": ("requests", "memory"),
+    "ephemeral-storage": ("requests", "ephemeral-storage"),
+    "requests.cpu": ("requests", "cpu"),
+    "requests.memory": ("requests", "memory"),
+    "requests.ephemeral-storage": ("requests", "ephemeral-storage"),
+    "limits.cpu": ("limits", "cpu"),
+    "limits.memory": ("limits", "memory"),
+    "limits.ephemeral-storage": ("limits", "ephemeral-storage"),
+}
+_BINARY_UNITS = (("Ti", 2 ** 40), ("Gi", 2 ** 30), ("Mi", 2 ** 20), ("Ki", 2 ** 10))
+
+
+class QuotaExceeded(Exception):
+    """Raised when a manifest needs more than a ResourceQuota of its namespace has left"""
+
+
+class LimitRangeViolation(Exception):
+    """Raised when a manifest breaks a LimitRange of its namespace"""
+
+
+def format_quantity(resource, value):
+    if resource.endswith("cpu"):
+        return "{}m".format(int(value * 1000))
+    if resource.endswith("memory") or resource.endswith("storage"):
+        for unit, size in _BINARY_UNITS:
+            if value >= size:
+                return "{:g}{}".format(round(float(value) / size, 2), unit)
+    return "{:g}".format(float(value))
+
+
+def quantities(values):
+    """{resource: Decimal} of {resource: quantity}, unparsable quantities are left to the API server"""
+    result = {}
+    for resource, quantity in (values or {}).items():
+        try:
+            result[resource] = parse_quantity(quantity)
+        except ValueError:
+            continue
+    return result
+
+
+def container_resources(container, limit_ranges):
+    """(requests, limits) of a container of a manifest, with the defaults of
+    the LimitRanges applied as the API server does
+    """
+    resources = container.get("resources") or {}
+    limits = quantities(resources.get("limits"))
+    requests = quantities(resources.get("requests"))
+    for resource, value in limits.items():
+        requests.setdefault(resource, value)
+    for limit_range in limit_ranges:
+        for item in limit_range.spec.limits or []:
+            if item.type == "Container":
+                for resource, value in quantities(item.default).items():
+                    limits.setdefault(resource, value)
+                for resource, value in quantities(item.default_request).items():
+                    requests.setdefault(resource, value)
+    return requests, limits
+
+
+def pod_resources(pod_spec, limit_ranges):
+    """(requests, limits) of a pod: the sum of its containers, or its
+    largest init container when bigger
+    """
+    totals = ({}, {})
+    for container in pod_spec.get("containers") or []:
+        for total, values in zip(totals, container_resources(container, limit_ranges)):
+            for resource, value in values.items():
+                total[resource] = total.get(resource, 0) + value
+    for container in pod_spec.get("initContainers") or []:
+        for total, values in zip(totals, container_resources(container, limit_ranges)):
+            for resource, value in values.items():
+                total[resource] = max(total.get(resource, 0), value)
+    return totals
+
+
+def check_limits(kind, name, requests, limits, item):
+    """Raises LimitRangeViolation when requests and limits are out of the
+    min and max of a LimitRange item"""
+    for resource, maximum in quantities(item.max).items():
+        value = limits.get(resource)
+        if value is None:
+            raise LimitRangeViolation("{} {}: a {} limit is required, the maximum is {}".format(
+                kind, name, resource, format_quantity(resource, maximum)))
+        if value > maximum:
+            raise LimitRangeViolation("{} {}: {} limit {} is above the maximum of {}".format(
+                kind, name, resource, format_quantity(resource, value), format_quantity(resource, maximum)))
+    for resource, minimum in quantities(item.min).items():
+        value = requests.get(resource)
+        if value is None:
+            raise LimitRangeViolation("{} {}: a {} request is required, the minimum is {}".format(
+                kind, name, resource, format_quantity(resource, minimum)))
+        if value < minimum:
+            raise LimitRangeViolation("{} {}: {} request {} is below the minimum of {}".format(
+                kind, name, resource, format_quantity(resource, value), format_quantity(resource, minimum)))
+
+
+class QuotaChecker(object):
+    """Checks Deployments, Jobs and PVCs against the ResourceQuotas and
+    LimitRanges of their namespace before they are sent, from watch caches.
+
+    Only what the API server would certainly refuse is reported: a pod
+    that cannot start even once, an object over its count, a limit out of
+    range. Quotas with scopes are skipped and usage is the one last
+    reported by the quota controller. While the caches of a namespace are
+    loading, or cannot be loaded, manifests are let through.
+    """
+
+    def __init__(self, informers):
+        self._informers = informers
+        self.checks = REGISTRY.counter("quota.checks")
+        self.rejections = REGISTRY.counter("quota.rejections")
+        self.skipped = REGISTRY.counter("quota.skipped")
+
+    def check(self, namespace, manifest, count=1, pods=1):
+        """
+        Args:
+            count: copies of manifest created at once, e.g. the jobs of an array
+            pods: pods each copy runs at once, their sum must fit at once
+        Raises:
+            QuotaExceeded: a ResourceQuota of the namespace has not enough left
+            LimitRangeViolation: a LimitRange of the namespace refuses the manifest
+        """
+        kind = manifest.get("kind") if isinstance(manifest, dict) else None
+        if kind not in COUNT_RESOURCES:
+            return
+        quotas = self._cached("resourcequotas", namespace)
+        limit_ranges = self._cached("limitranges", namespace)
+        if quotas is None or limit_ranges is None:
+            self.skipped.inc()
+            return
+        if not quotas and not limit_ranges:
+            return
+
+        self.checks.inc()
+        name = (manifest.get("metadata") or {}).get("name") or (manifest.get("metadata") or {}).get("generateName", "")
+        try:
+            demand = {resource: count for resource in COUNT_RESOURCES[kind]}
+            if kind == "PersistentVolumeClaim":
+                storage = quantities(((manifest.get("spec") or {}).get("resources") or {}).get("requests"))
+                for limit_range in limit_ranges:
+                    for item in limit_range.spec.limits or []:
+                        if item.type == "PersistentVolumeClaim":
+                            check_limits(kind, name, storage, storage, item)
+                if "storage" in storage:
+                    demand["requests.storage"] = storage["storage"] * count
+                self._check_quotas(namespace, kind, name, quotas, demand)
+            else:
+                self._check_quotas(namespace, kind, name, quotas, demand)
+                pod_spec = (((manifest.get("spec") or {}).get("template") or {}).get("spec")) or {}
+                self._check_pod(namespace, kind, name, pod_spec, quotas, limit_ranges, count * pods)
+        except (QuotaExceeded, LimitRangeViolation) as e:
+            self.rejections.inc()
+            logger.info("%s refused before creation: %s", kind, e)
+            raise
+
+    def _cached(self, kind, namespace):
+        informer = self._informers.get(kind, namespace, wait=False)
+        if not informer.synced:
+            return None
+        return informer.list()
+
+    def _check_pod(self, namespace, kind, name, pod_spec, quotas, limit_ranges, pods=1):
+        for container in (pod_spec.get("initContainers") or []) + (pod_spec.get("containers") or []):
+            requests, limits = container_resources(container, limit_ranges)
+            for limit_range in limit_ranges:
+                for item in limit_range.spec.limits or []:
+                    if item.type == "Container":
+                        check_limits(kind, "{} container {}".format(name, container.get("name")), requests, limits,
+                                     item)
+        requests, limits = pod_resources(pod_spec, limit_ranges)
+        for limit_range in limit_ranges:
+            for item in limit_range.spec.limits or []:
+                if item.type == "Pod":
+                    check_limits(kind, "{} pod".format(name), requests, limits, item)
+
+        demand = {"pods": pods, "count/pods": pods}
+        for quota_resource, (source, resource) in POD_RESOURCES.items():
+            values = requests if source == "requests" else limits
+            if resource in values:
+                demand[quota_resource] = values[resource] * pods
+            elif any(quota_resource in self._hard(quota) for quota in quotas):
+                raise QuotaExceeded("{} {}: a quota of namespace {} limits {}, the pods must set it".format(
+                    kind, name, namespace, quota_resource))
+        self._check_quotas(namespace, kind, name, quotas, demand,
+                           what="a single pod" if pods == 1 else "{} pods".format(pods))
+
+    @staticmethod
+    def _hard(quota):
+        if quota.spec is not None and (quota.spec.scopes or quota.spec.scope_selector):
+            return {}
+        return quantities((quota.status and quota.status.hard) or (quota.spec and quota.spec.hard))
+
+    def _check_quotas(self, namespace, kind, name, quotas, demand, what=None):
+        for quota in quotas:
+            hard = self._hard(quota)
+            used = quantities(quota.status.used if quota.status else None)
+            for resource, value in demand.items():
+                if resource not in hard:
+                    continue
+                left = hard[resource] - used.get(resource, 0)
+                if value > left:
+                    raise QuotaExceeded("{} {}: {} needs {} {}, quota {} of namespace {} has {} of {} left".format(
+                        kind, name, what or "it", format_quantity(resource, value), resource, quota.metadata.name,
+                        namespace, format_quantity(resource, max(left, 0)), format_quantity(resource, hard[resource])))
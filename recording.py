@@ -0,0 +1,202 @@
+# encoding: utf-8
+#
+# Copyright (c) 2020-2021 Hopenly srl.
+#
+# This file is part of Ilyde.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import collections
+import logging
+import os
+import queue
+import struct
+import threading
+import time
+from typing import Callable, Any
+
+import grpc
+from google.protobuf.message import Message
+from grpc_interceptor import ServerInterceptor
+
+from metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"KSREC1\n"
+# started (epoch seconds), duration (seconds), status code, flags,
+# length of the method name, length of the request
+HEADER = struct.Struct("<dfBBHI")
+STREAMING = 1
+
+Record = collections.namedtuple("Record", ["started", "seconds", "code", "streaming", "method", "request"])
+
+_CODES = {code.value[0]: code for code in grpc.StatusCode}
+
+
+def encode(record):
+    method = record.method.encode()
+    flags = STREAMING if record.streaming else 0
+    return HEADER.pack(record.started, record.seconds, record.code.value[0], flags, len(method),
+                       len(record.request)) + method + record.request
+
+
+def read_records(path):
+    """Yields the Records of a recording, in the order they ended"""
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError("{} is not a recording".format(path))
+        while True:
+            header = f.read(HEADER.size)
+            if len(header) < HEADER.size:
+                # end of file, or a record cut by a crash
+                return
+            started, seconds, code, flags, method_size, request_size = HEADER.unpack(header)
+            method = f.read(method_size)
+            request = f.read(request_size)
+            if len(request) < request_size:
+                return
+            yield Record(started, seconds, _CODES.get(code, grpc.StatusCode.UNKNOWN), bool(flags & STREAMING),
+                         method.decode(), request)
+
+
+class RecordWriter(object):
+    """Appends Records to a file from a writer thread. When the queue is
+    full the record is dropped instead of blocking the request.
+    """
+
+    def __init__(self, path, queue_size=10000):
+        self._path = path
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = None
+        self._lock = threading.Lock()
+        self.written = REGISTRY.counter("recording.written")
+        self.dropped = REGISTRY.counter("recording.dropped")
+
+    def write(self, record):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="recording-writer", daemon=True)
+                self._thread.start()
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped.inc()
+
+    def _run(self):
+        with open(self._path, "ab") as f:
+            if f.tell() == 0:
+                f.write(MAGIC)
+            while True:
+                record = self._queue.get()
+                if record is None:
+                    f.flush()
+                    return
+                try:
+                    f.write(encode(record))
+                    self.written.inc()
+                except Exception as e:
+                    logger.error("cannot record a call to %s: %s", record.method, e)
+                if self._queue.empty():
+                    f.flush()
+
+    def close(self):
+        """Writes the queued records and stops the writer"""
+        with self._lock:
+            thread = self._thread
+        if thread is not None:
+            self._queue.put(None)
+            thread.join()
+
+
+class _RecordingContext(object):
+    """Delegates to the servicer context and keeps the status code set on it"""
+
+    def __init__(self, context):
+        self._context = context
+        self.code = None
+
+    def set_code(self, code):
+        self.code = code
+        self._context.set_code(code)
+
+    def abort(self, code, details):
+        self.code = code
+        self._context.abort(code, details)
+
+    def __getattr__(self, name):
+        return getattr(self._context, name)
+
+
+class RecordingInterceptor(ServerInterceptor):
+    """Records the method, the serialized request, the duration and the status
+    code of each call. Streaming calls are recorded when the stream ends.
+    Must come first in the interceptors so that the time spent waiting for an
+    executor is recorded.
+    """
+
+    def __init__(self, writer):
+        self._writer = writer
+
+    def intercept(
+        self,
+        method: Callable,
+        request: Any,
+        context: grpc.ServicerContext,
+        method_name: str,
+    ) -> Any:
+        started = time.time()
+        begin = time.monotonic()
+        request_bytes = request.SerializeToString()
+        recording = _RecordingContext(context)
+
+        def record(code, streaming):
+            self._writer.write(Record(started, time.monotonic() - begin, code, streaming, method_name,
+                                      request_bytes))
+
+        try:
+            result = method(request, recording)
+        except Exception:
+            record(recording.code or grpc.StatusCode.UNKNOWN, False)
+            raise
+        if result is None or isinstance(result, Message):
+            record(recording.code or grpc.StatusCode.OK, False)
+            return result
+        return self._stream(result, recording, record)
+
+    @staticmethod
+    def _stream(iterator, recording, record):
+        code = None
+        try:
+            for response in iterator:
+                yield response
+        except Exception:
+            code = grpc.StatusCode.UNKNOWN
+            raise
+        except GeneratorExit:
+            # the client cancelled the stream
+            code = grpc.StatusCode.CANCELLED
+            raise
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+            record(recording.code or code or grpc.StatusCode.OK, True)
+
+
+def recording_interceptors(path):
+    """[RecordingInterceptor] writing to path, or no interceptor for an empty path"""
+    if not path:
+        return []
+    logger.info("recording the calls to %s", os.path.abspath(path))
+    return [RecordingInterceptor(RecordWriter(path))]
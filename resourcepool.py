@@ -0,0 +1,187 @@
+# encoding: utf-8
+#
+# Copyright (c) 2020-2021 Hopenly srl.
+#
+# This file is part of Ilyde.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import logging
+import threading
+import time
+
+from kubernetes.client.rest import ApiException
+
+from metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+# labels of the pooled objects
+STATE_LABEL = "ilyde.io/warm-state"
+WORKSPACE_LABEL = "ilyde.io/workspace"
+
+IDLE = "idle"
+CLAIMED = "claimed"
+
+HTTP_CONFLICT = 409
+
+# seconds after which a created object the watch has not reported is
+# forgotten: it was deleted before the watch saw it
+PENDING_TIMEOUT = 300
+
+
+class Pool(object):
+    """Definition and counters of a pool, name is unique in its namespace"""
+
+    metric_prefix = "pool"
+
+    def __init__(self, namespace, name):
+        self.namespace = namespace
+        self.name = name
+        # created objects the watch has not reported yet, name -> creation time
+        self.pending = {}
+        self.hits = REGISTRY.counter(self.metric("hits"))
+        self.misses = REGISTRY.counter(self.metric("misses"))
+        # claims lost to another replica, retried with the next idle object
+        self.conflicts = REGISTRY.counter(self.metric("conflicts"))
+        self.claim_time = REGISTRY.summary(self.metric("claim_seconds"))
+
+    def add_pending(self, name):
+        self.pending[name] = time.monotonic()
+
+    def metric(self, name):
+        """name of a metric of the pool, pools are named per namespace"""
+        return "{}.{}.{}.{}".format(self.metric_prefix, self.namespace, self.name, name)
+
+
+class PoolManager(object):
+    """Claims and refills of pools of idle objects found through the shared
+    watch of their kind: a claim relabels an idle object with the resource
+    version the watch reported, so only one replica of the server gets it,
+    and a background thread refills the pools.
+
+    Subclasses set kind, index and indexer, the informer index of the idle
+    objects by pool name, and implement _patch, _create and refill.
+    """
+
+    kind = None
+    index = None
+    indexer = None
+
+    def __init__(self, informers, interval=10, max_creates=5):
+        """
+        Args:
+            informers: watches.InformerFactory
+            interval: seconds between two refills
+            max_creates: objects created per pool and refill, limits bursts
+        """
+        self._informers = informers
+        informers.add_indexer(self.kind, self.index, self.indexer)
+        self._interval = interval
+        self._max_creates = max_creates
+        self._lock = threading.Lock()
+        self._pools = {}
+        # claimed objects the watch may still report as idle
+        self._claimed = set()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def _add(self, pool):
+        with self._lock:
+            self._pools[(pool.namespace, pool.name)] = pool
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="{}-pools".format(self.kind), daemon=True)
+                self._thread.start()
+        self._wakeup.set()
+
+    def _get(self, namespace, name):
+        with self._lock:
+            return self._pools.get((namespace, name))
+
+    def _all(self):
+        with self._lock:
+            return list(self._pools.values())
+
+    def _claim(self, pool, workspace):
+        """Claims an idle object of the pool, or creates one when there is none.
+
+        Returns:
+            (object, hit)
+        """
+        labels = {STATE_LABEL: CLAIMED, WORKSPACE_LABEL: workspace}
+        obj = self._claim_idle(pool, labels)
+        hit = obj is not None
+        if hit:
+            pool.hits.inc()
+        else:
+            pool.misses.inc()
+            obj = self._create(pool, labels)
+        self._wakeup.set()
+        return obj, hit
+
+    def _candidates(self, idle):
+        """idle objects in the order they are claimed, the ready ones only"""
+        return idle
+
+    def _claim_idle(self, pool, labels):
+        informer = self._informers.get(self.kind, pool.namespace)
+        for obj in self._candidates(informer.by_index(self.index, pool.name)):
+            name = obj.metadata.name
+            with self._lock:
+                if name in self._claimed:
+                    continue
+                self._claimed.add(name)
+            try:
+                # the resource version makes the claim fail if another
+                # replica of the server claimed it first
+                return self._patch(pool.namespace, name, {
+                    "metadata": {"labels": labels, "resourceVersion": obj.metadata.resource_version}})
+            except ApiException as e:
+                if e.status != HTTP_CONFLICT:
+                    with self._lock:
+                        self._claimed.discard(name)
+                    raise
+                pool.conflicts.inc()
+        return None
+
+    def _idle(self, pool):
+        """idle objects of the pool the watch reports and no claim of this
+        replica took, forgets the pending objects the watch reported or
+        that expired"""
+        informer = self._informers.get(self.kind, pool.namespace)
+        idle = informer.by_index(self.index, pool.name)
+        expired = time.monotonic() - PENDING_TIMEOUT
+        pool.pending = {name: created for name, created in pool.pending.items()
+                        if informer.get(name) is None and created > expired}
+        with self._lock:
+            self._claimed.intersection_update(obj.metadata.name for obj in idle)
+            return [obj for obj in idle if obj.metadata.name not in self._claimed]
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self._interval)
+            self._wakeup.clear()
+            for pool in self._all():
+                try:
+                    self.refill(pool)
+                except Exception as e:
+                    logger.error("refill of %s pool %s/%s failed: %s", self.kind, pool.namespace, pool.name, e)
+
+    def _patch(self, namespace, name, body):
+        raise NotImplementedError
+
+    def _create(self, pool, labels):
+        raise NotImplementedError
+
+    def refill(self, pool):
+        raise NotImplementedError
@@ -18,11 +18,14 @@
 #
 from typing import Callable
 from enum import Enum
+from datetime import timezone
 
-from marshmallow import Schema, fields
+from marshmallow import Schema, fields, validate
 from google.protobuf import json_format
 from marshmallow_enum import EnumField
 
+DNS_LABEL = r"^[a-z0-9]([-a-z0-9]{0,40}[a-z0-9])?$"
+
 
 def protobuf_to_dict(message):
     return json_format.MessageToDict(
@@ -60,6 +63,100 @@ class ResourceSerializer(Schema):
     type = EnumField(ResourceType, required=True)
 
 
+class PodLogSerializer(Schema):
+    namespace = fields.Str(required=True)
+    name = fields.Str(required=True)
+    container = fields.Str()
+    tail_lines = fields.Integer(validate=validate.Range(min=0))
+    since_seconds = fields.Integer(validate=validate.Range(min=0))
+    since_time = fields.AwareDateTime(default_timezone=timezone.utc)
+    timestamps = fields.Boolean()
+
+
+class WorkspaceSerializer(Schema):
+    namespace = fields.Str(required=True)
+    deployment = fields.Str(required=True)
+    service = fields.Str()
+    ingress = fields.Str()
+    pvc = fields.Str()
+
+
+class WarmPoolSerializer(Schema):
+    namespace = fields.Str(required=True)
+    profile = fields.Str(required=True, validate=validate.Regexp(DNS_LABEL))
+    deployment = fields.Str(required=True)
+    size = fields.Integer(required=True)
+    min_size = fields.Integer(missing=0)
+    idle_timeout = fields.Integer()
+
+
+class WarmClaimSerializer(Schema):
+    namespace = fields.Str(required=True)
+    profile = fields.Str(required=True)
+    workspace = fields.Str(required=True, validate=validate.Regexp(DNS_LABEL))
+    service = fields.Str()
+    ingress = fields.Str()
+
+
+class PVCPoolSerializer(Schema):
+    namespace = fields.Str(required=True)
+    storage_class = fields.Str(required=True)
+    size = fields.Str(required=True)
+    count = fields.Integer(required=True)
+    access_mode = fields.Str(missing="ReadWriteOnce", validate=validate.OneOf(
+        ["ReadWriteOnce", "ReadOnlyMany", "ReadWriteMany"]))
+
+
+class PVCClaimSerializer(Schema):
+    namespace = fields.Str(required=True)
+    storage_class = fields.Str(required=True)
+    size = fields.Str(required=True)
+    workspace = fields.Str(required=True, validate=validate.Regexp(DNS_LABEL))
+
+
+class StatusWatchSerializer(Schema):
+    namespace = fields.Str(required=True)
+
+
+class PatchSerializer(Schema):
+    namespace = fields.Str(required=True)
+    name = fields.Str(required=True)
+    type = EnumField(ResourceType, required=True)
+    patch_type = fields.Str(missing="strategic", validate=validate.OneOf(["strategic", "merge", "json"]))
+    content = fields.Str(required=True)
+
+
+class DeploymentUpdateSerializer(Schema):
+    namespace = fields.Str(required=True)
+    name = fields.Str(required=True)
+    patch_type = fields.Str(missing="strategic", validate=validate.OneOf(["strategic", "merge", "json"]))
+    content = fields.Str(required=True)
+
+
+class ScaleItemSerializer(Schema):
+    namespace = fields.Str(required=True)
+    name = fields.Str(required=True)
+    replicas = fields.Integer(missing=0, validate=validate.Range(min=0))
+
+
+class ScaleSerializer(Schema):
+    items = fields.List(fields.Nested(ScaleItemSerializer), required=True)
+
+
+class JobArraySerializer(Schema):
+    namespace = fields.Str(required=True)
+    template = fields.Str(required=True)
+    parameters = fields.List(fields.Dict(), required=True, validate=validate.Length(min=1))
+    mode = fields.Str(missing="jobs", validate=validate.OneOf(["jobs", "indexed"]))
+    parallelism = fields.Integer(missing=0)
+
+
+class ProfileSerializer(Schema):
+    seconds = fields.Integer(missing=10, validate=validate.Range(min=1))
+    format = fields.Str(missing="collapsed", validate=validate.OneOf(["collapsed", "pstats"]))
+    all_threads = fields.Boolean(missing=False)
+
+
 class OperationStatusSerializer(Schema):
     status = fields.Integer()
     message = fields.Str()
@@ -16,24 +16,58 @@
 # limitations under the License.
 #
 import logging
+import os
+import threading
+import time
 from concurrent import futures
+from datetime import datetime, timezone
 
 import yaml
+from dateutil.parser import isoparse
 import grpc
-from grpc_health.v1 import health, health_pb2_grpc
+from grpc_health.v1 import health, health_pb2, health_pb2_grpc
+from grpc_reflection.v1alpha import reflection
 
 from protos import kubespawner_pb2, kubespawner_pb2_grpc
 from kubernetes import client, config
-from interceptors import ExceptionToStatusInterceptor
+from kubernetes.client.rest import ApiException
+from interceptors import ExceptionToStatusInterceptor, ExecutorRoutingInterceptor
+from executors import ExecutorRouter
+from watches import default_factory, pod_owners, NotSynced
+from workspaces import WorkspaceSpawner, SpawnError, error_message
+from warmpool import WarmPoolManager
+from prepull import ImageTracker, PrePuller
+from pvcpool import PVCPoolManager
+from discovery import Discovery
+from usage import UsagePoller, NotPolled
+from patches import Patcher
+from healthcheck import HealthProber
+from quotas import QuotaChecker, QuotaExceeded, LimitRangeViolation
+from ingressroutes import IngressRouteAggregator, AggregateFull, HTTP_NOT_FOUND
+from jobarrays import load_template, array_jobs, indexed_job
+from recording import recording_interceptors
+from admin import KubeSpawnerAdminServicer
 from serializers import protobuf_to_dict, ResourceType, FileSerializer, ServiceSerializer,\
-    ResourceSerializer
+    ResourceSerializer, PodLogSerializer, WorkspaceSerializer, WarmPoolSerializer, WarmClaimSerializer,\
+    PVCPoolSerializer, PVCClaimSerializer, StatusWatchSerializer, ScaleSerializer,\
+    PatchSerializer, DeploymentUpdateSerializer, JobArraySerializer
 from google.protobuf.struct_pb2 import Struct
-from config import CLUSTER_ENVIRONMENT
+from google.protobuf.timestamp_pb2 import Timestamp
+from config import CLUSTER_ENVIRONMENT, EXECUTOR_POOLS, DIRECT_RPC_WORKERS, LOG_CHUNK_SIZE, WATCH_TIMEOUT, WATCH_SYNC_TIMEOUT,\
+    WATCH_IDLE_TIMEOUT, WAIT_MAX_SECONDS, WAIT_DEADLINE_MARGIN, SPAWN_WORKERS, WARM_POOL_INTERVAL,\
+    WARM_POOL_MAX_CREATES, WARM_POOL_IDLE_TIMEOUT, PREPULL_ENABLED, PREPULL_NAMESPACE, PREPULL_NAME, PREPULL_TOP_K,\
+    PREPULL_INTERVAL, PREPULL_HELPER_IMAGE, PVC_POOL_INTERVAL, PVC_POOL_MAX_CREATES, DISCOVERY_INTERVAL,\
+    HEALTH_INTERVAL, HEALTH_TIMEOUT, HEALTH_MAX_LATENCY, HEALTH_MAX_ERROR_RATE, HEALTH_WINDOW, HEALTH_SATURATION,\
+    LOG_LEVEL, LOG_LEVELS, LOG_FORMAT, LOG_QUEUE_SIZE, LOG_RATE_BURST, LOG_RATE_INTERVAL, USAGE_INTERVAL,\
+    USAGE_HISTORY, USAGE_IDLE_TIMEOUT, SCALE_WORKERS, RECORD_PATH, PROFILE_MAX_SECONDS, PROFILE_INTERVAL,\
+    QUOTA_PRECHECK, INGRESS_AGGREGATE, INGRESS_SHARDS, INGRESS_DEBOUNCE, INGRESS_MAX_MEMBERS,\
+    JOB_ARRAY_WORKERS, JOB_ARRAY_MAX_ITEMS,\
+    LISTEN_ADDRESSES
+from logsetup import setup_logging
 
 
 # setup logger
-FORMAT = '%(asctime)s %(levelname)s %(message)s'
-logging.basicConfig(level=logging.NOTSET, format=FORMAT)
+setup_logging(LOG_LEVEL, LOG_LEVELS, LOG_FORMAT, LOG_QUEUE_SIZE, LOG_RATE_BURST, LOG_RATE_INTERVAL)
 logger = logging.getLogger(__name__)
 
 
@@ -49,8 +83,51 @@ class KubeSpawnerServicer(kubespawner_pb2_grpc.KubeSpawnerServicesServicer):
         else:
             config.load_kube_config()
 
+        # API versions of the CronJobs and IngressRoutes served by the cluster
+        self.discovery = Discovery(interval=DISCOVERY_INTERVAL)
+        self.discovery.start()
+        # pods and events are read from watches shared by all the requests
+        self.informers = default_factory(WATCH_TIMEOUT, WATCH_SYNC_TIMEOUT, WATCH_IDLE_TIMEOUT)
+        self.spawner = WorkspaceSpawner(futures.ThreadPoolExecutor(
+            max_workers=SPAWN_WORKERS, thread_name_prefix="kubespawner-spawn"), self.discovery)
+        self.patcher = Patcher(self.discovery)
+        self.scaler = futures.ThreadPoolExecutor(max_workers=SCALE_WORKERS, thread_name_prefix="kubespawner-scale")
+        self.job_submitter = futures.ThreadPoolExecutor(
+            max_workers=JOB_ARRAY_WORKERS, thread_name_prefix="kubespawner-jobs")
+        # shared by the threads of each pool, with a connection for each
+        self.scale_api = client.AppsV1Api(pooled_api_client(SCALE_WORKERS))
+        self.job_api = client.BatchV1Api(pooled_api_client(JOB_ARRAY_WORKERS))
+        # images used by the spawned resources, pre-pulled on every node
+        self.images = ImageTracker()
+        self.prepuller = PrePuller(self.images, PREPULL_NAMESPACE, PREPULL_NAME, PREPULL_TOP_K,
+                                   PREPULL_HELPER_IMAGE, PREPULL_INTERVAL, enabled=PREPULL_ENABLED)
+        self.prepuller.start()
+        self.warm_pools = WarmPoolManager(self.informers, self.spawner, deployment_ready,
+                                          WARM_POOL_INTERVAL, WARM_POOL_MAX_CREATES)
+        self.pvc_pools = PVCPoolManager(self.informers, PVC_POOL_INTERVAL, PVC_POOL_MAX_CREATES)
+        # CPU and memory of the deployments and jobs, from metrics.k8s.io
+        self.usage = UsagePoller(self.informers, USAGE_INTERVAL, USAGE_HISTORY, USAGE_IDLE_TIMEOUT)
+        # manifests the quotas of their namespace refuse are not sent
+        self.quotas = QuotaChecker(self.informers) if QUOTA_PRECHECK else None
+        # routes of the ingresses kept in a few shared IngressRoutes
+        self.ingress_routes = IngressRouteAggregator(
+            self.discovery, INGRESS_SHARDS, INGRESS_DEBOUNCE,
+            max_members=INGRESS_MAX_MEMBERS) if INGRESS_AGGREGATE else None
+
         super(KubeSpawnerServicer).__init__()
 
+    def _precheck(self, namespace, manifest, context, count=1, pods=1):
+        """Aborts the call when a ResourceQuota or LimitRange of the namespace refuses
+        count copies of manifest, each running pods pods at once"""
+        if self.quotas is None:
+            return
+        try:
+            self.quotas.check(namespace, manifest, count, pods)
+        except QuotaExceeded as e:
+            context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, str(e))
+        except LimitRangeViolation as e:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+
     def CreateDeploymentFromFile(self, request, context):
         """creates deployment from file definitions yaml
         """
@@ -60,12 +137,14 @@ class KubeSpawnerServicer(kubespawner_pb2_grpc.KubeSpawnerServicesServicer):
         namespace = data['namespace']
 
         deployment = yaml.safe_load(file)
+        self._precheck(namespace, deployment, context)
         api_client = client.AppsV1Api()
 
         api_client.create_namespaced_deployment(
             body=deployment,
             namespace=namespace
         )
+        self.images.record(deployment)
 
         return kubespawner_pb2.Status(
             status=200,
@@ -83,11 +162,23 @@ class KubeSpawnerServicer(kubespawner_pb2_grpc.KubeSpawnerServicesServicer):
         namespace = data['namespace']
 
         ingress = yaml.safe_load(file)
+        if self.ingress_routes is not None:
+            try:
+                self.ingress_routes.add(namespace, ingress)
+                return kubespawner_pb2.Status(
+                    status=200,
+                    message="Ingress successfully created"
+                )
+            except AggregateFull as e:
+                # the ingress gets an IngressRoute of its own
+                logger.warning(str(e))
+
+        group, version = self.discovery.route("ingressroutes", ingress)
         api_client = client.CustomObjectsApi()
         # create the resource
         api_client.create_namespaced_custom_object(
-            group="traefik.containo.us",
-            version="v1alpha1",
+            group=group,
+            version=version,
             namespace=namespace,
             plural="ingressroutes",
             body=ingress,
@@ -228,16 +319,30 @@ class KubeSpawnerServicer(kubespawner_pb2_grpc.KubeSpawnerServicesServicer):
                 message="It is not an ingress resource"
             )
 
+        if self.ingress_routes is not None and self.ingress_routes.remove(namespace, name, lookup=False):
+            return kubespawner_pb2.Status(
+                status=200,
+                message="Ingress successfully deleted"
+            )
+
+        # ingresses created before the aggregation are objects of their own,
+        # the aggregates are only searched for the ones another replica added
+        group, version = self.discovery.route("ingressroutes")
         api_instance = client.CustomObjectsApi()
-        api_instance.delete_namespaced_custom_object(
-            name=name,
-            group="traefik.containo.us",
-            version="v1alpha1",
-            namespace=namespace,
-            plural="ingressroutes",
-            body=client.V1DeleteOptions(
-                propagation_policy='Foreground',
-                grace_period_seconds=5))
+        try:
+            api_instance.delete_namespaced_custom_object(
+                name=name,
+                group=group,
+                version=version,
+                namespace=namespace,
+                plural="ingressroutes",
+                body=client.V1DeleteOptions(
+                    propagation_policy='Foreground',
+                    grace_period_seconds=5))
+        except ApiException as e:
+            if e.status != HTTP_NOT_FOUND or self.ingress_routes is None \
+                    or not self.ingress_routes.remove(namespace, name):
+                raise
 
         return kubespawner_pb2.Status(
             status=200,
@@ -259,14 +364,7 @@ class KubeSpawnerServicer(kubespawner_pb2_grpc.KubeSpawnerServicesServicer):
                 name=name,
                 namespace=namespace
             )
-            response = response.status
-            payload = {
-                "available_replicas": response.available_replicas,
-                "collision_count": response.collision_count,
-                "replicas": response.replicas,
-                "unavailable_replicas": response.unavailable_replicas,
-                "updated_replicas": response.updated_replicas
-            }
+            payload = deployment_status(response)
 
         elif resource_type is ResourceType.JOB:
             api_instance = client.BatchV1Api()
@@ -274,41 +372,22 @@ class KubeSpawnerServicer(kubespawner_pb2_grpc.KubeSpawnerServicesServicer):
                 name=name,
                 namespace=namespace
             )
-            response = response.status
-            start_time = response.start_time.strftime("%Y-%m-%dT%H:%M:%S") if response.start_time else ""
-            completion_time = response.completion_time.strftime("%Y-%m-%dT%H:%M:%S") if response.completion_time else ""
-            # extract completion time
-            conditions = response.conditions
-            if conditions is None:
-                conditions = []
-
-            for condition in conditions:
-                if condition.type == "Failed":
-                    completion_time = condition.last_transition_time.strftime("%Y-%m-%dT%H:%M:%S")
-
-            payload = {
-                "active": response.active,
-                "completion_time": completion_time,
-                "failed": response.failed,
-                "start_time": start_time,
-                "succeeded": response.succeeded
-            }
+            payload = job_status(response)
 
         elif resource_type is ResourceType.CRONJOB:
-            api_instance = client.BatchV1beta1Api()
-            response = api_instance.read_namespaced_cron_job(
-                name=name,
-                namespace=namespace
-            )
-            last_schedule_time = response.last_schedule_time.strftime("%Y-%m-%dT%H:%M:%S")\
-                if response.last_schedule_time else ""
-
-            response = response.status
-            active = response.active if response.active else []
-            payload = {
-                "active": len(active),
-                "last_schedule_time": last_schedule_time,
-            }
+            payload = cronjob_status(self._read_cronjob(namespace, name))
+        elif resource_type is ResourceType.POD:
+            # name is either a pod or the Deployment / Job owning the pods
+            pods = self._informer("pods", namespace, context)
+            pod = pods.get(name)
+            if pod is not None:
+                payload = pod_status(pod)
+            else:
+                owned = pods.by_index("owner", ("Deployment", name)) + pods.by_index("owner", ("Job", name))
+                if owned:
+                    payload = {"pods": [pod_status(pod) for pod in owned]}
+                else:
+                    payload = {"Error": "Pod not found"}
         else:
             payload = {"Error": "Invalid resource requested"}
 
@@ -326,11 +405,13 @@ class KubeSpawnerServicer(kubespawner_pb2_grpc.KubeSpawnerServicesServicer):
         namespace = data['namespace']
 
         job = yaml.safe_load(file)
+        self._precheck(namespace, job, context)
         api_instance = client.BatchV1Api()
         response = api_instance.create_namespaced_job(
             body=job,
             namespace=namespace
         )
+        self.images.record(job)
 
         return kubespawner_pb2.Status(
             status=200,
@@ -346,11 +427,16 @@ class KubeSpawnerServicer(kubespawner_pb2_grpc.KubeSpawnerServicesServicer):
         namespace = data['namespace']
 
         job = yaml.safe_load(file)
-        api_instance = client.BatchV1beta1Api()
-        api_instance.create_namespaced_cron_job(
-            body=job,
-            namespace=namespace
+        group, version = self.discovery.route("cronjobs", job)
+        api_instance = client.CustomObjectsApi()
+        api_instance.create_namespaced_custom_object(
+            group=group,
+            version=version,
+            namespace=namespace,
+            plural="cronjobs",
+            body=job
         )
+        self.images.record(job)
 
         return kubespawner_pb2.Status(
             status=200,
@@ -366,6 +452,7 @@ class KubeSpawnerServicer(kubespawner_pb2_grpc.KubeSpawnerServicesServicer):
         namespace = data['namespace']
 
         pvc = yaml.safe_load(file)
+        self._precheck(namespace, pvc, context)
         api_instance = client.CoreV1Api()
         api_instance.create_namespaced_persistent_volume_claim(
             body=pvc,
@@ -420,8 +507,12 @@ class KubeSpawnerServicer(kubespawner_pb2_grpc.KubeSpawnerServicesServicer):
                 message="It is not a cronjob resource"
             )
 
-        api_instance = client.BatchV1beta1Api()
-        api_instance.delete_namespaced_cron_job(
+        group, version = self.discovery.route("cronjobs")
+        api_instance = client.CustomObjectsApi()
+        api_instance.delete_namespaced_custom_object(
+            group=group,
+            version=version,
+            plural="cronjobs",
             name=name,
             namespace=namespace,
             body=client.V1DeleteOptions(
@@ -461,24 +552,873 @@ class KubeSpawnerServicer(kubespawner_pb2_grpc.KubeSpawnerServicesServicer):
             message="Pvc successfully deleted"
         )
 
+    def StreamPodLogs(self, request, context):
+        """Follow the logs of a pod.
+        Chunks are forwarded as kubernetes sends them, without decoding or splitting
+        into lines. The next chunk is only read once gRPC has sent the previous one,
+        so a slow client slows down the read instead of buffering memory.
+        """
+        # parameters from the request
+        data = PodLogSerializer().load(protobuf_to_dict(request))
+        namespace = data['namespace']
+        name = data['name']
+
+        options = {
+            key: data[key] for key in ('container', 'tail_lines', 'since_seconds', 'timestamps')
+            if data.get(key)
+        }
+        since_time = data.get('since_time')
+        if since_time is not None:
+            # the log endpoint of the client only knows about a relative since
+            elapsed = datetime.now(timezone.utc) - since_time
+            options['since_seconds'] = max(1, int(elapsed.total_seconds()))
+
+        api_instance = client.CoreV1Api()
+        response = api_instance.read_namespaced_pod_log(
+            name=name,
+            namespace=namespace,
+            follow=True,
+            _preload_content=False,
+            **options
+        )
+        # unblock the pending read as soon as the client goes away
+        context.add_callback(response.close)
+        try:
+            for chunk in response.stream(LOG_CHUNK_SIZE, decode_content=False):
+                yield kubespawner_pb2.LogChunk(data=chunk)
+        finally:
+            response.release_conn()
+
+    def GetResourceEvents(self, request, context):
+        """Get the events of a resource.
+        For a Deployment or a Job, the events of its ReplicaSets and pods are included
+        """
+        # parameters from the request
+        data = ResourceSerializer().load(protobuf_to_dict(request))
+        namespace = data['namespace']
+        name = data['name']
+        resource_type = data['type']
+
+        if resource_type is ResourceType.POD:
+            objects = {("Pod", name)}
+        elif resource_type in (ResourceType.DEPLOYMENT, ResourceType.JOB):
+            kind = "Deployment" if resource_type is ResourceType.DEPLOYMENT else "Job"
+            objects = {(kind, name)}
+            for pod in self._informer("pods", namespace, context).by_index("owner", (kind, name)):
+                objects.add(("Pod", pod.metadata.name))
+                objects.update((reference.kind, reference.name)
+                               for reference in pod.metadata.owner_references or [])
+        else:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, "Invalid resource requested")
+
+        informer = self._informer("events", namespace, context)
+        # an event of a ReplicaSet is indexed under its Deployment as well
+        events = {event.metadata.name: event for key in objects for event in informer.by_index("object", key)}
+        events = sorted(events.values(), key=event_time)
+
+        return kubespawner_pb2.EventList(events=[
+            kubespawner_pb2.Event(
+                type=event.type or "",
+                reason=event.reason or "",
+                message=event.message or "",
+                kind=event.involved_object.kind or "",
+                name=event.involved_object.name or "",
+                count=event.count or 1,
+                first_time=format_time(event.first_timestamp or event.event_time),
+                last_time=format_time(event_time(event)),
+            ) for event in events
+        ])
+
+    def WaitForReady(self, request, context):
+        """Wait until all the replicas of a deployment are available.
+        Returns the status when it happens or just before the deadline
+        """
+        # parameters from the request
+        data = ResourceSerializer().load(protobuf_to_dict(request))
+        if data['type'] is not ResourceType.DEPLOYMENT:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, "It is not a deployment resource")
+
+        deployment, ready = self._wait_for("deployments", data['namespace'], data['name'],
+                                           deployment_ready, context)
+        payload = deployment_status(deployment)
+        payload["ready"] = ready
+
+        s = Struct()
+        s.update(payload)
+        return s
+
+    def WaitForCompletion(self, request, context):
+        """Wait until a job completes or fails.
+        Returns the status when it happens or just before the deadline
+        """
+        # parameters from the request
+        data = ResourceSerializer().load(protobuf_to_dict(request))
+        if data['type'] is not ResourceType.JOB:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, "It is not a job resource")
+
+        job, finished = self._wait_for("jobs", data['namespace'], data['name'], job_finished, context)
+        payload = job_status(job)
+        payload["finished"] = finished
+
+        s = Struct()
+        s.update(payload)
+        return s
+
+    def _wait_for(self, kind, namespace, name, condition, context):
+        """Blocks until condition(obj) holds, woken up by the shared watch of kind.
+        Returns the last known object and whether the condition holds.
+        """
+        deadline = wait_deadline(context)
+        informer = self._informer(kind, namespace, context)
+        changed = threading.Event()
+
+        def listener(event_type, obj):
+            if obj.metadata.name == name:
+                changed.set()
+
+        informer.add_listener(listener)
+        context.add_callback(changed.set)
+        try:
+            while True:
+                changed.clear()
+                obj = informer.get(name)
+                if obj is not None and condition(obj):
+                    return obj, True
+                timeout = deadline - time.monotonic()
+                if timeout <= 0 or not context.is_active():
+                    break
+                changed.wait(timeout)
+        finally:
+            informer.remove_listener(listener)
+
+        if obj is None:
+            context.abort(grpc.StatusCode.NOT_FOUND, "{} {} not found".format(kind, name))
+        return obj, False
+
+    def SpawnWorkspace(self, request, context):
+        """Create the resources of a workspace at once.
+        Independent resources are created concurrently, the deployment owns the others
+        so deleting it deletes the workspace. On failure everything created is rolled back
+        """
+        # parameters from the request
+        data = WorkspaceSerializer().load(protobuf_to_dict(request))
+        manifests = {
+            key: yaml.safe_load(data[key]) for key in ('deployment', 'service', 'ingress', 'pvc')
+            if data.get(key)
+        }
+
+        started = time.monotonic()
+        if self.quotas is not None:
+            try:
+                for key in ('pvc', 'deployment'):
+                    if key in manifests:
+                        self.quotas.check(data['namespace'], manifests[key])
+            except (QuotaExceeded, LimitRangeViolation) as e:
+                # refused by the admission of the API server as well
+                return kubespawner_pb2.SpawnResult(
+                    status=403,
+                    message="Workspace creation failed: {}".format(e),
+                    seconds=time.monotonic() - started
+                )
+        try:
+            steps = self.spawner.spawn(data['namespace'], **manifests)
+            status, message = 200, "Workspace successfully created"
+            self.images.record(manifests['deployment'])
+        except SpawnError as e:
+            steps = e.steps
+            status, message = e.status, "Workspace creation failed: {}".format(e)
+
+        return kubespawner_pb2.SpawnResult(
+            status=status,
+            message=message,
+            seconds=time.monotonic() - started,
+            steps=step_timings(steps)
+        )
+
+    def RegisterWarmPool(self, request, context):
+        """Register a pool of idle, started deployments, refilled in the background
+        """
+        # parameters from the request
+        data = WarmPoolSerializer().load(protobuf_to_dict(request))
+
+        template = yaml.safe_load(data['deployment'])
+        self.images.record(template)
+        self.warm_pools.register(
+            namespace=data['namespace'],
+            profile=data['profile'],
+            template=template,
+            size=data['size'],
+            min_size=data['min_size'],
+            idle_timeout=data.get('idle_timeout') or WARM_POOL_IDLE_TIMEOUT
+        )
+
+        return kubespawner_pb2.Status(
+            status=200,
+            message="Warm pool successfully registered"
+        )
+
+    def ClaimWarmWorkspace(self, request, context):
+        """Claim an idle deployment of a warm pool and attach the service and ingress.
+        When the pool is empty the deployment is created from the pool template
+        """
+        # parameters from the request
+        data = WarmClaimSerializer().load(protobuf_to_dict(request))
+        namespace = data['namespace']
+        manifests = {key: yaml.safe_load(data[key]) for key in ('service', 'ingress') if data.get(key)}
+
+        started = time.monotonic()
+        try:
+            deployment, hit, steps = self.warm_pools.claim(
+                namespace, data['profile'], data['workspace'], **manifests)
+        except KeyError as e:
+            context.abort(grpc.StatusCode.NOT_FOUND, str(e))
+        except SpawnError as e:
+            return kubespawner_pb2.WarmClaimResult(
+                status=e.status,
+                message="Workspace claim failed: {}".format(e),
+                seconds=time.monotonic() - started,
+                steps=step_timings(e.steps)
+            )
+
+        return kubespawner_pb2.WarmClaimResult(
+            status=200,
+            message="Workspace successfully claimed",
+            deployment=deployment.metadata.name,
+            hit=hit,
+            seconds=time.monotonic() - started,
+            steps=step_timings(steps)
+        )
+
+    def GetImagePullCoverage(self, request, context):
+        """Get how many nodes have the images used by the spawned resources
+        """
+        return kubespawner_pb2.ImageCoverageList(images=[
+            kubespawner_pb2.ImageCoverage(
+                image=image,
+                spawns=spawns,
+                prepulled=prepulled,
+                nodes=nodes,
+                cached_nodes=cached_nodes
+            ) for image, spawns, prepulled, nodes, cached_nodes in self.prepuller.coverage()
+        ])
+
+    def RegisterPVCPool(self, request, context):
+        """Register a pool of PVCs provisioned in advance, replenished in the background
+        """
+        # parameters from the request
+        data = PVCPoolSerializer().load(protobuf_to_dict(request))
+
+        self.pvc_pools.register(
+            namespace=data['namespace'],
+            storage_class=data['storage_class'],
+            size=data['size'],
+            count=data['count'],
+            access_mode=data['access_mode']
+        )
+
+        return kubespawner_pb2.Status(
+            status=200,
+            message="Pvc pool successfully registered"
+        )
+
+    def ClaimPVC(self, request, context):
+        """Claim a provisioned PVC of a pool, created on the fly when the pool is empty
+        """
+        # parameters from the request
+        data = PVCClaimSerializer().load(protobuf_to_dict(request))
+
+        started = time.monotonic()
+        try:
+            name, hit = self.pvc_pools.claim(
+                data['namespace'], data['storage_class'], data['size'], data['workspace'])
+        except KeyError as e:
+            context.abort(grpc.StatusCode.NOT_FOUND, str(e))
+
+        return kubespawner_pb2.PVCClaimResult(
+            status=200,
+            message="Pvc successfully claimed",
+            name=name,
+            hit=hit,
+            seconds=time.monotonic() - started
+        )
+
+    def WatchStatusChanges(self, request, context):
+        """Stream the resources of a namespace whose status changed, read from the
+        shared watches. Changes are coalesced while the client is reading the
+        previous ones. The first message has an empty name: whatever the client
+        read before may be stale
+        """
+        # parameters from the request
+        data = StatusWatchSerializer().load(protobuf_to_dict(request))
+        namespace = data['namespace']
+
+        lock = threading.Lock()
+        changed = threading.Event()
+        # (name, type) of the changes not sent yet, in order
+        pending = {}
+
+        def notify(name, resource_type):
+            with lock:
+                pending[(name, resource_type)] = None
+            changed.set()
+
+        def listener(event_type, obj):
+            if isinstance(obj, client.V1Pod):
+                notify(obj.metadata.name, ResourceType.POD.name)
+                # the status of a POD resource may be the pods of a Deployment or Job
+                for kind, owner in pod_owners(obj):
+                    if kind in ("Deployment", "Job"):
+                        notify(owner, ResourceType.POD.name)
+            elif isinstance(obj, client.V1Deployment):
+                notify(obj.metadata.name, ResourceType.DEPLOYMENT.name)
+            elif isinstance(obj, client.V1Job):
+                notify(obj.metadata.name, ResourceType.JOB.name)
+
+        informers = [self._informer(kind, namespace, context) for kind in ("deployments", "jobs", "pods")]
+        for informer in informers:
+            informer.add_listener(listener)
+        context.add_callback(changed.set)
+        try:
+            yield kubespawner_pb2.Resource(namespace=namespace)
+            while context.is_active():
+                changed.wait()
+                changed.clear()
+                with lock:
+                    changes = list(pending)
+                    pending.clear()
+                for name, resource_type in changes:
+                    yield kubespawner_pb2.Resource(namespace=namespace, name=name, type=resource_type)
+        finally:
+            for informer in informers:
+                informer.remove_listener(listener)
+
+    def GetResourceUsage(self, request, context):
+        """Get the recent CPU and memory usage of a Deployment or Job, summed over its pods.
+        Served from the samples of the metrics poller, empty when no pod has metrics,
+        UNAVAILABLE until a poll of the namespace succeeded
+        """
+        # parameters from the request
+        data = ResourceSerializer().load(protobuf_to_dict(request))
+        namespace = data['namespace']
+        name = data['name']
+        resource_type = data['type']
+
+        if resource_type not in (ResourceType.DEPLOYMENT, ResourceType.JOB):
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, "Usage is only known for deployments and jobs")
+        kind = "Deployment" if resource_type is ResourceType.DEPLOYMENT else "Job"
+
+        try:
+            samples = self.usage.usage(namespace, kind, name)
+        except (NotSynced, NotPolled) as e:
+            context.abort(grpc.StatusCode.UNAVAILABLE, str(e))
+
+        return kubespawner_pb2.ResourceUsage(
+            namespace=namespace,
+            name=name,
+            type=resource_type.name,
+            samples=[
+                kubespawner_pb2.UsageSample(
+                    timestamp=format_time(datetime.fromtimestamp(sample.timestamp, timezone.utc)),
+                    cpu_cores=sample.cpu_cores,
+                    memory_bytes=sample.memory_bytes,
+                    pods=sample.pods
+                ) for sample in samples
+            ]
+        )
+
+    def ScaleDeployments(self, request, context):
+        """Set the replicas of many deployments through their scale subresource.
+        The patches are sent concurrently, one failure does not stop the others
+        """
+        # parameters from the request
+        data = ScaleSerializer().load(protobuf_to_dict(request))
+
+        started = time.monotonic()
+
+        def scale(item):
+            try:
+                response = self.scale_api.patch_namespaced_deployment_scale(
+                    name=item['name'],
+                    namespace=item['namespace'],
+                    body={"spec": {"replicas": item['replicas']}}
+                )
+                return 200, "Deployment successfully scaled", response.spec.replicas
+            except Exception as e:
+                return getattr(e, "status", None) or 500, error_message(e), 0
+
+        results = []
+        for item, (status, message, replicas) in zip(data['items'], self.scaler.map(scale, data['items'])):
+            results.append(kubespawner_pb2.ScaleResult(
+                namespace=item['namespace'],
+                name=item['name'],
+                status=status,
+                message=message,
+                replicas=replicas
+            ))
+
+        return kubespawner_pb2.ScaleResponse(
+            results=results,
+            failed=sum(1 for result in results if result.status != 200),
+            seconds=time.monotonic() - started
+        )
+
+    def SubmitJobArray(self, request, context):
+        """Create one job per parameter set of a job template, concurrently, or
+        a single Indexed Job running one pod per parameter set. In indexed mode
+        every item reports the creation of that single Job, its name included
+        """
+        # parameters from the request
+        data = JobArraySerializer().load(protobuf_to_dict(request))
+        namespace = data['namespace']
+        parameters = data['parameters']
+        if len(parameters) > JOB_ARRAY_MAX_ITEMS:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT,
+                          "at most {} parameter sets are allowed".format(JOB_ARRAY_MAX_ITEMS))
+
+        started = time.monotonic()
+        template = load_template(data['template'])
+
+        def submit(job):
+            try:
+                response = self.job_api.create_namespaced_job(body=job, namespace=namespace)
+                return 200, "Job successfully created", response.metadata.name
+            except Exception as e:
+                return getattr(e, "status", None) or 500, error_message(e), job["metadata"].get("name", "")
+
+        if data['mode'] == "indexed":
+            try:
+                job = indexed_job(template, parameters, data['parallelism'])
+            except ValueError as e:
+                context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+            self._precheck(namespace, job, context, pods=job["spec"]["parallelism"])
+            status, message, name = submit(job)
+            results = [(status, message, name)] * len(parameters)
+        else:
+            jobs = array_jobs(template, parameters)
+            # the jobs only differ by their parameters, the first one stands for all
+            job = jobs[0]
+            self._precheck(namespace, job, context, count=len(jobs))
+            results = list(self.job_submitter.map(submit, jobs))
+        self.images.record(job)
+
+        items = [
+            kubespawner_pb2.JobArrayItem(index=index, name=name, status=status, message=message)
+            for index, (status, message, name) in enumerate(results)
+        ]
+        return kubespawner_pb2.JobArrayResult(
+            items=items,
+            failed=sum(1 for item in items if item.status != 200),
+            seconds=time.monotonic() - started
+        )
+
+    def PatchResource(self, request, context):
+        """Patch a resource in place with a strategic merge, merge or json patch
+        """
+        # parameters from the request
+        data = PatchSerializer().load(protobuf_to_dict(request))
+        resource_type = data['type']
+
+        try:
+            self.patcher.patch(resource_type, data['namespace'], data['name'], data['patch_type'],
+                               yaml.safe_load(data['content']))
+        except ValueError as e:
+            return kubespawner_pb2.Status(
+                status=400,
+                message=str(e)
+            )
+
+        return kubespawner_pb2.Status(
+            status=200,
+            message="{} successfully patched".format(resource_type.name.capitalize())
+        )
+
+    def UpdateDeployment(self, request, context):
+        """Patch a deployment and stream the progress of its rollout, read from the
+        shared watch of deployments. The stream ends when all the replicas of the new
+        generation are available, when the progress deadline is exceeded or at the
+        client deadline or WAIT_MAX_SECONDS, or when the deployment is deleted
+        """
+        # parameters from the request
+        data = DeploymentUpdateSerializer().load(protobuf_to_dict(request))
+        namespace = data['namespace']
+        name = data['name']
+
+        informer = self._informer("deployments", namespace, context)
+        try:
+            deployment = self.patcher.patch(ResourceType.DEPLOYMENT, namespace, name, data['patch_type'],
+                                            yaml.safe_load(data['content']))
+        except ValueError as e:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+        generation = deployment.metadata.generation or 0
+        deadline = wait_deadline(context)
+
+        changed = threading.Event()
+
+        def listener(event_type, obj):
+            if obj.metadata.name == name:
+                changed.set()
+
+        informer.add_listener(listener)
+        context.add_callback(changed.set)
+        try:
+            last = None
+            while context.is_active():
+                changed.clear()
+                # the watch may not have seen the update yet
+                cached = informer.get(name)
+                if cached is not None and (cached.metadata.generation or 0) >= generation:
+                    deployment = cached
+                progress = rollout_progress(deployment, generation)
+                timeout = deadline - time.monotonic()
+                if cached is None:
+                    progress.state, progress.message = "failed", "Deployment was deleted"
+                elif progress.state == "progressing" and timeout <= 0:
+                    progress.state, progress.message = "timeout", "Rollout still in progress at the deadline"
+                if progress != last:
+                    yield progress
+                    last = progress
+                if progress.state != "progressing":
+                    return
+                changed.wait(timeout)
+        finally:
+            informer.remove_listener(listener)
+
+    def GetTypedResourceStatus(self, request, context):
+        """Get the status of a deployment, job or cronjob as a typed message,
+        smaller and cheaper to encode than the Struct of GetResourceStatus
+        """
+        # parameters from the request
+        data = ResourceSerializer().load(protobuf_to_dict(request))
+        namespace = data['namespace']
+        name = data['name']
+        resource_type = data['type']
+
+        if resource_type is ResourceType.DEPLOYMENT:
+            api_instance = client.AppsV1Api()
+            response = api_instance.read_namespaced_deployment_status(
+                name=name,
+                namespace=namespace
+            )
+            return kubespawner_pb2.ResourceStatus(deployment=deployment_status_message(response))
+        elif resource_type is ResourceType.JOB:
+            api_instance = client.BatchV1Api()
+            response = api_instance.read_namespaced_job_status(
+                name=name,
+                namespace=namespace
+            )
+            return kubespawner_pb2.ResourceStatus(job=job_status_message(response))
+        elif resource_type is ResourceType.CRONJOB:
+            return kubespawner_pb2.ResourceStatus(
+                cronjob=cronjob_status_message(self._read_cronjob(namespace, name)))
+        return kubespawner_pb2.ResourceStatus(error="Invalid resource requested")
+
+    def _read_cronjob(self, namespace, name):
+        # batch/v1 CronJobs have no typed client, both versions are read as dicts
+        group, version = self.discovery.route("cronjobs")
+        api_instance = client.CustomObjectsApi()
+        return api_instance.get_namespaced_custom_object(
+            group=group,
+            version=version,
+            namespace=namespace,
+            plural="cronjobs",
+            name=name
+        )
+
+    def _informer(self, kind, namespace, context):
+        try:
+            return self.informers.get(kind, namespace)
+        except NotSynced as e:
+            context.abort(grpc.StatusCode.UNAVAILABLE, str(e))
+
+
+def pooled_api_client(connections):
+    """ApiClient of the default configuration keeping up to connections
+    connections open, one per thread of the pool using it"""
+    configuration = client.Configuration.get_default_copy()
+    configuration.connection_pool_maxsize = connections
+    return client.ApiClient(configuration)
+
+
+def wait_deadline(context):
+    """time.monotonic() at which a wait ends: WAIT_MAX_SECONDS, or just before
+    the client deadline when it is sooner"""
+    timeout = WAIT_MAX_SECONDS
+    remaining = context.time_remaining()
+    if remaining is not None:
+        timeout = min(timeout, remaining - WAIT_DEADLINE_MARGIN)
+    return time.monotonic() + timeout
+
+
+def step_timings(steps):
+    return [kubespawner_pb2.StepTiming(name=step.name, seconds=step.seconds, error=step.error)
+            for step in steps]
+
+
+def format_time(value):
+    return value.strftime("%Y-%m-%dT%H:%M:%S") if value else ""
+
+
+def event_time(event):
+    return event.last_timestamp or event.event_time or event.metadata.creation_timestamp
+
+
+def deployment_status(deployment):
+    status = deployment.status or client.V1DeploymentStatus()
+    return {
+        "available_replicas": status.available_replicas,
+        "collision_count": status.collision_count,
+        "replicas": status.replicas,
+        "unavailable_replicas": status.unavailable_replicas,
+        "updated_replicas": status.updated_replicas
+    }
+
+
+def to_timestamp(value):
+    """Timestamp of an aware datetime, None for None"""
+    if value is None:
+        return None
+    timestamp = Timestamp()
+    timestamp.FromDatetime(value.astimezone(timezone.utc).replace(tzinfo=None))
+    return timestamp
+
+
+def deployment_status_message(deployment):
+    status = deployment.status or client.V1DeploymentStatus()
+    return kubespawner_pb2.DeploymentStatus(
+        replicas=status.replicas or 0,
+        available_replicas=status.available_replicas or 0,
+        unavailable_replicas=status.unavailable_replicas or 0,
+        updated_replicas=status.updated_replicas or 0,
+        collision_count=status.collision_count or 0,
+        observed_generation=status.observed_generation or 0
+    )
+
+
+def deployment_ready(deployment):
+    """all the replicas of the current generation are available"""
+    status = deployment.status
+    if status is None:
+        return False
+    replicas = deployment.spec.replicas
+    replicas = 1 if replicas is None else replicas
+    return (status.observed_generation or 0) >= (deployment.metadata.generation or 0) \
+        and (status.replicas or 0) == replicas \
+        and (status.updated_replicas or 0) == replicas \
+        and (status.available_replicas or 0) == replicas
+
+
+def rollout_progress(deployment, generation):
+    """RolloutProgress of the rollout of generation"""
+    status = deployment.status or client.V1DeploymentStatus()
+    replicas = deployment.spec.replicas
+    replicas = 1 if replicas is None else replicas
+    observed = status.observed_generation or 0
+
+    state, message = "progressing", "Waiting for the rollout to be observed"
+    if observed >= generation:
+        message = "{} of {} replicas updated, {} available".format(
+            status.updated_replicas or 0, replicas, status.available_replicas or 0)
+        progressing = next((condition for condition in status.conditions or []
+                            if condition.type == "Progressing"), None)
+        if (deployment.metadata.generation or 0) > generation:
+            state, message = "failed", "Deployment was updated again"
+        elif deployment_ready(deployment):
+            state, message = "complete", "Rollout complete"
+        elif progressing is not None and progressing.reason == "ProgressDeadlineExceeded":
+            state, message = "failed", progressing.message or "Progress deadline exceeded"
+
+    return kubespawner_pb2.RolloutProgress(
+        state=state,
+        message=message,
+        generation=generation,
+        observed_generation=observed,
+        replicas=replicas,
+        updated_replicas=status.updated_replicas or 0,
+        available_replicas=status.available_replicas or 0,
+        unavailable_replicas=status.unavailable_replicas or 0
+    )
+
+
+def job_status(job):
+    # a job just created has no status yet
+    response = job.status or client.V1JobStatus()
+    start_time = response.start_time.strftime("%Y-%m-%dT%H:%M:%S") if response.start_time else ""
+    completion_time = response.completion_time.strftime("%Y-%m-%dT%H:%M:%S") if response.completion_time else ""
+    # extract completion time
+    conditions = response.conditions
+    if conditions is None:
+        conditions = []
+
+    for condition in conditions:
+        if condition.type == "Failed":
+            completion_time = condition.last_transition_time.strftime("%Y-%m-%dT%H:%M:%S")
+
+    return {
+        "active": response.active,
+        "completion_time": completion_time,
+        "failed": response.failed,
+        "start_time": start_time,
+        "succeeded": response.succeeded
+    }
+
+
+def job_status_message(job):
+    status = job.status or client.V1JobStatus()
+    completion_time = status.completion_time
+    for condition in status.conditions or []:
+        if condition.type == "Failed":
+            completion_time = condition.last_transition_time
+    return kubespawner_pb2.JobStatus(
+        active=status.active or 0,
+        succeeded=status.succeeded or 0,
+        failed=status.failed or 0,
+        start_time=to_timestamp(status.start_time),
+        completion_time=to_timestamp(completion_time)
+    )
+
+
+def job_finished(job):
+    """the job has completed or failed, pending while it has no status"""
+    status = job.status
+    if status is None:
+        return False
+    if status.completion_time:
+        return True
+    return any(condition.type in ("Complete", "Failed") and condition.status == "True"
+               for condition in status.conditions or [])
+
+
+def cronjob_status(cronjob):
+    """status of a CronJob read as a dict"""
+    status = cronjob.get("status") or {}
+    last_schedule_time = status.get("lastScheduleTime")
+    return {
+        "active": len(status.get("active") or []),
+        "last_schedule_time": isoparse(last_schedule_time).strftime("%Y-%m-%dT%H:%M:%S")
+        if last_schedule_time else "",
+    }
+
+
+def cronjob_status_message(cronjob):
+    status = cronjob.get("status") or {}
+    last_schedule_time = status.get("lastScheduleTime")
+    return kubespawner_pb2.CronJobStatus(
+        active=len(status.get("active") or []),
+        last_schedule_time=to_timestamp(isoparse(last_schedule_time)) if last_schedule_time else None
+    )
+
+
+def container_status(status):
+    """status of a container: its state and why it is not running"""
+    payload = {
+        "name": status.name,
+        "image": status.image,
+        "ready": status.ready,
+        "restart_count": status.restart_count,
+    }
+    state = status.state
+    if state.running is not None:
+        payload.update(state="running", started_at=format_time(state.running.started_at))
+    elif state.terminated is not None:
+        payload.update(state="terminated", reason=state.terminated.reason or "",
+                       message=state.terminated.message or "", exit_code=state.terminated.exit_code)
+    elif state.waiting is not None:
+        # e.g. ContainerCreating, ImagePullBackOff, CrashLoopBackOff
+        payload.update(state="waiting", reason=state.waiting.reason or "",
+                       message=state.waiting.message or "")
+
+    last = status.last_state.terminated if status.last_state else None
+    if last is not None:
+        # e.g. OOMKilled, Error
+        payload.update(last_termination_reason=last.reason or "",
+                       last_exit_code=last.exit_code,
+                       last_finished_at=format_time(last.finished_at))
+    return payload
+
+
+def pod_status(pod):
+    status = pod.status
+    containers = [container_status(c) for c in status.container_statuses or []]
+    init_containers = [container_status(c) for c in status.init_container_statuses or []]
+    conditions = {c.type: c for c in status.conditions or []}
+    scheduled = conditions.get("PodScheduled")
+
+    return {
+        "name": pod.metadata.name,
+        "phase": status.phase,
+        "reason": status.reason or "",
+        "message": status.message or "",
+        "node": pod.spec.node_name or "",
+        "ready": bool(containers) and all(c["ready"] for c in containers),
+        "restarts": sum(c["restart_count"] for c in containers),
+        "scheduled": scheduled is not None and scheduled.status == "True",
+        "unschedulable_reason": (scheduled.message or "") if scheduled is not None and scheduled.status != "True" else "",
+        "start_time": format_time(status.start_time),
+        "containers": containers,
+        "init_containers": init_containers,
+    }
+
 
 def create_server(server_address):
-    server = grpc.server(futures.ThreadPoolExecutor())
-    kubespawner_pb2_grpc.add_KubeSpawnerServicesServicer_to_server(KubeSpawnerServicer(), server)
+    # every call waits for a slot of the pool of its method class, the server
+    # has a thread for each slot and a few for the calls outside of the pools
+    router = ExecutorRouter(EXECUTOR_POOLS)
+    server = grpc.server(
+        futures.ThreadPoolExecutor(max_workers=router.capacity + DIRECT_RPC_WORKERS),
+        interceptors=recording_interceptors(RECORD_PATH) + [ExecutorRoutingInterceptor(router)],
+        maximum_concurrent_rpcs=router.capacity + DIRECT_RPC_WORKERS,
+        # accept the keepalive pings of the pooled client channels
+        options=[("grpc.keepalive_permit_without_calls", 1),
+                 ("grpc.http2.min_ping_interval_without_data_ms", 10000)])
+    servicer = KubeSpawnerServicer()
+    kubespawner_pb2_grpc.add_KubeSpawnerServicesServicer_to_server(servicer, server)
+    kubespawner_pb2_grpc.add_KubeSpawnerAdminServicer_to_server(
+        KubeSpawnerAdminServicer(router, servicer, PROFILE_MAX_SECONDS, PROFILE_INTERVAL), server)
 
     health_servicer = health.HealthServicer(
         experimental_non_blocking=True,
         experimental_thread_pool=futures.ThreadPoolExecutor(max_workers=1))
     health_pb2_grpc.add_HealthServicer_to_server(health_servicer, server)
-
-    port = server.add_insecure_port(server_address)
+    # statuses follow the API server, the watch caches and the executor pools
+    servicer.health = HealthProber(
+        health_servicer, [service.full_name for service in kubespawner_pb2.DESCRIPTOR.services_by_name.values()],
+        router, servicer.informers, HEALTH_INTERVAL, HEALTH_TIMEOUT, HEALTH_MAX_LATENCY,
+        HEALTH_MAX_ERROR_RATE, HEALTH_WINDOW, HEALTH_SATURATION)
+    servicer.health.start()
+
+    # lets grpcurl and the like list and call the services without the protos
+    reflection.enable_server_reflection(
+        [service.full_name for service in kubespawner_pb2.DESCRIPTOR.services_by_name.values()]
+        + [health_pb2.DESCRIPTOR.services_by_name["Health"].full_name, reflection.SERVICE_NAME], server)
+
+    port = listen(server, server_address)
     return server, port
 
 
+def listen(server, address):
+    """Adds a TCP or unix:// listener, creating the directory of the socket.
+    Raises RuntimeError when the address cannot be bound"""
+    if address.startswith("unix:"):
+        path = address[len("unix:"):]
+        # unix:///run/kubespawner.sock is absolute, unix:kubespawner.sock relative
+        if path.startswith("//"):
+            path = path[2:]
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+    port = server.add_insecure_port(address)
+    # older gRPC releases report a failed bind by returning 0
+    if port == 0:
+        raise RuntimeError("Failed to bind to address {}".format(address))
+    return port
+
+
 def serve():
-    server, port = create_server("[::]:50051")
+    addresses = [address.strip() for address in LISTEN_ADDRESSES.split(",") if address.strip()]
+    server, port = create_server(addresses[0])
+    for address in addresses[1:]:
+        listen(server, address)
     server.start()
-    logger.info("Server is running on port {} .....................".format(port))
+    logger.info("Server is running on {} .....................".format(", ".join(addresses)))
     server.wait_for_termination()
     logger.info("Server is stopped .....................")
 
@@ -16,16 +16,51 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
+import gc
 import json
+import os
+import pstats
+import tempfile
+import threading
+import time
+from concurrent import futures
+from datetime import datetime, timedelta, timezone
 import unittest
+from unittest import mock
 import logging
 
 import grpc
 import yaml
+from google.protobuf.struct_pb2 import Struct
+from grpc_health.v1 import health, health_pb2, health_pb2_grpc
 
 from protos import kubespawner_pb2_grpc, kubespawner_pb2
 
 import server
+from executors import ExecutorRouter, PoolSaturated
+from interceptors import ExecutorRoutingInterceptor
+from metrics import REGISTRY
+from admin import KubeSpawnerAdminServicer, metrics_matching
+from kubernetes import client
+from kubernetes.client.rest import ApiException
+from watches import Informer, InformerFactory, pod_owners, event_object
+from workspaces import WorkspaceSpawner, SpawnError
+from warmpool import WarmPool, WarmPoolManager, ID_LABEL, POOL_LABEL
+from prepull import ImageTracker, PrePuller, normalize_image
+from pvcpool import PVCPool, PVCPoolManager, pvc_pool_of
+from discovery import Discovery
+from healthcheck import HealthProber, SERVING, NOT_SERVING
+from client import KubeSpawnerClient, ChannelPool, StatusCache, default_timeout, shared_pool, release_pool
+from logsetup import RateLimitFilter, JsonFormatter, parse_levels
+from usage import UsagePoller, NotPolled, pod_usage
+from serializers import protobuf_to_dict, ScaleSerializer, JobArraySerializer, ResourceType
+from jobarrays import load_template, array_jobs, indexed_job, ARRAY_LABEL, INDEX_LABEL, PARAMETERS_ENV
+from patches import Patcher
+from quotas import QuotaChecker, QuotaExceeded, LimitRangeViolation
+from ingressroutes import IngressRouteAggregator, AggregateFull, members_of
+from recording import RecordingInterceptor, RecordWriter, read_records
+from profiling import SamplingProfiler, tagged
+from inprocess import InProcessStub
 
 # setup logger
 FORMAT = '%(asctime)s %(levelname)s %(message)s'
@@ -63,6 +98,1465 @@ class KubespawnerServicerTest(unittest.TestCase):
             self.assertEqual(response.status, 200)
 
 
+def occupy(pool, release, calls=1):
+    """Starts calls of pool blocked until release is set, once they are
+    running or queued. Returns their futures"""
+    executor = futures.ThreadPoolExecutor(max_workers=calls)
+    taken = []
+    for _ in range(calls):
+        before = pool.active.value + pool.queue_depth.value
+        taken.append(executor.submit(pool.run, release.wait))
+        while pool.active.value + pool.queue_depth.value == before:
+            time.sleep(0.001)
+    executor.shutdown(wait=False)
+    return taken
+
+
+class ExecutorRouterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.router = ExecutorRouter({"read": (2, 2), "delete": (1, 0), "default": (1, 1)})
+
+    def test_routes_by_method_class(self):
+        self.assertEqual(self.router.pool_for("/kubespawner.KubeSpawnerServices/GetResourceStatus").name, "read")
+        self.assertEqual(self.router.pool_for("/kubespawner.KubeSpawnerServices/DeletePVC").name, "delete")
+        # no create pool configured, falls back to default
+        self.assertEqual(self.router.pool_for("/kubespawner.KubeSpawnerServices/CreatePVCFromFile").name, "default")
+        self.assertEqual(self.router.capacity, 7)
+
+    def test_saturated_pool_does_not_affect_others(self):
+        release = threading.Event()
+        delete_pool = self.router.pool_for("DeletePVC")
+        blocked = occupy(delete_pool, release)
+        with self.assertRaises(PoolSaturated):
+            delete_pool.run(release.wait)
+
+        # calls run on the thread of their caller
+        self.assertIs(self.router.pool_for("GetResourceStatus").run(threading.current_thread),
+                      threading.current_thread())
+        release.set()
+        blocked[0].result(timeout=1)
+        self.assertEqual(self.router.snapshot()["delete"]["rejected"], 1)
+
+    def test_queued_calls(self):
+        release = threading.Event()
+        read_pool = self.router.pool_for("GetResourceStatus")
+        blocked = occupy(read_pool, release, calls=4)
+        snapshot = self.router.snapshot()["read"]
+        self.assertEqual((snapshot["active"], snapshot["queue_depth"]), (2, 2))
+        with self.assertRaises(PoolSaturated):
+            read_pool.run(release.wait)
+        release.set()
+        for call in blocked:
+            self.assertTrue(call.result(timeout=1))
+        self.assertEqual(read_pool.run(lambda: "status"), "status")
+
+    def test_stream_holds_slot_until_closed(self):
+        pool = self.router.pool_for("DeletePVC")
+        stream = pool.hold(iter([1, 2]))
+        with self.assertRaises(PoolSaturated):
+            pool.run(lambda: None)
+        self.assertEqual(list(stream), [1, 2])
+        self.assertIsNone(pool.run(lambda: None))
+        # a stream gRPC never iterates releases its slot when dropped
+        pool.hold(iter([]))
+        self.assertIsNone(pool.run(lambda: None))
+
+    def test_active_calls_by_method(self):
+        interceptor = ExecutorRoutingInterceptor(self.router)
+        context = mock.Mock()
+        active = REGISTRY.gauge("rpc.StreamPodLogs.active")
+
+        def stream(request, context):
+            yield "chunk"
+        responses = interceptor.intercept(stream, None, context, "/kubespawner.KubeSpawnerServices/StreamPodLogs")
+        self.assertEqual(active.value, 1)
+        self.assertEqual(list(responses), ["chunk"])
+        self.assertEqual(active.value, 0)
+
+        interceptor.intercept(lambda request, context: "status", None, context,
+                              "/kubespawner.KubeSpawnerServices/GetResourceStatus")
+        self.assertEqual(REGISTRY.gauge("rpc.GetResourceStatus.active").value, 0)
+        self.assertEqual(metrics_matching({"rpc.Inspect.active": 1, "rpc.total": 2}, "rpc.", ".active"),
+                         {"Inspect": 1})
+
+    def test_saturated_stream_pool(self):
+        interceptor = ExecutorRoutingInterceptor(self.router)
+        context = mock.Mock()
+        active = REGISTRY.gauge("rpc.DeletePVC.active")
+        pool = self.router.pool_for("DeletePVC")
+        release = threading.Event()
+        blocked = occupy(pool, release)
+
+        def stream(request, context):
+            yield "chunk"
+        # the handler returns its stream while the only slot of the pool is taken
+        with mock.patch.object(pool, "run", side_effect=lambda run: run()):
+            context.abort.side_effect = grpc.RpcError
+            with self.assertRaises(grpc.RpcError):
+                interceptor.intercept(stream, None, context, "/kubespawner.KubeSpawnerServices/DeletePVC")
+        release.set()
+        blocked[0].result(timeout=1)
+        gc.collect()
+        self.assertEqual(active.value, 0)
+
+    def test_other_services_are_not_routed(self):
+        interceptor = ExecutorRoutingInterceptor(self.router)
+        release = threading.Event()
+        blocked = occupy(self.router.pool_for("Check"), release, calls=2)
+        try:
+            # the default pool is saturated, health checks still answer
+            self.assertEqual(interceptor.intercept(lambda request, context: "SERVING", None, mock.Mock(),
+                                                   "/grpc.health.v1.Health/Check"), "SERVING")
+        finally:
+            release.set()
+        blocked[0].result(timeout=1)
+
+
+class InspectTest(unittest.TestCase):
+
+    def test_inspect(self):
+        router = ExecutorRouter({"read": (1, 1), "default": (1, 1)})
+        servicer = mock.Mock()
+        servicer.informers.hits.value, servicer.informers.misses.value = 9, 1
+        servicer.informers.snapshot.return_value = {"pods/default": {"synced": True, "objects": 1}}
+        servicer.warm_pools.snapshot.return_value = {"default/py": {"hits": 3, "misses": 1, "conflicts": 0}}
+        servicer.pvc_pools.snapshot.return_value = {}
+        for name in ("patcher", "usage", "discovery"):
+            getattr(servicer, name).snapshot.return_value = {}
+        servicer.scale_api = client.AppsV1Api(server.pooled_api_client(4))
+        servicer.job_api = client.BatchV1Api(server.pooled_api_client(4))
+        servicer.ingress_routes = None
+        servicer.health = None
+        admin = KubeSpawnerAdminServicer(router, servicer)
+
+        release = threading.Event()
+        blocked = occupy(router.pool_for("GetResourceStatus"), release, calls=2)
+        active = REGISTRY.gauge("rpc.WaitForReady.active")
+        active.inc()
+        try:
+            payload = protobuf_to_dict(admin.Inspect(None, mock.Mock()))
+        finally:
+            active.dec()
+            release.set()
+        for call in blocked:
+            call.result(timeout=1)
+
+        self.assertEqual((payload["executors"]["read"]["active"], payload["executors"]["read"]["queue_depth"]),
+                         (1, 1))
+        self.assertEqual(payload["calls"]["WaitForReady"], 1)
+        self.assertEqual(payload["caches"]["informers"]["watches"]["pods/default"],
+                         {"synced": True, "objects": 1})
+        self.assertEqual(payload["caches"]["informers"]["hit_rate"], 0.9)
+        self.assertEqual(payload["caches"]["warm_pools"]["default/py"]["hit_rate"], 0.75)
+        self.assertEqual(payload["connection_pools"]["scale"], {})
+        self.assertGreater(payload["process"]["rss_bytes"], 0)
+        self.assertGreater(payload["process"]["max_rss_bytes"], 0)
+
+
+def make_pod(name, owner_kind, owner_name, template_hash=None):
+    return client.V1Pod(metadata=client.V1ObjectMeta(
+        name=name,
+        labels={"pod-template-hash": template_hash} if template_hash else None,
+        owner_references=[client.V1OwnerReference(api_version="v1", kind=owner_kind, name=owner_name, uid="1")]))
+
+
+class InformerTest(unittest.TestCase):
+
+    def test_pod_owners(self):
+        pod = make_pod("ws-1-5d8f-abc", "ReplicaSet", "ws-1-5d8f", template_hash="5d8f")
+        self.assertEqual(pod_owners(pod), [("ReplicaSet", "ws-1-5d8f"), ("Deployment", "ws-1")])
+        self.assertEqual(pod_owners(make_pod("job-1-x", "Job", "job-1")), [("Job", "job-1")])
+
+    def test_index_follows_events(self):
+        pods = client.V1PodList(metadata=client.V1ListMeta(resource_version="1"),
+                                items=[make_pod("job-1-x", "Job", "job-1")])
+        informer = Informer("pods", lambda namespace: pods, "default", indexers={"owner": pod_owners})
+        informer._relist()
+        self.assertTrue(informer.synced)
+        self.assertEqual([p.metadata.name for p in informer.by_index("owner", ("Job", "job-1"))], ["job-1-x"])
+
+        informer._store("ADDED", make_pod("job-1-y", "Job", "job-1"))
+        informer._store("DELETED", make_pod("job-1-x", "Job", "job-1"))
+        self.assertEqual([p.metadata.name for p in informer.by_index("owner", ("Job", "job-1"))], ["job-1-y"])
+        self.assertIsNone(informer.get("job-1-x"))
+
+
+    def test_add_indexer(self):
+        factory = InformerFactory()
+        pods = client.V1PodList(metadata=client.V1ListMeta(resource_version="1"),
+                                items=[make_pod("job-1-x", "Job", "job-1")])
+        factory.register("pods", lambda: lambda namespace: pods)
+        with mock.patch.object(Informer, "start"):
+            informer = factory.get("pods", "default", wait=False)
+        informer._relist()
+        # added once the informer runs, the loaded objects are indexed
+        factory.add_indexer("pods", "owner", pod_owners)
+        self.assertEqual([p.metadata.name for p in informer.by_index("owner", ("Job", "job-1"))], ["job-1-x"])
+        with mock.patch.object(Informer, "start"):
+            other = factory.get("pods", "tenant-1", wait=False)
+        other._relist()
+        self.assertEqual(len(other.by_index("owner", ("Job", "job-1"))), 1)
+
+
+def make_event(name, kind, object_name, minute):
+    return client.V1Event(
+        metadata=client.V1ObjectMeta(name=name),
+        involved_object=client.V1ObjectReference(kind=kind, name=object_name),
+        reason="Reason{}".format(minute), message="", type="Normal", count=1,
+        last_timestamp=datetime(2021, 3, 1, 12, minute, tzinfo=timezone.utc))
+
+
+class SharedWatchReadsTest(unittest.TestCase):
+    """GetResourceStatus of pods and GetResourceEvents served from the watches"""
+
+    def setUp(self):
+        pod = make_pod("ws-1-5d8f-abc", "ReplicaSet", "ws-1-5d8f", template_hash="5d8f")
+        pod.spec = client.V1PodSpec(containers=[], node_name="node-1")
+        pod.status = client.V1PodStatus(phase="Pending", container_statuses=[client.V1ContainerStatus(
+            name="main", image="ws", image_id="", ready=False, restart_count=2,
+            state=client.V1ContainerState(waiting=client.V1ContainerStateWaiting(reason="ImagePullBackOff")))])
+        pods = Informer("pods", lambda namespace: client.V1PodList(
+            metadata=client.V1ListMeta(resource_version="1"), items=[pod]), "default",
+            indexers={"owner": pod_owners})
+        events = Informer("events", lambda namespace: client.V1EventList(
+            metadata=client.V1ListMeta(resource_version="1"), items=[
+                make_event("e-3", "Pod", "ws-1-5d8f-abc", 3),
+                make_event("e-1", "Deployment", "ws-1", 1),
+                make_event("e-2", "ReplicaSet", "ws-1-5d8f", 2),
+                make_event("e-4", "Deployment", "ws-2", 4),
+                # a ReplicaSet of ws-2 whose pods were refused, it has none
+                make_event("e-5", "ReplicaSet", "ws-2-7c9b4", 5)]), "default",
+            indexers={"object": event_object})
+        pods._relist()
+        events._relist()
+        self.servicer = server.KubeSpawnerServicer.__new__(server.KubeSpawnerServicer)
+        self.servicer.informers = FakeInformers({"pods": pods, "events": events})
+
+    def test_pod_status(self):
+        status = protobuf_to_dict(self.servicer.GetResourceStatus(
+            kubespawner_pb2.Resource(namespace="default", name="ws-1", type="POD"), mock.Mock()))
+        pod = status["pods"][0]
+        self.assertEqual((pod["name"], pod["phase"], pod["node"], pod["restarts"]),
+                         ("ws-1-5d8f-abc", "Pending", "node-1", 2))
+        self.assertEqual(pod["containers"][0]["reason"], "ImagePullBackOff")
+
+        status = protobuf_to_dict(self.servicer.GetResourceStatus(
+            kubespawner_pb2.Resource(namespace="default", name="ws-1-5d8f-abc", type="POD"), mock.Mock()))
+        self.assertEqual(status["name"], "ws-1-5d8f-abc")
+        status = protobuf_to_dict(self.servicer.GetResourceStatus(
+            kubespawner_pb2.Resource(namespace="default", name="ws-3", type="POD"), mock.Mock()))
+        self.assertEqual(status, {"Error": "Pod not found"})
+
+    def test_events_of_deployment(self):
+        events = self.servicer.GetResourceEvents(
+            kubespawner_pb2.Resource(namespace="default", name="ws-1", type="DEPLOYMENT"), mock.Mock()).events
+        # its ReplicaSet and pods included, oldest first
+        self.assertEqual([(event.kind, event.reason) for event in events],
+                         [("Deployment", "Reason1"), ("ReplicaSet", "Reason2"), ("Pod", "Reason3")])
+        self.assertEqual(events[0].last_time, "2021-03-01T12:01:00")
+
+        events = self.servicer.GetResourceEvents(
+            kubespawner_pb2.Resource(namespace="default", name="ws-2", type="DEPLOYMENT"), mock.Mock()).events
+        self.assertEqual([(event.kind, event.name) for event in events],
+                         [("Deployment", "ws-2"), ("ReplicaSet", "ws-2-7c9b4")])
+
+
+class FakeLogResponse(object):
+    """read_namespaced_pod_log(_preload_content=False) response, a urllib3 one"""
+
+    def __init__(self, data):
+        self.data = data
+        self.closed = False
+        self.released = False
+        self.reads = []
+
+    def stream(self, amt, decode_content=None):
+        self.reads.append((amt, decode_content))
+        for start in range(0, len(self.data), amt):
+            if self.closed:
+                return
+            yield self.data[start:start + amt]
+
+    def close(self):
+        self.closed = True
+
+    def release_conn(self):
+        self.released = True
+
+
+class StreamPodLogsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.response = FakeLogResponse(b"line 1\nline 2\n\xe2\x82\xac\n")
+        self.api = mock.Mock()
+        self.api.read_namespaced_pod_log.return_value = self.response
+        self.callbacks = []
+        self.context = mock.Mock()
+        self.context.add_callback.side_effect = self.callbacks.append
+        self.servicer = server.KubeSpawnerServicer.__new__(server.KubeSpawnerServicer)
+        patchers = [mock.patch("server.client.CoreV1Api", return_value=self.api),
+                    mock.patch("server.LOG_CHUNK_SIZE", 4)]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def stream(self, **kwargs):
+        return self.servicer.StreamPodLogs(
+            kubespawner_pb2.PodLogRequest(namespace="default", name="ws-1", **kwargs), self.context)
+
+    def test_chunks(self):
+        chunks = [chunk.data for chunk in self.stream(container="main", tail_lines=10)]
+        # raw bytes as kubernetes sends them, a character may span two chunks
+        self.assertEqual(chunks, [b"line", b" 1\nl", b"ine ", b"2\n\xe2\x82", b"\xac\n"])
+        self.assertEqual(self.response.reads, [(4, False)])
+        self.api.read_namespaced_pod_log.assert_called_once_with(
+            name="ws-1", namespace="default", follow=True, _preload_content=False, container="main",
+            tail_lines=10)
+        self.assertTrue(self.response.released)
+
+    def test_since_time(self):
+        since = datetime.now(timezone.utc) - timedelta(minutes=5)
+        list(self.stream(since_time=since.isoformat()))
+        since_seconds = self.api.read_namespaced_pod_log.call_args[1]["since_seconds"]
+        self.assertTrue(299 <= since_seconds <= 302, since_seconds)
+
+        # never 0, kubernetes would take it as no limit
+        list(self.stream(since_time=(datetime.now(timezone.utc) + timedelta(minutes=1)).isoformat()))
+        self.assertEqual(self.api.read_namespaced_pod_log.call_args[1]["since_seconds"], 1)
+
+    def test_cancel(self):
+        chunks = self.stream()
+        self.assertEqual(next(chunks).data, b"line")
+        # the client goes away: gRPC runs the callbacks, then closes the generator
+        for callback in self.callbacks:
+            callback()
+        self.assertTrue(self.response.closed)
+        self.assertEqual(list(chunks), [])
+        self.assertTrue(self.response.released)
+
+
+def make_deployment(name, generation, observed_generation, available_replicas, replicas=1):
+    return client.V1Deployment(
+        metadata=client.V1ObjectMeta(name=name, generation=generation),
+        spec=client.V1DeploymentSpec(replicas=replicas, selector=client.V1LabelSelector(),
+                                    template=client.V1PodTemplateSpec()),
+        status=client.V1DeploymentStatus(observed_generation=observed_generation, replicas=replicas,
+                                         updated_replicas=replicas, available_replicas=available_replicas))
+
+
+class UpdateDeploymentTest(unittest.TestCase):
+
+    def setUp(self):
+        self.informer = synced_informer("deployments", [make_deployment("ws", 1, 1, 1)])
+        self.servicer = server.KubeSpawnerServicer.__new__(server.KubeSpawnerServicer)
+        self.servicer.informers = FakeInformers({"deployments": self.informer})
+        self.servicer.patcher = mock.Mock()
+        self.servicer.patcher.patch.return_value = make_deployment("ws", 2, 1, 1)
+        self.context = mock.Mock()
+        self.context.time_remaining.return_value = None
+
+    def update(self):
+        return self.servicer.UpdateDeployment(kubespawner_pb2.DeploymentUpdate(
+            namespace="default", name="ws", content="spec: {}"), self.context)
+
+    def test_complete(self):
+        progress = self.update()
+        self.assertEqual(next(progress).state, "progressing")
+        # the watch sees the new generation, then its rollout
+        self.informer._store("MODIFIED", make_deployment("ws", 2, 2, 0))
+        self.assertEqual(next(progress).message, "1 of 1 replicas updated, 0 available")
+        self.informer._store("MODIFIED", make_deployment("ws", 2, 2, 1))
+        self.assertEqual(next(progress).state, "complete")
+        self.assertEqual(list(progress), [])
+        self.assertFalse(self.informer.has_listeners)
+
+    def test_deadline(self):
+        self.context.time_remaining.return_value = 0.6
+        progress = self.update()
+        self.assertEqual(next(progress).state, "progressing")
+        # ends before the client deadline, WAIT_DEADLINE_MARGIN of 0.5
+        last = next(progress)
+        self.assertEqual((last.state, last.generation), ("timeout", 2))
+        self.assertEqual(list(progress), [])
+
+    def test_deleted(self):
+        progress = self.update()
+        self.assertEqual(next(progress).state, "progressing")
+        self.informer._store("DELETED", make_deployment("ws", 1, 1, 1))
+        self.assertEqual(next(progress).state, "failed")
+        self.assertEqual(list(progress), [])
+
+
+class WaitForTest(unittest.TestCase):
+    """WaitForReady and WaitForCompletion on the shared watches"""
+
+    def setUp(self):
+        self.deployments = synced_informer("deployments", [make_deployment("ws", 1, 1, 0)])
+        self.jobs = synced_informer("jobs", [client.V1Job(
+            metadata=client.V1ObjectMeta(name="job"), status=client.V1JobStatus(succeeded=1, conditions=[
+                client.V1JobCondition(type="Complete", status="True")]))])
+        self.servicer = server.KubeSpawnerServicer.__new__(server.KubeSpawnerServicer)
+        self.servicer.informers = FakeInformers({"deployments": self.deployments, "jobs": self.jobs})
+        self.context = mock.Mock()
+        self.context.time_remaining.return_value = 5.5
+
+    def wait_for_ready(self, name="ws"):
+        return protobuf_to_dict(self.servicer.WaitForReady(
+            kubespawner_pb2.Resource(namespace="default", name=name, type="DEPLOYMENT"), self.context))
+
+    def test_already_done(self):
+        status = protobuf_to_dict(self.servicer.WaitForCompletion(
+            kubespawner_pb2.Resource(namespace="default", name="job", type="JOB"), self.context))
+        self.assertEqual(status["succeeded"], 1)
+        self.assertFalse(self.jobs.has_listeners)
+
+    def test_woken_up_by_watch(self):
+        timer = threading.Timer(0.05, self.deployments._store, ("MODIFIED", make_deployment("ws", 1, 1, 1)))
+        timer.start()
+        started = time.monotonic()
+        status = self.wait_for_ready()
+        self.assertTrue(status["ready"])
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertFalse(self.deployments.has_listeners)
+
+    def test_deadline(self):
+        # answers WAIT_DEADLINE_MARGIN before the client deadline
+        self.context.time_remaining.return_value = 0.6
+        status = self.wait_for_ready()
+        self.assertEqual((status["ready"], status["available_replicas"]), (False, 0))
+
+    def test_not_found(self):
+        self.context.abort.side_effect = grpc.RpcError
+        self.context.time_remaining.return_value = 0.6
+        with self.assertRaises(grpc.RpcError):
+            self.wait_for_ready("ws-2")
+        self.assertEqual(self.context.abort.call_args[0][0], grpc.StatusCode.NOT_FOUND)
+
+
+class ListenTest(unittest.TestCase):
+
+    def test_unix_socket(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        address = "unix://" + os.path.join(directory.name, "run", "kubespawner.sock")
+        grpc_server = grpc.server(futures.ThreadPoolExecutor(max_workers=1))
+        health_pb2_grpc.add_HealthServicer_to_server(health.HealthServicer(), grpc_server)
+        # the directory of the socket is created
+        server.listen(grpc_server, address)
+        grpc_server.start()
+        self.addCleanup(grpc_server.stop, None)
+
+        with grpc.insecure_channel(address) as channel:
+            response = health_pb2_grpc.HealthStub(channel).Check(health_pb2.HealthCheckRequest(), timeout=5)
+        self.assertEqual(response.status, health_pb2.HealthCheckResponse.SERVING)
+
+    def test_bind_failure(self):
+        grpc_server = mock.Mock()
+        grpc_server.add_insecure_port.return_value = 0
+        with self.assertRaises(RuntimeError):
+            server.listen(grpc_server, "[::]:50051")
+
+
+class WaitConditionTest(unittest.TestCase):
+
+    def test_deployment_ready(self):
+        deployment = client.V1Deployment(
+            metadata=client.V1ObjectMeta(name="ws", generation=2),
+            spec=client.V1DeploymentSpec(replicas=2, selector=client.V1LabelSelector(),
+                                        template=client.V1PodTemplateSpec()),
+            status=client.V1DeploymentStatus(observed_generation=1, replicas=2, updated_replicas=2,
+                                             available_replicas=2))
+        # the controller has not seen the last update yet
+        self.assertFalse(server.deployment_ready(deployment))
+        deployment.status.observed_generation = 2
+        self.assertTrue(server.deployment_ready(deployment))
+
+    def test_job_finished(self):
+        # not seen by the job controller yet
+        job = client.V1Job(metadata=client.V1ObjectMeta(name="job"))
+        self.assertFalse(server.job_finished(job))
+        self.assertEqual(server.job_status(job)["completion_time"], "")
+        self.assertEqual(server.job_status_message(job).active, 0)
+
+        job = client.V1Job(metadata=client.V1ObjectMeta(name="job"), status=client.V1JobStatus(active=1))
+        self.assertFalse(server.job_finished(job))
+        job.status.conditions = [client.V1JobCondition(type="Failed", status="True")]
+        self.assertTrue(server.job_finished(job))
+
+    def test_rollout_progress(self):
+        deployment = client.V1Deployment(
+            metadata=client.V1ObjectMeta(name="ws", generation=3),
+            spec=client.V1DeploymentSpec(replicas=2, selector=client.V1LabelSelector(),
+                                        template=client.V1PodTemplateSpec()),
+            status=client.V1DeploymentStatus(observed_generation=3, replicas=3, updated_replicas=1,
+                                             available_replicas=2, unavailable_replicas=1))
+        progress = server.rollout_progress(deployment, 3)
+        self.assertEqual((progress.state, progress.updated_replicas), ("progressing", 1))
+
+        deployment.status.conditions = [client.V1DeploymentCondition(
+            type="Progressing", status="False", reason="ProgressDeadlineExceeded")]
+        self.assertEqual(server.rollout_progress(deployment, 3).state, "failed")
+
+        deployment.status = client.V1DeploymentStatus(observed_generation=3, replicas=2, updated_replicas=2,
+                                                      available_replicas=2)
+        self.assertEqual(server.rollout_progress(deployment, 3).state, "complete")
+
+    def test_typed_status(self):
+        started = datetime(2021, 3, 1, 12, 0, tzinfo=timezone.utc)
+        job = client.V1Job(metadata=client.V1ObjectMeta(name="job"), status=client.V1JobStatus(
+            failed=1, start_time=started, conditions=[client.V1JobCondition(
+                type="Failed", status="True", last_transition_time=started + timedelta(minutes=5))]))
+        message = server.job_status_message(job)
+        self.assertEqual(message.failed, 1)
+        self.assertEqual(message.start_time.seconds, int(started.timestamp()))
+        self.assertEqual(message.completion_time.seconds - message.start_time.seconds, 300)
+
+        message = server.cronjob_status_message({"status": {"active": [{"name": "a"}, {"name": "b"}]}})
+        self.assertEqual(message.active, 2)
+        self.assertFalse(message.HasField("last_schedule_time"))
+
+
+class FakeSpawner(WorkspaceSpawner):
+    """Records the calls instead of talking to kubernetes"""
+
+    def __init__(self, failing, failing_delete=None):
+        super(FakeSpawner, self).__init__(futures.ThreadPoolExecutor(max_workers=4), Discovery())
+        self.failing = failing
+        self.failing_delete = failing_delete
+        self.deleted = []
+
+    def _create(self, kind, manifest):
+        if kind == self.failing:
+            raise RuntimeError("{} failed".format(kind))
+        obj = client.V1Deployment(metadata=client.V1ObjectMeta(name=manifest["metadata"]["name"], uid="uid"))
+
+        def delete(name, namespace, body):
+            if kind == self.failing_delete:
+                raise RuntimeError("{} delete failed".format(kind))
+            self.deleted.append((kind, name))
+
+        return obj, (delete, obj.metadata.name)
+
+    def _create_deployment(self, namespace, manifest):
+        return self._create("deployment", manifest)
+
+    def _create_pvc(self, namespace, manifest):
+        return self._create("pvc", manifest)
+
+    def _create_service(self, namespace, manifest):
+        return self._create("service", manifest)
+
+    def _own_pvc(self, namespace, name, owner):
+        return None, None
+
+
+class WorkspaceSpawnerTest(unittest.TestCase):
+
+    def test_spawn_sets_owner(self):
+        service = {"metadata": {"name": "svc"}}
+        steps = FakeSpawner(failing=None).spawn(
+            "default", {"metadata": {"name": "ws"}}, service=service, pvc={"metadata": {"name": "data"}})
+        self.assertEqual([step.name for step in steps], ["deployment", "pvc", "service", "pvc_owner"])
+        self.assertEqual(service["metadata"]["ownerReferences"][0]["name"], "ws")
+
+    def test_failure_rolls_back(self):
+        spawner = FakeSpawner(failing="service")
+        with self.assertRaises(SpawnError) as error:
+            spawner.spawn("default", {"metadata": {"name": "ws"}}, service={"metadata": {"name": "svc"}},
+                          pvc={"metadata": {"name": "data"}})
+        self.assertEqual(sorted(spawner.deleted), [("deployment", "ws"), ("pvc", "data")])
+        self.assertEqual(error.exception.steps[-1].name, "rollback")
+        self.assertEqual(error.exception.status, 500)
+
+    def test_rollback_continues(self):
+        spawner = FakeSpawner(failing="service", failing_delete="pvc")
+        with self.assertRaises(SpawnError) as error:
+            spawner.spawn("default", {"metadata": {"name": "ws"}}, service={"metadata": {"name": "svc"}},
+                          pvc={"metadata": {"name": "data"}})
+        self.assertEqual(spawner.deleted, [("deployment", "ws")])
+        self.assertEqual(error.exception.steps[-1].error, "data: pvc delete failed")
+
+    def test_pvc_without_name(self):
+        spawner = FakeSpawner(failing=None)
+        with self.assertRaises(SpawnError) as error:
+            spawner.spawn("default", {"metadata": {"name": "ws"}}, pvc={"metadata": {"generateName": "data-"}})
+        self.assertEqual(error.exception.status, 400)
+        # refused before the deployment was created
+        self.assertEqual((error.exception.steps, spawner.deleted), ([], []))
+
+
+class WarmPoolTest(unittest.TestCase):
+
+    def test_manifest_selects_own_pod(self):
+        pool = WarmPool("default", "python", {"spec": {"template": {"metadata": {"labels": {"app": "ws"}}}}},
+                        size=2, min_size=0, idle_timeout=60)
+        manifest = pool.manifest({})
+        warm_id = manifest["metadata"]["labels"][ID_LABEL]
+        self.assertEqual(manifest["metadata"]["labels"][POOL_LABEL], "python")
+        self.assertEqual(manifest["spec"]["selector"]["matchLabels"], {ID_LABEL: warm_id})
+        self.assertEqual(manifest["spec"]["template"]["metadata"]["labels"], {"app": "ws", ID_LABEL: warm_id})
+        # the template is left untouched
+        self.assertNotIn("selector", pool.template["spec"])
+        self.assertNotEqual(pool.manifest({})["metadata"]["name"], manifest["metadata"]["name"])
+
+    def test_idle_pool_shrinks(self):
+        pool = WarmPool("default", "python", {}, size=3, min_size=1, idle_timeout=60)
+        self.assertEqual(pool.target, 3)
+        pool.last_claim -= 61
+        self.assertEqual(pool.target, 1)
+
+    def test_eviction_spares_claimed(self):
+        deployments = [
+            client.V1Deployment(metadata=client.V1ObjectMeta(
+                name="warm-python-{}".format(i), resource_version=str(i),
+                creation_timestamp=datetime(2021, 3, 1, i, tzinfo=timezone.utc)))
+            for i in range(2)
+        ]
+        informer = mock.Mock()
+        informer.by_index.return_value = deployments
+        informer.get.return_value = None
+        manager = WarmPoolManager(FakeInformers({"deployments": informer}), None, lambda deployment: True)
+        pool = WarmPool("tenant-1", "python", {}, size=0, min_size=0, idle_timeout=60)
+
+        with mock.patch("warmpool.client.AppsV1Api") as api:
+            # the second one was claimed by another replica since the watch reported it
+            api.return_value.delete_namespaced_deployment.side_effect = [None, ApiException(status=409)]
+            manager.refill(pool)
+        preconditions = [call[1]["body"].preconditions.resource_version
+                         for call in api.return_value.delete_namespaced_deployment.call_args_list]
+        self.assertEqual(preconditions, ["0", "1"])
+        self.assertEqual(pool.evictions.value, 1)
+        # pools of the same profile in two namespaces have their own metrics
+        self.assertEqual(WarmPool("tenant-2", "python", {}, 0, 0, 60).evictions.value, 0)
+
+    def test_pending_expire(self):
+        informer = mock.Mock()
+        informer.by_index.return_value = []
+        informer.get.return_value = None
+        manager = WarmPoolManager(FakeInformers({"deployments": informer}), None, lambda deployment: True)
+        pool = WarmPool("default", "python", {}, size=1, min_size=1, idle_timeout=60)
+
+        with mock.patch("warmpool.client.AppsV1Api") as api:
+            api.return_value.create_namespaced_deployment.side_effect = lambda namespace, body: \
+                client.V1Deployment(metadata=client.V1ObjectMeta(name=body["metadata"]["name"]))
+            manager.refill(pool)
+            # created, not reported by the watch yet
+            manager.refill(pool)
+            self.assertEqual(api.return_value.create_namespaced_deployment.call_count, 1)
+            # deleted before the watch saw it
+            with mock.patch("resourcepool.time.monotonic", return_value=time.monotonic() + 301):
+                manager.refill(pool)
+            self.assertEqual(api.return_value.create_namespaced_deployment.call_count, 2)
+        self.assertEqual(len(pool.pending), 1)
+
+
+class ImageTrackerTest(unittest.TestCase):
+
+    def test_normalize_image(self):
+        self.assertEqual(normalize_image("nginx"), "docker.io/library/nginx:latest")
+        self.assertEqual(normalize_image("jupyter/base-notebook:lab"), "docker.io/jupyter/base-notebook:lab")
+        self.assertEqual(normalize_image("localhost:5000/ws"), "localhost:5000/ws:latest")
+        self.assertEqual(normalize_image("ghcr.io/ilyde/ws@sha256:ab"), "ghcr.io/ilyde/ws@sha256:ab")
+
+    def test_top_images(self):
+        tracker = ImageTracker(decay=0.5)
+        with open("examples/deployment.json") as f:
+            tracker.record(json.load(f))
+        tracker.decay()
+        tracker.record({"kind": "CronJob", "spec": {"jobTemplate": {"spec": {"template": {"spec": {
+            "containers": [{"name": "job", "image": "python:3.8"}]}}}}}})
+        self.assertEqual(tracker.top(1), ["docker.io/library/python:3.8"])
+        self.assertEqual(len(tracker.top(5)), 2)
+
+    def test_forgotten_images(self):
+        tracker = ImageTracker(decay=0.1)
+        tracker.record({"kind": "Pod", "spec": {"containers": [{"name": "ws", "image": "nginx"}]}})
+        tracker.decay()
+        self.assertEqual(tracker.spawns(), {"docker.io/library/nginx:latest": 1})
+        tracker.decay()
+        tracker.decay()
+        self.assertEqual(tracker.top(5), [])
+        self.assertEqual(tracker.spawns(), {})
+
+    def test_daemon_set(self):
+        prepuller = PrePuller(ImageTracker(), "default", "prepull", 2, "busybox", 300)
+        spec = prepuller.daemon_set(["docker.io/library/python:3.8", "gcr.io/distroless/base:latest"])["spec"]
+        pod_spec = spec["template"]["spec"]
+        # every image pulls in a container of its own, without a shell
+        self.assertEqual([container["image"] for container in pod_spec["containers"]],
+                         ["docker.io/library/python:3.8", "gcr.io/distroless/base:latest"])
+        self.assertEqual(pod_spec["containers"][1]["command"][0], "/prepull/sleep")
+        self.assertEqual(pod_spec["initContainers"][0]["image"], "busybox")
+
+    def test_disabled(self):
+        prepuller = PrePuller(ImageTracker(), "default", "prepull", 2, "busybox", 300, enabled=False)
+        with mock.patch("prepull.client.CoreV1Api") as api:
+            prepuller.start()
+            time.sleep(0.05)
+        api.assert_not_called()
+
+
+class PVCPoolTest(unittest.TestCase):
+
+    def test_manifest_is_indexed_until_claimed(self):
+        pool = PVCPool("default", "standard", "10Gi", count=2, access_mode="ReadWriteOnce")
+        manifest = pool.manifest({"ilyde.io/warm-state": "idle"})
+        self.assertEqual(manifest["spec"]["resources"]["requests"]["storage"], "10Gi")
+
+        pvc = client.V1PersistentVolumeClaim(metadata=client.V1ObjectMeta(**manifest["metadata"]))
+        self.assertEqual(pvc_pool_of(pvc), ["standard-10gi"])
+        pvc.metadata.labels["ilyde.io/warm-state"] = "claimed"
+        self.assertEqual(pvc_pool_of(pvc), [])
+
+    def test_claim_bound_first_after_conflict(self):
+        pvcs = [
+            client.V1PersistentVolumeClaim(
+                metadata=client.V1ObjectMeta(name=name, resource_version="1"),
+                status=client.V1PersistentVolumeClaimStatus(phase=phase))
+            for name, phase in [("pending", "Pending"), ("bound-1", "Bound"), ("bound-2", "Bound")]
+        ]
+        informer = mock.Mock()
+        informer.by_index.return_value = pvcs
+        manager = PVCPoolManager(FakeInformers({"pvcs": informer}))
+        with mock.patch("resourcepool.threading.Thread"):
+            manager.register("default", "standard", "10Gi", count=3)
+
+        def patch(name, namespace, body):
+            # another replica claimed bound-1 first
+            if name == "bound-1":
+                raise ApiException(status=409)
+            return next(pvc for pvc in pvcs if pvc.metadata.name == name)
+
+        with mock.patch("pvcpool.client.CoreV1Api") as api:
+            api.return_value.patch_namespaced_persistent_volume_claim.side_effect = patch
+            self.assertEqual(manager.claim("default", "standard", "10Gi", "ws-1"), ("bound-2", True))
+        pool = manager._get("default", "standard-10gi")
+        self.assertEqual((pool.hits.value, pool.conflicts.value), (1, 1))
+
+
+class DiscoveryTest(unittest.TestCase):
+
+    def test_route_to_discovered_version(self):
+        discovery = Discovery()
+        discovery._discover = lambda: {"cronjobs": ("batch", "v1")}
+        manifest = {"apiVersion": "batch/v1beta1", "kind": "CronJob"}
+        self.assertEqual(discovery.route("cronjobs", manifest), ("batch", "v1beta1"))
+        discovery.refresh()
+        self.assertEqual(discovery.route("cronjobs", manifest), ("batch", "v1"))
+        self.assertEqual(manifest["apiVersion"], "batch/v1")
+        self.assertEqual(discovery.resolve("ingressroutes"), ("traefik.containo.us", "v1alpha1"))
+
+    def test_failed_refresh_keeps_versions(self):
+        discovery = Discovery()
+        discovery._discover = lambda: {"ingressroutes": ("traefik.io", "v1alpha1")}
+        discovery.refresh()
+
+        def fail():
+            raise RuntimeError("unreachable")
+
+        discovery._discover = fail
+        discovery.refresh()
+        self.assertEqual(discovery.snapshot()["ingressroutes"], "traefik.io/v1alpha1")
+
+
+class FakeHealthServicer(object):
+
+    def __init__(self):
+        self.statuses = {}
+
+    def set(self, service, status):
+        self.statuses[service] = status
+
+
+class HealthProberTest(unittest.TestCase):
+
+    def setUp(self):
+        self.health = FakeHealthServicer()
+        self.router = ExecutorRouter({"read": (1, 1), "default": (1, 1)})
+        self.prober = HealthProber(self.health, ["kubespawner.KubeSpawnerServices"], self.router,
+                                   window=4, max_error_rate=0.5)
+
+    def test_api_server_errors(self):
+        with mock.patch("healthcheck.client.VersionApi") as api:
+            self.assertTrue(self.prober.probe())
+            api.return_value.get_code.side_effect = RuntimeError("unreachable")
+            # one failure is within the error rate of the window
+            self.assertTrue(self.prober.probe())
+            self.assertFalse(self.prober.probe())
+            api.return_value.get_code.side_effect = None
+            # the error rate of the window is back at the threshold
+            self.assertTrue(self.prober.probe())
+        self.assertEqual(self.health.statuses[""], SERVING)
+        self.assertEqual(self.health.statuses["kubernetes-api"], SERVING)
+        self.assertEqual(self.prober.snapshot()["kubernetes-api"]["error_rate"], 2 / 4)
+
+    def test_saturated_executor(self):
+        release = threading.Event()
+        occupy(self.router.pool_for("GetResourceStatus"), release, calls=2)
+        try:
+            with mock.patch("healthcheck.client.VersionApi"):
+                self.assertFalse(self.prober.probe())
+        finally:
+            release.set()
+        self.assertEqual(self.health.statuses["kubespawner.KubeSpawnerServices"], NOT_SERVING)
+        self.assertEqual(self.prober.snapshot()["executors"]["saturated"], ["read"])
+
+    def test_components_only(self):
+        router = ExecutorRouter({"stream": (1, 1), "default": (1, 1)})
+        informers = mock.Mock()
+        informers.snapshot.return_value = {"pods/tenant-1": {"synced": False}}
+        prober = HealthProber(self.health, ["kubespawner.KubeSpawnerServices"], router, informers)
+        release = threading.Event()
+        occupy(router.pool_for("StreamPodLogs"), release, calls=2)
+        try:
+            with mock.patch("healthcheck.client.VersionApi"):
+                # a saturated stream pool and an unsynced namespace are reported on their own
+                self.assertTrue(prober.probe())
+        finally:
+            release.set()
+        self.assertEqual(self.health.statuses["kubespawner.KubeSpawnerServices"], SERVING)
+        self.assertEqual(self.health.statuses["informers"], NOT_SERVING)
+        self.assertEqual(self.health.statuses["executors"], NOT_SERVING)
+
+
+class HedgedClient(KubeSpawnerClient):
+    """Answers the calls from a list of functions run on threads"""
+
+    def __init__(self, answers, hedge_delay):
+        super(HedgedClient, self).__init__(pool=ChannelPool("localhost:1", size=1), hedge_delay=hedge_delay)
+        self.answers = list(answers)
+        self.executor = futures.ThreadPoolExecutor(max_workers=2)
+
+    def future(self, method, request, timeout=None, metadata=None):
+        return self.executor.submit(self.answers.pop(0))
+
+
+class ClientTest(unittest.TestCase):
+
+    def test_default_timeouts(self):
+        self.assertEqual(default_timeout("GetResourceStatus"), 10)
+        self.assertIsNone(default_timeout("WaitForReady"))
+        self.assertEqual(default_timeout("Unknown"), 30)
+
+    def test_hedged_call_returns_first_answer(self):
+        slow = threading.Event()
+        client = HedgedClient([lambda: slow.wait(5) and "slow", lambda: "fast"], hedge_delay=0.01)
+        self.assertEqual(client._hedged("GetResourceStatus", None, 5, None), "fast")
+        slow.set()
+
+    def test_hedged_call_waits_for_other_call(self):
+        def fail():
+            raise RuntimeError("failed")
+
+        def answer():
+            time.sleep(0.05)
+            return "answer"
+
+        client = HedgedClient([answer, fail], hedge_delay=0.01)
+        self.assertEqual(client._hedged("GetResourceStatus", None, 5, None), "answer")
+
+        client = HedgedClient([fail], hedge_delay=1)
+        with self.assertRaises(RuntimeError):
+            client._hedged("GetResourceStatus", None, 5, None)
+
+    def test_close_shared_pool(self):
+        channel_patch = mock.patch("client.channels._sync_channel", side_effect=lambda *args: mock.Mock())
+        channel_patch.start()
+        self.addCleanup(channel_patch.stop)
+        first = KubeSpawnerClient("shared-pool-test:50051")
+        second = KubeSpawnerClient("shared-pool-test:50051")
+        own = KubeSpawnerClient(pool=ChannelPool("shared-pool-test:50051", size=1))
+        channels = first.pool.channels
+        self.assertIs(second.pool, first.pool)
+
+        first.close()
+        first.close()
+        own.close()
+        self.assertFalse(any(channel.close.called for channel in channels + own.pool.channels))
+        # the last client closes the channels, the next one gets new ones
+        second.close()
+        self.assertTrue(all(channel.close.called for channel in channels))
+        third = KubeSpawnerClient("shared-pool-test:50051")
+        self.assertIsNot(third.pool, first.pool)
+        third.close()
+
+    def test_shared_pool_keys(self):
+        channel_patch = mock.patch("client.channels._sync_channel", side_effect=lambda *args: mock.Mock())
+        channel_patch.start()
+        self.addCleanup(channel_patch.stop)
+        credentials = grpc.ssl_channel_credentials()
+        insecure = shared_pool("shared-pool-keys:50051")
+        secure = shared_pool("shared-pool-keys:50051", credentials=credentials)
+        tuned = shared_pool("shared-pool-keys:50051", options=[("grpc.keepalive_time_ms", 1000)])
+        self.assertEqual(len({id(insecure), id(secure), id(tuned)}), 3)
+        self.assertIs(shared_pool("shared-pool-keys:50051", credentials=credentials), secure)
+
+        release_pool(secure)
+        release_pool(tuned)
+        self.assertFalse(secure.channels[0].close.called)
+        self.assertTrue(tuned.channels[0].close.called)
+        for pool in (insecure, secure):
+            release_pool(pool)
+        self.assertTrue(secure.channels[0].close.called)
+        self.assertTrue(insecure.channels[0].close.called)
+
+
+class CountingClient(object):
+
+    def __init__(self):
+        self.calls = []
+
+    def get_resource_status(self, namespace, name, type):
+        self.calls.append((namespace, name, type))
+        return {"calls": len(self.calls)}
+
+
+class StatusCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.now = 0
+        self.client = CountingClient()
+        self.cache = StatusCache(self.client, ttl=1.0, max_entries=2, clock=lambda: self.now)
+
+    def test_ttl(self):
+        self.assertEqual(self.cache.get("default", "ws", "DEPLOYMENT"), {"calls": 1})
+        self.assertEqual(self.cache.get("default", "ws", "DEPLOYMENT"), {"calls": 1})
+        self.now = 1.5
+        self.assertEqual(self.cache.get("default", "ws", "DEPLOYMENT"), {"calls": 2})
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 2))
+
+    def test_lru_eviction(self):
+        self.cache.get("default", "a", "POD")
+        self.cache.get("default", "b", "POD")
+        self.cache.get("default", "a", "POD")
+        self.cache.get("default", "c", "POD")
+        self.cache.get("default", "a", "POD")
+        self.cache.get("default", "b", "POD")
+        self.assertEqual([call[1] for call in self.client.calls], ["a", "b", "c", "b"])
+
+    def test_invalidate(self):
+        self.cache.get("default", "a", "POD")
+        self.cache.get("default", "b", "JOB")
+        self.cache.invalidate("default", "a", "POD")
+        self.assertEqual(len(self.cache), 1)
+        self.cache.invalidate("default")
+        self.assertEqual(len(self.cache), 0)
+
+
+class FakeInformers(object):
+
+    def __init__(self, informers):
+        self.informers = informers
+
+    def get(self, kind, namespace, wait=True):
+        return self.informers[kind]
+
+    def add_indexer(self, kind, index, func):
+        pass
+
+
+class UsagePollerTest(unittest.TestCase):
+
+    def test_pod_usage(self):
+        self.assertEqual(pod_usage({"containers": [{"usage": {"cpu": "250m", "memory": "1Mi"}},
+                                                   {"usage": {"cpu": "1500000n", "memory": "1Ki"}}]}),
+                         (0.2515, 1049600))
+
+    def test_usage_by_owner(self):
+        pods = client.V1PodList(metadata=client.V1ListMeta(resource_version="1"), items=[
+            make_pod("ws-5d8f-a", "ReplicaSet", "ws-5d8f", template_hash="5d8f"),
+            make_pod("ws-5d8f-b", "ReplicaSet", "ws-5d8f", template_hash="5d8f"),
+            make_pod("job-1-x", "Job", "job-1")])
+        informer = Informer("pods", lambda namespace: pods, "default")
+        informer._relist()
+        metrics = {"items": [{"metadata": {"name": pod.metadata.name},
+                              "containers": [{"usage": {"cpu": "100m", "memory": "10Mi"}}]}
+                             for pod in pods.items]}
+
+        poller = UsagePoller(FakeInformers({"pods": informer}), history=2)
+        with mock.patch("usage.client.CustomObjectsApi") as api:
+            api.return_value.list_namespaced_custom_object.return_value = metrics
+            for _ in range(3):
+                poller.poll("default")
+            samples = poller._samples[("default", "Deployment", "ws")]
+            self.assertEqual(len(samples), 2)
+            self.assertEqual((round(samples[-1].cpu_cores, 3), samples[-1].pods), (0.2, 2))
+
+            metrics["items"].pop()
+            poller.poll("default")
+        self.assertNotIn(("default", "Job", "job-1"), poller._samples)
+
+    def test_first_poll_failed(self):
+        informer = synced_informer("pods", [make_pod("ws-5d8f-a", "ReplicaSet", "ws-5d8f", template_hash="5d8f")])
+        poller = UsagePoller(FakeInformers({"pods": informer}), interval=30)
+        servicer = server.KubeSpawnerServicer.__new__(server.KubeSpawnerServicer)
+        servicer.usage = poller
+        context = mock.Mock()
+        context.abort.side_effect = grpc.RpcError
+        request = kubespawner_pb2.Resource(namespace="default", name="ws", type="DEPLOYMENT")
+        with mock.patch("usage.client.CustomObjectsApi") as api:
+            api.return_value.list_namespaced_custom_object.side_effect = ApiException(status=503)
+            with self.assertRaises(grpc.RpcError):
+                servicer.GetResourceUsage(request, context)
+            context.abort.assert_called_once()
+            self.assertEqual(context.abort.call_args[0][0], grpc.StatusCode.UNAVAILABLE)
+
+            # polled again by the next request
+            api.return_value.list_namespaced_custom_object.side_effect = None
+            api.return_value.list_namespaced_custom_object.return_value = {"items": [
+                {"metadata": {"name": "ws-5d8f-a"}, "containers": [{"usage": {"cpu": "1", "memory": "1Mi"}}]}]}
+            response = servicer.GetResourceUsage(request, context)
+        self.assertEqual(len(response.samples), 1)
+
+        poller.stop()
+        poller._thread.join(5)
+        self.assertFalse(poller._thread.is_alive())
+
+
+def synced_informer(kind, items):
+    informer = Informer(kind, lambda namespace: mock.Mock(
+        items=items, metadata=client.V1ListMeta(resource_version="1")), "default")
+    informer._relist()
+    return informer
+
+
+def deployment_manifest(replicas, resources):
+    return {"apiVersion": "apps/v1", "kind": "Deployment", "metadata": {"name": "ws"},
+            "spec": {"replicas": replicas, "template": {"spec": {"containers": [
+                {"name": "notebook", "image": "jupyter", "resources": resources}]}}}}
+
+
+class QuotaCheckerTest(unittest.TestCase):
+
+    def setUp(self):
+        quota = client.V1ResourceQuota(
+            metadata=client.V1ObjectMeta(name="compute"),
+            spec=client.V1ResourceQuotaSpec(hard={"requests.cpu": "2", "limits.memory": "4Gi", "pods": "10"}),
+            status=client.V1ResourceQuotaStatus(hard={"requests.cpu": "2", "limits.memory": "4Gi", "pods": "10"},
+                                                used={"requests.cpu": "1800m", "limits.memory": "1Gi", "pods": "3"}))
+        limit_range = client.V1LimitRange(
+            metadata=client.V1ObjectMeta(name="defaults"),
+            spec=client.V1LimitRangeSpec(limits=[client.V1LimitRangeItem(
+                type="Container", default={"memory": "512Mi"}, default_request={"cpu": "100m"},
+                max={"memory": "2Gi"})]))
+        self.checker = QuotaChecker(FakeInformers({
+            "resourcequotas": synced_informer("resourcequotas", [quota]),
+            "limitranges": synced_informer("limitranges", [limit_range])}))
+
+    def test_defaults_fit(self):
+        # 100m cpu and 512Mi from the limit range defaults
+        self.checker.check("default", deployment_manifest(1, {}))
+
+    def test_copies_add_up(self):
+        # 100m from the limit range defaults fits the 200m left twice, not three times
+        self.checker.check("default", deployment_manifest(1, {}), count=2)
+        with self.assertRaises(QuotaExceeded) as raised:
+            self.checker.check("default", deployment_manifest(1, {}), count=3)
+        self.assertIn("3 pods needs 300m requests.cpu", str(raised.exception))
+
+    def test_quota_exceeded(self):
+        with self.assertRaises(QuotaExceeded) as raised:
+            self.checker.check("default", deployment_manifest(1, {"requests": {"cpu": "500m"}}))
+        self.assertIn("500m requests.cpu", str(raised.exception))
+        self.assertIn("200m of 2000m left", str(raised.exception))
+
+    def test_limit_range(self):
+        with self.assertRaises(LimitRangeViolation):
+            self.checker.check("default", deployment_manifest(1, {"limits": {"memory": "3Gi"}}))
+
+    def test_let_through_while_loading(self):
+        informers = FakeInformers({"resourcequotas": Informer("resourcequotas", None, "default"),
+                                   "limitranges": Informer("limitranges", None, "default")})
+        QuotaChecker(informers).check("default", deployment_manifest(1, {"requests": {"cpu": "64"}}))
+
+
+class FakeCustomObjects(object):
+    """IngressRoutes in a dict, with resource versions"""
+
+    def __init__(self):
+        self.objects = {}
+        self.writes = 0
+        self.lists = 0
+
+    def get_namespaced_custom_object(self, name, **kwargs):
+        if name not in self.objects:
+            raise ApiException(status=404)
+        return json.loads(json.dumps(self.objects[name]))
+
+    def list_namespaced_custom_object(self, **kwargs):
+        self.lists += 1
+        return {"items": [json.loads(json.dumps(obj)) for obj in self.objects.values()]}
+
+    def create_namespaced_custom_object(self, body, **kwargs):
+        self.writes += 1
+        body["metadata"]["resourceVersion"] = "1"
+        self.objects[body["metadata"]["name"]] = body
+
+    def patch_namespaced_custom_object(self, name, body, **kwargs):
+        self.writes += 1
+        obj = self.objects[name]
+        for key, value in body["metadata"]["annotations"].items():
+            if value is None:
+                obj["metadata"]["annotations"].pop(key, None)
+            else:
+                obj["metadata"]["annotations"][key] = value
+        obj["spec"]["routes"] = body["spec"]["routes"]
+        obj["metadata"]["resourceVersion"] = str(int(obj["metadata"]["resourceVersion"]) + 1)
+
+    def delete_namespaced_custom_object(self, name, **kwargs):
+        if name not in self.objects:
+            raise ApiException(status=404)
+        self.writes += 1
+        del self.objects[name]
+
+
+def ingress_manifest(name):
+    return {"kind": "IngressRoute", "metadata": {"name": name},
+            "spec": {"entryPoints": ["web"], "routes": [{"match": "PathPrefix(`/{}`)".format(name), "kind": "Rule"}]}}
+
+
+class IngressRouteAggregatorTest(unittest.TestCase):
+
+    def test_batched_writes(self):
+        api = FakeCustomObjects()
+        aggregator = IngressRouteAggregator(Discovery(), shards=1, debounce=0.1)
+        with mock.patch("ingressroutes.client.CustomObjectsApi", return_value=api):
+            with futures.ThreadPoolExecutor(max_workers=10) as executor:
+                names = list(executor.map(
+                    lambda i: aggregator.add("default", ingress_manifest("ws-{}".format(i))), range(10)))
+            self.assertEqual(len(set(names)), 1)
+            self.assertLess(api.writes, 10)
+
+            aggregate = api.objects[names[0]]
+            self.assertEqual(len(aggregate["spec"]["routes"]), 10)
+            self.assertEqual(aggregate["spec"]["entryPoints"], ["web"])
+
+            self.assertTrue(aggregator.remove("default", "ws-3"))
+            self.assertNotIn("ws-3", members_of(api.objects[names[0]]))
+            # already removed, looked up in the aggregates
+            self.assertFalse(aggregator.remove("default", "ws-3"))
+            for i in range(10):
+                if i != 3:
+                    aggregator.remove("default", "ws-{}".format(i))
+            # an IngressRoute without routes is deleted
+            self.assertEqual(api.objects, {})
+
+    def test_patches_counted_once_written(self):
+        api = FakeCustomObjects()
+        aggregator = IngressRouteAggregator(Discovery(), shards=1, debounce=0.01)
+        patches = aggregator.patches.value
+        with mock.patch("ingressroutes.client.CustomObjectsApi", return_value=api):
+            with mock.patch.object(api, "patch_namespaced_custom_object",
+                                   side_effect=[ApiException(status=409), None]):
+                aggregator.add("default", ingress_manifest("ws-1"))
+                aggregator.add("default", ingress_manifest("ws-2"))
+        # the create, then one patch after a conflict
+        self.assertEqual(aggregator.patches.value - patches, 2)
+
+
+class DeleteIngressTest(unittest.TestCase):
+
+    def delete(self, servicer, name):
+        return servicer.DeleteIngress(kubespawner_pb2.Resource(
+            namespace="default", name=name, type="INGRESS"), mock.Mock())
+
+    def test_aggregated(self):
+        api = FakeCustomObjects()
+        servicer = server.KubeSpawnerServicer.__new__(server.KubeSpawnerServicer)
+        servicer.discovery = Discovery()
+        servicer.ingress_routes = IngressRouteAggregator(Discovery(), shards=1, debounce=0.01)
+        other_replica = IngressRouteAggregator(Discovery(), shards=1, debounce=0.01)
+        api.objects["old"] = ingress_manifest("old")
+        with mock.patch("ingressroutes.client.CustomObjectsApi", return_value=api), \
+                mock.patch("server.client.CustomObjectsApi", return_value=api):
+            aggregate = servicer.ingress_routes.add("default", ingress_manifest("ws-1"))
+            other_replica.add("default", ingress_manifest("ws-2"))
+
+            # known members and objects of their own are deleted without listing the aggregates
+            self.assertEqual(self.delete(servicer, "ws-1").status, 200)
+            self.assertEqual(self.delete(servicer, "old").status, 200)
+            self.assertEqual(api.lists, 0)
+            self.assertNotIn("old", api.objects)
+
+            # added by another replica
+            self.assertEqual(self.delete(servicer, "ws-2").status, 200)
+            self.assertEqual(api.lists, 1)
+            self.assertNotIn(aggregate, api.objects)
+
+            with self.assertRaises(ApiException):
+                self.delete(servicer, "ws-3")
+
+    def test_full_aggregate(self):
+        api = FakeCustomObjects()
+        aggregator = IngressRouteAggregator(Discovery(), shards=1, debounce=0.01, max_members=2)
+        long_name = "workspace-" + "x" * 200
+        with mock.patch("ingressroutes.client.CustomObjectsApi", return_value=api):
+            aggregate = aggregator.add("default", ingress_manifest(long_name))
+            aggregator.add("default", ingress_manifest("ws-1"))
+            with self.assertRaises(AggregateFull):
+                aggregator.add("default", ingress_manifest("ws-2"))
+            # members already in the aggregate can still change
+            aggregator.add("default", ingress_manifest("ws-1"))
+
+        annotations = api.objects[aggregate]["metadata"]["annotations"]
+        self.assertTrue(all(len(key.split("/")[1]) <= 63 for key in annotations))
+        # the routes are only stored in spec.routes
+        self.assertNotIn("PathPrefix", json.dumps(annotations))
+        self.assertEqual(members_of(api.objects[aggregate])["ws-1"][0]["match"], "PathPrefix(`/ws-1`)")
+
+
+class ScaleSerializerTest(unittest.TestCase):
+
+    def test_zero_replicas(self):
+        request = kubespawner_pb2.ScaleRequest(items=[
+            kubespawner_pb2.ScaleItem(namespace="default", name="ws-1", replicas=0),
+            kubespawner_pb2.ScaleItem(namespace="default", name="ws-2", replicas=2)])
+        data = ScaleSerializer().load(protobuf_to_dict(request))
+        self.assertEqual([item["replicas"] for item in data["items"]], [0, 2])
+
+
+class ScaleDeploymentsTest(unittest.TestCase):
+
+    def test_one_failure(self):
+        def patch_scale(name, namespace, body):
+            if name == "ws-2":
+                raise ApiException(status=404, reason="Not Found")
+            return client.V1Scale(spec=client.V1ScaleSpec(replicas=body["spec"]["replicas"]))
+
+        servicer = server.KubeSpawnerServicer.__new__(server.KubeSpawnerServicer)
+        servicer.scaler = futures.ThreadPoolExecutor(max_workers=2)
+        servicer.scale_api = mock.Mock()
+        servicer.scale_api.patch_namespaced_deployment_scale.side_effect = patch_scale
+        response = servicer.ScaleDeployments(kubespawner_pb2.ScaleRequest(items=[
+            kubespawner_pb2.ScaleItem(namespace="default", name=name, replicas=replicas)
+            for name, replicas in (("ws-1", 0), ("ws-2", 2), ("ws-3", 3))]), mock.Mock())
+
+        self.assertEqual([(result.name, result.status, result.replicas) for result in response.results],
+                         [("ws-1", 200, 0), ("ws-2", 404, 0), ("ws-3", 200, 3)])
+        self.assertEqual(response.failed, 1)
+        self.assertEqual(response.results[1].message, "404 Not Found")
+
+
+JOB_TEMPLATE = """
+apiVersion: batch/v1
+kind: Job
+metadata:
+  name: sweep
+spec:
+  backoffLimit: ${retries}
+  template:
+    spec:
+      restartPolicy: Never
+      containers:
+      - name: train
+        image: trainer:${version}
+        args: ["--lr", "${lr}", "--seed", "${index}", "--out", "${bucket}"]
+"""
+
+
+class JobArrayTest(unittest.TestCase):
+
+    def load(self, mode):
+        parameters = []
+        for lr in (0.1, 0.01):
+            s = Struct()
+            s.update({"lr": lr, "retries": 2, "version": "1.0"})
+            parameters.append(s)
+        request = kubespawner_pb2.JobArray(namespace="default", template=JOB_TEMPLATE,
+                                           parameters=parameters, mode=mode)
+        return JobArraySerializer().load(protobuf_to_dict(request))
+
+    def test_jobs(self):
+        data = self.load("")
+        self.assertEqual(data["mode"], "jobs")
+        jobs = array_jobs(load_template(data["template"]), data["parameters"])
+
+        self.assertEqual([job["metadata"]["name"] for job in jobs], ["sweep-0", "sweep-1"])
+        self.assertEqual(jobs[1]["metadata"]["labels"], {ARRAY_LABEL: "sweep", INDEX_LABEL: "1"})
+        self.assertEqual(jobs[1]["spec"]["template"]["metadata"]["labels"][INDEX_LABEL], "1")
+        # an unquoted placeholder keeps the type of its value, Struct numbers are floats
+        self.assertEqual(jobs[0]["spec"]["backoffLimit"], 2)
+        container = jobs[1]["spec"]["template"]["spec"]["containers"][0]
+        self.assertEqual(container["image"], "trainer:1.0")
+        # unknown placeholders are left alone
+        self.assertEqual(container["args"], ["--lr", "0.01", "--seed", "1", "--out", "${bucket}"])
+
+    def test_indexed(self):
+        data = self.load("indexed")
+        job = indexed_job(load_template(data["template"]), data["parameters"])
+
+        self.assertEqual(job["metadata"]["name"], "sweep")
+        self.assertEqual(job["spec"]["backoffLimit"], 2)
+        self.assertEqual(job["spec"]["template"]["spec"]["containers"][0]["args"][1], "${lr}")
+        self.assertEqual((job["spec"]["completionMode"], job["spec"]["completions"], job["spec"]["parallelism"]),
+                         ("Indexed", 2, 2))
+        env = job["spec"]["template"]["spec"]["containers"][0]["env"]
+        self.assertEqual(env[0]["name"], PARAMETERS_ENV)
+        self.assertEqual(json.loads(env[0]["value"])[1], {"lr": 0.01, "retries": 2, "version": "1.0"})
+
+    def test_templated_names(self):
+        data = self.load("indexed")
+        template = load_template(data["template"].replace("name: sweep", "name: sweep-${index}"))
+        with self.assertRaises(ValueError):
+            indexed_job(template, data["parameters"])
+        jobs = array_jobs(template, data["parameters"])
+        self.assertEqual([job["metadata"]["name"] for job in jobs], ["sweep-0", "sweep-1"])
+        self.assertEqual(jobs[0]["metadata"]["labels"][ARRAY_LABEL], "sweep")
+
+    def test_long_names(self):
+        data = self.load("")
+        long_name = "sweep-" + "x" * 80
+        template = load_template(data["template"].replace("name: sweep", "generateName: {}-".format(long_name)))
+        label = array_jobs(template, data["parameters"])[0]["metadata"]["labels"][ARRAY_LABEL]
+        self.assertEqual(len(label), 63)
+        self.assertTrue(label.startswith("sweep-xxx"))
+        other = load_template(data["template"].replace("name: sweep", "name: {}y".format(long_name)))
+        self.assertNotEqual(array_jobs(other, data["parameters"])[0]["metadata"]["labels"][ARRAY_LABEL], label)
+
+
+class PatcherTest(unittest.TestCase):
+
+    def test_invalid_patches(self):
+        patcher = Patcher(Discovery())
+        with self.assertRaises(ValueError):
+            patcher.patch(ResourceType.DEPLOYMENT, "default", "ws", "json", {"spec": {}})
+        with self.assertRaises(ValueError):
+            patcher.patch(ResourceType.INGRESS, "default", "ws", "strategic", {"spec": {}})
+        with self.assertRaises(ValueError):
+            patcher.patch(ResourceType.PVC, "default", "data", "merge", {"spec": {}})
+
+    def test_content_type(self):
+        patcher = Patcher(Discovery())
+        with mock.patch("kubernetes.client.rest.RESTClientObject.request",
+                        side_effect=ApiException(status=404)) as request:
+            with self.assertRaises(ApiException):
+                patcher.patch(ResourceType.CRONJOB, "default", "nightly", "strategic", {"spec": {"suspend": True}})
+        self.assertEqual(request.call_args[1]["headers"]["Content-Type"], "application/strategic-merge-patch+json")
+
+
+class LoggingTest(unittest.TestCase):
+
+    def record(self, level, msg, *args):
+        return logging.LogRecord("kubespawner", level, __file__, 1, msg, args, None)
+
+    def test_rate_limit(self):
+        limit = RateLimitFilter(burst=2, interval=60)
+        passed = [limit.filter(self.record(logging.ERROR, "failed %s", i)) for i in range(5)]
+        self.assertEqual(passed, [True, True, False, False, False])
+        self.assertTrue(limit.filter(self.record(logging.ERROR, "other")))
+        self.assertTrue(limit.filter(self.record(logging.INFO, "failed %s", 6)))
+
+        limit._windows[("kubespawner", "failed %s")][0] -= 61
+        record = self.record(logging.ERROR, "failed %s", 7)
+        self.assertTrue(limit.filter(record))
+        self.assertEqual(record.suppressed, 3)
+
+    def test_json_format(self):
+        line = JsonFormatter().format(self.record(logging.WARNING, "pool %s is empty", "python"))
+        self.assertEqual(json.loads(line)["message"], "pool python is empty")
+        self.assertEqual(parse_levels("urllib3=warning, kubernetes=INFO"),
+                         {"urllib3": "WARNING", "kubernetes": "INFO"})
+
+
+class RecordingTest(unittest.TestCase):
+
+    def test_record_and_read(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "calls.rec")
+            writer = RecordWriter(path)
+            interceptor = RecordingInterceptor(writer)
+            context = mock.Mock()
+            request = kubespawner_pb2.Resource(namespace="default", name="ws", type="DEPLOYMENT")
+
+            interceptor.intercept(lambda r, c: kubespawner_pb2.Status(status=200), request, context,
+                                  "/kubespawner.KubeSpawnerServices/GetResourceStatus")
+
+            def stream(r, c):
+                yield kubespawner_pb2.Resource()
+                c.set_code(grpc.StatusCode.NOT_FOUND)
+            responses = interceptor.intercept(stream, request, context,
+                                              "/kubespawner.KubeSpawnerServices/WatchStatusChanges")
+            self.assertEqual(len(list(responses)), 1)
+            writer.close()
+
+            records = list(read_records(path))
+        self.assertEqual([(r.method.rpartition("/")[2], r.code, r.streaming) for r in records],
+                         [("GetResourceStatus", grpc.StatusCode.OK, False),
+                          ("WatchStatusChanges", grpc.StatusCode.NOT_FOUND, True)])
+        self.assertEqual(kubespawner_pb2.Resource.FromString(records[0].request), request)
+        context.set_code.assert_called_once_with(grpc.StatusCode.NOT_FOUND)
+
+
+def busy_rpc(stop):
+    with tagged("/kubespawner.KubeSpawnerServices/GetResourceStatus"):
+        while not stop.is_set():
+            sum(range(1000))
+
+
+class ProfilerTest(unittest.TestCase):
+
+    def test_samples_tagged_threads(self):
+        stop = threading.Event()
+        thread = threading.Thread(target=busy_rpc, args=(stop,))
+        thread.start()
+        try:
+            profiler = SamplingProfiler(interval=0.005).run(0.2)
+        finally:
+            stop.set()
+            thread.join()
+
+        self.assertEqual(list(profiler.samples_by_method()), ["GetResourceStatus"])
+        self.assertIn(b"tests.py:busy_rpc", profiler.collapsed())
+
+        with tempfile.NamedTemporaryFile() as f:
+            f.write(profiler.pstats())
+            f.flush()
+            stats = pstats.Stats(f.name).stats
+        self.assertEqual(stats[("<rpc>", 0, "GetResourceStatus")][0], profiler.samples)
+
+
+class EchoServicer(kubespawner_pb2_grpc.KubeSpawnerServicesServicer):
+
+    def __init__(self):
+        self.cancelled = threading.Event()
+
+    def GetResourceStatus(self, request, context):
+        if request.name == "missing":
+            context.abort(grpc.StatusCode.NOT_FOUND, "no deployment missing")
+        return kubespawner_pb2.Status(status=200, message=request.name)
+
+    def WatchStatusChanges(self, request, context):
+        context.add_callback(self.cancelled.set)
+        while not self.cancelled.is_set():
+            yield kubespawner_pb2.Resource(namespace=request.namespace, name="ws-1")
+
+
+class InProcessStubTest(unittest.TestCase):
+
+    def test_calls(self):
+        servicer = EchoServicer()
+        stub = InProcessStub(servicer)
+        request = kubespawner_pb2.Resource(namespace="default", name="ws-1")
+        self.assertEqual(stub.GetResourceStatus(request, timeout=1).message, "ws-1")
+
+        with self.assertRaises(grpc.RpcError) as raised:
+            stub.GetResourceStatus(kubespawner_pb2.Resource(name="missing"))
+        self.assertEqual(raised.exception.code(), grpc.StatusCode.NOT_FOUND)
+        with self.assertRaises(grpc.RpcError) as raised:
+            stub.DeleteJob(request)
+        self.assertEqual(raised.exception.code(), grpc.StatusCode.UNIMPLEMENTED)
+
+        # cancelling a stream runs the callbacks of the servicer
+        stream = stub.WatchStatusChanges(kubespawner_pb2.StatusWatch(namespace="default"))
+        self.assertEqual(next(stream).name, "ws-1")
+        stream.cancel()
+        self.assertTrue(servicer.cancelled.is_set())
+        with self.assertRaises(grpc.RpcError) as raised:
+            next(stream)
+        self.assertEqual(raised.exception.code(), grpc.StatusCode.CANCELLED)
+
+
 if __name__ == '__main__':
     logger.info("tests KubeSpawnerServicer")
     unittest.main(verbosity=2)
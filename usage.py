@@ -0,0 +1,158 @@
+# encoding: utf-8
+#
+# Copyright (c) 2020-2021 Hopenly srl.
+#
+# This file is part of Ilyde.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import collections
+import logging
+import threading
+import time
+
+from kubernetes import client
+from kubernetes.utils import parse_quantity
+
+from metrics import REGISTRY
+from watches import pod_owners
+
+logger = logging.getLogger(__name__)
+
+# kinds whose usage is aggregated from their pods
+OWNER_KINDS = ("Deployment", "Job")
+
+Sample = collections.namedtuple("Sample", ["timestamp", "cpu_cores", "memory_bytes", "pods"])
+
+
+class NotPolled(Exception):
+    """no poll of the namespace succeeded yet, its usage is unknown"""
+
+
+def pod_usage(pod_metrics):
+    """(cpu cores, memory bytes) of a PodMetrics, summed over its containers"""
+    cpu, memory = 0.0, 0
+    for container in pod_metrics.get("containers") or []:
+        usage = container.get("usage") or {}
+        cpu += float(parse_quantity(usage.get("cpu", "0")))
+        memory += int(parse_quantity(usage.get("memory", "0")))
+    return cpu, memory
+
+
+class UsagePoller(object):
+    """Polls the pod metrics of metrics.k8s.io once per interval for each
+    namespace asked about recently, and keeps the last samples of every
+    Deployment and Job in a ring buffer. Pods are mapped to their owner with
+    the shared pod watch.
+    """
+
+    def __init__(self, informers, interval=30, history=20, idle_timeout=600):
+        self._informers = informers
+        self._interval = interval
+        self._history = history
+        self._idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        # namespace -> last time it was asked about
+        self._namespaces = {}
+        # namespaces polled successfully at least once
+        self._polled = set()
+        # (namespace, kind, name) -> deque of Sample
+        self._samples = {}
+        self._thread = None
+        self._stopped = threading.Event()
+        self.polls = REGISTRY.counter("usage.polls")
+        self.failures = REGISTRY.counter("usage.failures")
+        self.poll_time = REGISTRY.summary("usage.poll_seconds")
+
+    def usage(self, namespace, kind, name):
+        """Returns the samples of a Deployment or Job, oldest first. A
+        namespace no poll succeeded for yet is polled right away.
+
+        Raises:
+            NotPolled: the poll failed
+        """
+        with self._lock:
+            first = namespace not in self._polled
+            self._namespaces[namespace] = time.monotonic()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="usage-poller", daemon=True)
+                self._thread.start()
+        if first:
+            try:
+                self.poll(namespace)
+            except Exception as e:
+                self.failures.inc()
+                logger.error("usage poll of namespace %s failed: %s", namespace, e)
+                raise NotPolled("usage of namespace {} is not known yet: {}".format(namespace, e))
+        with self._lock:
+            return list(self._samples.get((namespace, kind, name), ()))
+
+    def stop(self):
+        self._stopped.set()
+
+    def _run(self):
+        while not self._stopped.wait(self._interval):
+            now = time.monotonic()
+            with self._lock:
+                for namespace, last_used in list(self._namespaces.items()):
+                    if now - last_used > self._idle_timeout:
+                        del self._namespaces[namespace]
+                        self._polled.discard(namespace)
+                        self._drop(namespace, keep=())
+                namespaces = list(self._namespaces)
+            for namespace in namespaces:
+                try:
+                    self.poll(namespace)
+                except Exception as e:
+                    self.failures.inc()
+                    logger.error("usage poll of namespace %s failed: %s", namespace, e)
+
+    def poll(self, namespace):
+        started = time.monotonic()
+        metrics = client.CustomObjectsApi().list_namespaced_custom_object(
+            group="metrics.k8s.io", version="v1beta1", namespace=namespace, plural="pods")
+        pods = self._informers.get("pods", namespace)
+
+        totals = {}
+        for pod_metrics in metrics.get("items", []):
+            pod = pods.get(pod_metrics["metadata"]["name"])
+            if pod is None:
+                continue
+            cpu, memory = pod_usage(pod_metrics)
+            for kind, name in pod_owners(pod):
+                if kind in OWNER_KINDS:
+                    total = totals.setdefault((namespace, kind, name), [0.0, 0, 0])
+                    total[0] += cpu
+                    total[1] += memory
+                    total[2] += 1
+
+        timestamp = time.time()
+        with self._lock:
+            for key, (cpu, memory, count) in totals.items():
+                samples = self._samples.get(key)
+                if samples is None:
+                    samples = self._samples[key] = collections.deque(maxlen=self._history)
+                samples.append(Sample(timestamp, cpu, memory, count))
+            # resources without running pods are gone or scaled down
+            self._drop(namespace, keep=totals)
+            self._polled.add(namespace)
+        self.polls.inc()
+        self.poll_time.observe(time.monotonic() - started)
+
+    def _drop(self, namespace, keep):
+        for key in [key for key in self._samples if key[0] == namespace and key not in keep]:
+            del self._samples[key]
+
+    def snapshot(self):
+        with self._lock:
+            return {"namespaces": len(self._namespaces), "resources": len(self._samples)}
@@ -0,0 +1,204 @@
+# encoding: utf-8
+#
+# Copyright (c) 2020-2021 Hopenly srl.
+#
+# This file is part of Ilyde.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import copy
+import logging
+import time
+import uuid
+
+from kubernetes import client
+from kubernetes.client.rest import ApiException
+
+from metrics import REGISTRY
+from resourcepool import Pool, PoolManager, STATE_LABEL, IDLE, HTTP_CONFLICT
+
+logger = logging.getLogger(__name__)
+
+# labels of the deployments managed by the warm pools, next to STATE_LABEL and WORKSPACE_LABEL
+POOL_LABEL = "ilyde.io/warm-pool"
+# set on the deployment, its selector and its pods: the Service of a claimed
+# workspace selects its pods with it, so claiming never restarts the pod
+ID_LABEL = "ilyde.io/warm-id"
+
+
+def pool_of(deployment):
+    """index of the idle warm deployments by pool"""
+    labels = deployment.metadata.labels or {}
+    if labels.get(STATE_LABEL) == IDLE and POOL_LABEL in labels:
+        return [labels[POOL_LABEL]]
+    return []
+
+
+class WarmPool(Pool):
+    """Definition and counters of the warm pool of a profile"""
+
+    metric_prefix = "warmpool"
+
+    def __init__(self, namespace, profile, template, size, min_size, idle_timeout):
+        super(WarmPool, self).__init__(namespace, profile)
+        self.profile = profile
+        self.template = template
+        self.size = size
+        self.min_size = min_size
+        self.idle_timeout = idle_timeout
+        self.last_claim = time.monotonic()
+        self.evictions = REGISTRY.counter(self.metric("evictions"))
+        self.idle = REGISTRY.gauge(self.metric("idle"))
+
+    @property
+    def target(self):
+        """number of idle deployments to keep, a pool nobody claimed from
+        for idle_timeout shrinks down to min_size"""
+        if time.monotonic() - self.last_claim > self.idle_timeout:
+            return self.min_size
+        return self.size
+
+    def manifest(self, labels):
+        """deployment manifest of a new member of the pool"""
+        warm_id = uuid.uuid4().hex[:10]
+        manifest = copy.deepcopy(self.template)
+        metadata = manifest.setdefault("metadata", {})
+        metadata["name"] = "warm-{}-{}".format(self.profile, warm_id)
+        metadata_labels = metadata.setdefault("labels", {})
+        metadata_labels.update(labels)
+        metadata_labels.update({POOL_LABEL: self.profile, ID_LABEL: warm_id})
+
+        spec = manifest.setdefault("spec", {})
+        spec["replicas"] = 1
+        spec.setdefault("selector", {}).setdefault("matchLabels", {})[ID_LABEL] = warm_id
+        template_metadata = spec.setdefault("template", {}).setdefault("metadata", {})
+        template_metadata.setdefault("labels", {})[ID_LABEL] = warm_id
+        return manifest
+
+
+class WarmPoolManager(PoolManager):
+    """Keeps idle, already started workspace deployments per profile so that a
+    spawn only has to claim one and attach its Service and IngressRoute.
+
+    Pools are refilled and evicted asynchronously by a background thread. The
+    idle deployments are tracked through the shared deployments watch.
+    """
+
+    kind = "deployments"
+    index = "warm_pool"
+    indexer = staticmethod(pool_of)
+
+    def __init__(self, informers, spawner, is_ready, interval=10, max_creates=5):
+        """
+        Args:
+            informers: watches.InformerFactory
+            spawner: workspaces.WorkspaceSpawner, used to attach Service and IngressRoute
+            is_ready: function(deployment) telling whether a deployment is available
+            interval: seconds between two refills
+            max_creates: deployments created per pool and refill, limits bursts
+        """
+        super(WarmPoolManager, self).__init__(informers, interval, max_creates)
+        self._spawner = spawner
+        self._is_ready = is_ready
+
+    def register(self, namespace, profile, template, size, min_size=0, idle_timeout=3600):
+        self._add(WarmPool(namespace, profile, template, size, min_size, idle_timeout))
+
+    def pool(self, namespace, profile):
+        return self._get(namespace, profile)
+
+    def claim(self, namespace, profile, workspace, service=None, ingress=None):
+        """Claims an idle deployment of the pool for workspace, or creates one when
+        the pool is empty, then attaches the Service and IngressRoute.
+
+        Returns:
+            (deployment, hit, steps)
+        Raises:
+            KeyError: no pool for profile
+            workspaces.SpawnError
+        """
+        pool = self.pool(namespace, profile)
+        if pool is None:
+            raise KeyError("no warm pool {} in namespace {}".format(profile, namespace))
+
+        started = time.monotonic()
+        pool.last_claim = started
+        deployment, hit = self._claim(pool, workspace)
+
+        # the Service targets the pods of this deployment only
+        if service is not None:
+            service.setdefault("spec", {})["selector"] = {ID_LABEL: deployment.metadata.labels[ID_LABEL]}
+        try:
+            steps = self._spawner.attach(namespace, deployment, service=service, ingress=ingress)
+        except Exception:
+            # do not give the half configured deployment to anybody else
+            self._delete(namespace, deployment.metadata.name)
+            raise
+
+        pool.claim_time.observe(time.monotonic() - started)
+        return deployment, hit, steps
+
+    def _candidates(self, idle):
+        return [deployment for deployment in idle if self._is_ready(deployment)]
+
+    def _patch(self, namespace, name, body):
+        return client.AppsV1Api().patch_namespaced_deployment(name=name, namespace=namespace, body=body)
+
+    def _create(self, pool, labels):
+        return client.AppsV1Api().create_namespaced_deployment(namespace=pool.namespace, body=pool.manifest(labels))
+
+    def refill(self, pool):
+        """creates the missing idle deployments of a pool and evicts the extra ones"""
+        idle = sorted(self._idle(pool), key=lambda deployment: deployment.metadata.creation_timestamp)
+        pool.idle.set(len(idle))
+        target = pool.target
+
+        for _ in range(min(target - len(idle) - len(pool.pending), self._max_creates)):
+            pool.add_pending(self._create(pool, {STATE_LABEL: IDLE}).metadata.name)
+
+        # evict the oldest first, unless a replica claims them meanwhile
+        for deployment in idle[:max(0, len(idle) - target)]:
+            if self._delete(pool.namespace, deployment.metadata.name, deployment.metadata.resource_version):
+                pool.evictions.inc()
+
+    def _delete(self, namespace, name, resource_version=None):
+        """Deletes a warm deployment, only at resource_version when given:
+        the claim changes it so a claimed deployment is never evicted"""
+        try:
+            client.AppsV1Api().delete_namespaced_deployment(
+                name=name,
+                namespace=namespace,
+                body=client.V1DeleteOptions(
+                    propagation_policy='Background',
+                    preconditions=client.V1Preconditions(resource_version=resource_version)))
+            return True
+        except ApiException as e:
+            if e.status == HTTP_CONFLICT:
+                logger.info("warm deployment %s was claimed before its eviction", name)
+            else:
+                logger.error("deletion of warm deployment %s failed: %s", name, e.reason)
+            return False
+
+    def snapshot(self):
+        return {
+            "{}/{}".format(pool.namespace, pool.profile): {
+                "size": pool.size,
+                "target": pool.target,
+                "idle": pool.idle.value,
+                "hits": pool.hits.value,
+                "misses": pool.misses.value,
+                "evictions": pool.evictions.value,
+                "conflicts": pool.conflicts.value,
+            }
+            for pool in self._all()
+        }
@@ -0,0 +1,344 @@
+# encoding: utf-8
+#
+# Copyright (c) 2020-2021 Hopenly srl.
+#
+# This file is part of Ilyde.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import logging
+import re
+import threading
+import time
+
+from kubernetes import client, watch
+from kubernetes.client.rest import ApiException
+
+from metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+HTTP_GONE = 410
+# <deployment>-<pod-template-hash>, the hash is written with the alphabet of
+# the safe encoding of kubernetes
+REPLICA_SET_NAME = re.compile(r"^(.+)-[bcdfghjklmnpqrstvwxz2456789]{1,10}$")
+
+
+class NotSynced(Exception):
+    """Raised when an informer could not load its initial list in time
+    """
+
+
+class Informer(object):
+    """Keeps an in-memory copy of one kind of namespaced resource.
+    It lists the resource once, then follows a watch and relists when the
+    watch expires, so reads are served without any call to the API server.
+    """
+
+    def __init__(self, kind, list_func, namespace, indexers=None, watch_timeout=300):
+        """
+        Args:
+            kind: name of the resource kind, used for logs and metrics
+            list_func: the client list function, e.g. CoreV1Api().list_namespaced_pod
+            namespace: watched namespace
+            indexers: dict index name -> function(obj) returning a list of keys
+            watch_timeout: server side timeout of each watch request
+        """
+        self.kind = kind
+        self.namespace = namespace
+        self._list_func = list_func
+        self._indexers = dict(indexers or {})
+        self._watch_timeout = watch_timeout
+        self._lock = threading.RLock()
+        self._objects = {}
+        self._indices = {name: {} for name in self._indexers}
+        self._listeners = []
+        self._synced = threading.Event()
+        self._stopped = threading.Event()
+        self._watch = None
+        self._thread = None
+        self.last_used = time.monotonic()
+        self.events = REGISTRY.counter("informer.{}.events".format(kind))
+        self.relists = REGISTRY.counter("informer.{}.relists".format(kind))
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._run,
+            name="informer-{}-{}".format(self.kind, self.namespace),
+            daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._watch is not None:
+            self._watch.stop()
+
+    @property
+    def synced(self):
+        return self._synced.is_set()
+
+    def wait_synced(self, timeout):
+        if not self._synced.wait(timeout):
+            raise NotSynced("{} cache of namespace {} is not ready".format(self.kind, self.namespace))
+
+    def get(self, name):
+        self.last_used = time.monotonic()
+        with self._lock:
+            return self._objects.get(name)
+
+    def list(self):
+        self.last_used = time.monotonic()
+        with self._lock:
+            return list(self._objects.values())
+
+    def by_index(self, index, key):
+        self.last_used = time.monotonic()
+        with self._lock:
+            names = self._indices[index].get(key, ())
+            return [self._objects[name] for name in names]
+
+    def add_indexer(self, index, func):
+        """Adds an index, built from the objects already loaded"""
+        with self._lock:
+            self._indexers[index] = func
+            self._indices[index] = {}
+            for obj in self._objects.values():
+                for key in func(obj):
+                    self._indices[index].setdefault(key, set()).add(obj.metadata.name)
+
+    @property
+    def has_listeners(self):
+        with self._lock:
+            return bool(self._listeners)
+
+    def add_listener(self, listener):
+        """listener(event_type, obj) is called from the informer thread
+        for every change, it must not block"""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def _index(self, obj, add):
+        name = obj.metadata.name
+        for index, func in self._indexers.items():
+            keys = self._indices[index]
+            for key in func(obj):
+                if add:
+                    keys.setdefault(key, set()).add(name)
+                elif key in keys:
+                    keys[key].discard(name)
+                    if not keys[key]:
+                        del keys[key]
+
+    def _store(self, event_type, obj):
+        with self._lock:
+            name = obj.metadata.name
+            previous = self._objects.pop(name, None)
+            if previous is not None:
+                self._index(previous, add=False)
+            if event_type != "DELETED":
+                self._objects[name] = obj
+                self._index(obj, add=True)
+            listeners = list(self._listeners)
+
+        for listener in listeners:
+            try:
+                listener(event_type, obj)
+            except Exception as e:
+                logger.error("informer listener failed: %s", e)
+
+    def _relist(self):
+        response = self._list_func(namespace=self.namespace)
+        with self._lock:
+            self._objects = {}
+            self._indices = {name: {} for name in self._indexers}
+            for obj in response.items:
+                self._objects[obj.metadata.name] = obj
+                self._index(obj, add=True)
+            listeners = list(self._listeners)
+        self.relists.inc()
+        self._synced.set()
+        # objects may have changed while we were not watching
+        for listener in listeners:
+            for obj in response.items:
+                try:
+                    listener("SYNC", obj)
+                except Exception as e:
+                    logger.error("informer listener failed: %s", e)
+        return response.metadata.resource_version
+
+    def _run(self):
+        backoff = 1
+        resource_version = None
+        while not self._stopped.is_set():
+            try:
+                if resource_version is None:
+                    resource_version = self._relist()
+                self._watch = watch.Watch()
+                for event in self._watch.stream(self._list_func,
+                                                namespace=self.namespace,
+                                                resource_version=resource_version,
+                                                timeout_seconds=self._watch_timeout):
+                    obj = event['object']
+                    resource_version = obj.metadata.resource_version
+                    self.events.inc()
+                    self._store(event['type'], obj)
+                    if self._stopped.is_set():
+                        break
+                backoff = 1
+            except ApiException as e:
+                if e.status != HTTP_GONE:
+                    logger.error("%s watch of namespace %s failed: %s", self.kind, self.namespace, e.reason)
+                    self._stopped.wait(backoff)
+                    backoff = min(backoff * 2, 60)
+                # the resource version is too old, start again from a list
+                resource_version = None
+            except Exception as e:
+                logger.error("%s watch of namespace %s failed: %s", self.kind, self.namespace, e)
+                resource_version = None
+                self._stopped.wait(backoff)
+                backoff = min(backoff * 2, 60)
+
+
+def pod_owners(pod):
+    """Returns the (kind, name) of the workloads owning a pod.
+    Pods of a Deployment are owned by one of its ReplicaSets, named
+    <deployment>-<pod-template-hash>, so the Deployment is derived from it
+    without watching ReplicaSets.
+    """
+    owners = []
+    template_hash = (pod.metadata.labels or {}).get("pod-template-hash")
+    for reference in pod.metadata.owner_references or []:
+        owners.append((reference.kind, reference.name))
+        if reference.kind == "ReplicaSet" and template_hash \
+                and reference.name.endswith("-" + template_hash):
+            owners.append(("Deployment", reference.name[:-len(template_hash) - 1]))
+    return owners
+
+
+def event_object(event):
+    """Returns the (kind, name) of the objects an Event is about. An event of a
+    ReplicaSet named <deployment>-<pod-template-hash> is about the Deployment as
+    well, e.g. FailedCreate when a quota refuses its pods and none exist."""
+    kind, name = event.involved_object.kind, event.involved_object.name
+    objects = [(kind, name)]
+    match = REPLICA_SET_NAME.match(name or "") if kind == "ReplicaSet" else None
+    if match:
+        objects.append(("Deployment", match.group(1)))
+    return objects
+
+
+class InformerFactory(object):
+    """Shares one informer per (kind, namespace) among all the requests.
+    Informers are started on first use and stopped once idle.
+    """
+
+    def __init__(self, watch_timeout=300, sync_timeout=10, idle_timeout=1800):
+        self._watch_timeout = watch_timeout
+        self._sync_timeout = sync_timeout
+        self._idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._informers = {}
+        self._kinds = {}
+        # requests served by a running informer, and by one started for them
+        self.hits = REGISTRY.counter("informers.hits")
+        self.misses = REGISTRY.counter("informers.misses")
+
+    def register(self, kind, list_func_factory, indexers=None):
+        """
+        Args:
+            kind: name of the kind
+            list_func_factory: returns the client list function, called
+                when the first informer of the kind starts
+            indexers: see Informer
+        """
+        self._kinds[kind] = (list_func_factory, dict(indexers or {}))
+
+    def add_indexer(self, kind, index, func):
+        """Adds an index to the informers of kind, the running ones included,
+        for the modules that look objects up by their own keys"""
+        with self._lock:
+            self._kinds[kind][1][index] = func
+            informers = [informer for (informer_kind, _), informer in self._informers.items()
+                         if informer_kind == kind]
+        for informer in informers:
+            informer.add_indexer(index, func)
+
+    def get(self, kind, namespace, wait=True):
+        """Returns the informer of kind in namespace, starting it if needed.
+        When wait is set, blocks until the initial list is loaded.
+        """
+        with self._lock:
+            self._expire()
+            informer = self._informers.get((kind, namespace))
+            if informer is None:
+                self.misses.inc()
+                list_func_factory, indexers = self._kinds[kind]
+                informer = Informer(kind, list_func_factory(), namespace,
+                                    indexers=indexers, watch_timeout=self._watch_timeout)
+                informer.start()
+                self._informers[(kind, namespace)] = informer
+            else:
+                self.hits.inc()
+            informer.last_used = time.monotonic()
+
+        if wait:
+            informer.wait_synced(self._sync_timeout)
+        return informer
+
+    def _expire(self):
+        now = time.monotonic()
+        for key, informer in list(self._informers.items()):
+            if now - informer.last_used > self._idle_timeout and not informer.has_listeners:
+                informer.stop()
+                del self._informers[key]
+
+    def snapshot(self):
+        with self._lock:
+            informers = list(self._informers.items())
+        return {
+            "{}/{}".format(kind, namespace): {
+                "synced": informer.synced,
+                "objects": len(informer._objects),
+            }
+            for (kind, namespace), informer in informers
+        }
+
+    def stop(self):
+        with self._lock:
+            for informer in self._informers.values():
+                informer.stop()
+            self._informers = {}
+
+
+def default_factory(watch_timeout=300, sync_timeout=10, idle_timeout=1800):
+    """Returns a factory knowing the kinds used by the servicer"""
+    factory = InformerFactory(watch_timeout, sync_timeout, idle_timeout)
+    factory.register(
+        "pods",
+        lambda: client.CoreV1Api().list_namespaced_pod,
+        indexers={"owner": pod_owners})
+    factory.register(
+        "events",
+        lambda: client.CoreV1Api().list_namespaced_event,
+        indexers={"object": event_object})
+    factory.register("deployments", lambda: client.AppsV1Api().list_namespaced_deployment)
+    factory.register("jobs", lambda: client.BatchV1Api().list_namespaced_job)
+    factory.register("pvcs", lambda: client.CoreV1Api().list_namespaced_persistent_volume_claim)
+    factory.register("resourcequotas", lambda: client.CoreV1Api().list_namespaced_resource_quota)
+    factory.register("limitranges", lambda: client.CoreV1Api().list_namespaced_limit_range)
+    return factory
@@ -0,0 +1,268 @@
+# encoding: utf-8
+#
+# Copyright (c) 2020-2021 Hopenly srl.
+#
+# This file is part of Ilyde.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import json
+import logging
+import time
+
+from kubernetes import client
+from kubernetes.client.rest import ApiException
+
+from metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+
+class Step(object):
+    """Timing and outcome of one step of a spawn"""
+
+    def __init__(self, name):
+        self.name = name
+        self.seconds = 0.0
+        self.error = ""
+
+
+def error_message(error):
+    """short description of an error, without the HTTP headers of an ApiException"""
+    if isinstance(error, ApiException):
+        try:
+            return "{} {}: {}".format(error.status, error.reason, json.loads(error.body)["message"])
+        except (TypeError, ValueError, KeyError):
+            return "{} {}".format(error.status, error.reason)
+    return str(error)
+
+
+class SpawnError(Exception):
+    """Raised when a spawn failed, after the created resources were rolled back,
+    or when its manifests were refused before anything was created
+    """
+
+    def __init__(self, cause, steps):
+        super(SpawnError, self).__init__(error_message(cause))
+        self.cause = cause
+        self.steps = steps
+
+    @property
+    def status(self):
+        if isinstance(self.cause, ApiException) and self.cause.status:
+            return self.cause.status
+        if isinstance(self.cause, ValueError):
+            return 400
+        return 500
+
+
+def owner_reference(deployment):
+    """ownerReference making a resource a dependent of the deployment,
+    so that deleting the deployment deletes the whole workspace"""
+    return {
+        "apiVersion": "apps/v1",
+        "kind": "Deployment",
+        "name": deployment.metadata.name,
+        "uid": deployment.metadata.uid,
+    }
+
+
+def set_owner(manifest, owner):
+    metadata = manifest.setdefault("metadata", {})
+    references = metadata.setdefault("ownerReferences", [])
+    references.append(owner)
+    return manifest
+
+
+class WorkspaceSpawner(object):
+    """Creates the resources of a workspace (PVC, Deployment, Service and Traefik
+    IngressRoute) with as much parallelism as their dependencies allow:
+
+        1. Deployment and PVC
+        2. Service, IngressRoute and the ownerReference of the PVC
+
+    The Deployment owns all the other resources. When a step fails, whatever was
+    already created is deleted again.
+    """
+
+    def __init__(self, executor, discovery):
+        self._executor = executor
+        self._discovery = discovery
+        self.spawn_time = REGISTRY.summary("spawn.seconds")
+        self.failures = REGISTRY.counter("spawn.failures")
+
+    def spawn(self, namespace, deployment, service=None, ingress=None, pvc=None):
+        """
+        Args:
+            namespace: namespace of the workspace
+            deployment, service, ingress, pvc: manifests as dicts, all but
+                the deployment are optional
+        Returns:
+            the list of Step
+        Raises:
+            SpawnError
+        """
+        started = time.monotonic()
+        steps = []
+        # (delete function, name) of the created resources
+        created = []
+        # the deployment mounts the claim by name, and its owner is set by name
+        if pvc is not None and not ((pvc.get("metadata") or {}).get("name")):
+            raise SpawnError(ValueError("the PVC manifest has no metadata.name"), steps)
+
+        try:
+            stage = {"deployment": (self._create_deployment, namespace, deployment)}
+            if pvc is not None:
+                stage["pvc"] = (self._create_pvc, namespace, pvc)
+            results = self._run_stage(stage, steps, created)
+
+            owner = owner_reference(results["deployment"])
+            stage = self._attach_stage(namespace, owner, service, ingress)
+            if pvc is not None:
+                stage["pvc_owner"] = (self._own_pvc, namespace, pvc["metadata"]["name"], owner)
+            self._run_stage(stage, steps, created)
+
+        except Exception as e:
+            self.failures.inc()
+            logger.error("workspace spawn failed, rolling back: %s", error_message(e))
+            self._rollback(namespace, created, steps)
+            raise SpawnError(e, steps)
+
+        self.spawn_time.observe(time.monotonic() - started)
+        return steps
+
+    def attach(self, namespace, deployment, service=None, ingress=None):
+        """Creates the Service and IngressRoute of an existing deployment,
+        owned by it. Rolls them back on failure.
+
+        Args:
+            deployment: the V1Deployment
+        Returns:
+            the list of Step
+        Raises:
+            SpawnError
+        """
+        steps = []
+        created = []
+        try:
+            stage = self._attach_stage(namespace, owner_reference(deployment), service, ingress)
+            self._run_stage(stage, steps, created)
+        except Exception as e:
+            self.failures.inc()
+            logger.error("workspace attach failed, rolling back: %s", error_message(e))
+            self._rollback(namespace, created, steps)
+            raise SpawnError(e, steps)
+        return steps
+
+    def _attach_stage(self, namespace, owner, service, ingress):
+        stage = {}
+        if service is not None:
+            stage["service"] = (self._create_service, namespace, set_owner(service, owner))
+        if ingress is not None:
+            stage["ingress"] = (self._create_ingress, namespace, set_owner(ingress, owner))
+        return stage
+
+    def _run_stage(self, stage, steps, created):
+        """runs the steps of a stage concurrently and waits for all of them,
+        so that everything created is known before a rollback"""
+        submitted = {}
+        for name, (func, *args) in stage.items():
+            step = Step(name)
+            steps.append(step)
+            submitted[name] = (step, self._executor.submit(self._timed, step, func, *args))
+
+        results = {}
+        error = None
+        for name, (step, future) in submitted.items():
+            try:
+                result, undo = future.result()
+            except Exception as e:
+                step.error = error_message(e)
+                error = error or e
+                continue
+            results[name] = result
+            if undo is not None:
+                created.append(undo)
+        if error is not None:
+            raise error
+        return results
+
+    @staticmethod
+    def _timed(step, func, *args):
+        started = time.monotonic()
+        try:
+            return func(*args)
+        finally:
+            step.seconds = time.monotonic() - started
+
+    def _rollback(self, namespace, created, steps):
+        step = Step("rollback")
+        steps.append(step)
+        started = time.monotonic()
+        for delete, name in reversed(created):
+            try:
+                delete(name=name, namespace=namespace,
+                       body=client.V1DeleteOptions(propagation_policy='Background'))
+            except Exception as e:
+                # the other resources are deleted all the same
+                step.error = "{}: {}".format(name, error_message(e))
+                logger.error("rollback of %s failed: %s", name, error_message(e))
+        step.seconds = time.monotonic() - started
+
+    # each step returns (result, (delete function, name)) so it can be undone
+
+    def _create_deployment(self, namespace, manifest):
+        api_instance = client.AppsV1Api()
+        deployment = api_instance.create_namespaced_deployment(namespace=namespace, body=manifest)
+        return deployment, (api_instance.delete_namespaced_deployment, deployment.metadata.name)
+
+    def _create_pvc(self, namespace, manifest):
+        api_instance = client.CoreV1Api()
+        pvc = api_instance.create_namespaced_persistent_volume_claim(namespace=namespace, body=manifest)
+        return pvc, (api_instance.delete_namespaced_persistent_volume_claim, pvc.metadata.name)
+
+    def _create_service(self, namespace, manifest):
+        api_instance = client.CoreV1Api()
+        service = api_instance.create_namespaced_service(namespace=namespace, body=manifest)
+        return service, (api_instance.delete_namespaced_service, service.metadata.name)
+
+    def _create_ingress(self, namespace, manifest):
+        group, version = self._discovery.route("ingressroutes", manifest)
+        api_instance = client.CustomObjectsApi()
+        ingress = api_instance.create_namespaced_custom_object(
+            group=group,
+            version=version,
+            namespace=namespace,
+            plural="ingressroutes",
+            body=manifest,
+        )
+
+        def delete(name, namespace, body):
+            api_instance.delete_namespaced_custom_object(
+                group=group,
+                version=version,
+                namespace=namespace,
+                plural="ingressroutes",
+                name=name,
+                body=body)
+
+        return ingress, (delete, ingress["metadata"]["name"])
+
+    def _own_pvc(self, namespace, name, owner):
+        api_instance = client.CoreV1Api()
+        api_instance.patch_namespaced_persistent_volume_claim(
+            name=name,
+            namespace=namespace,
+            body={"metadata": {"ownerReferences": [owner]}})
+        # the PVC itself is undone by its creation step
+        return None, None